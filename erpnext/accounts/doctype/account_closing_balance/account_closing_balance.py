@@ -144,3 +144,29 @@ def get_previous_closing_entries(company, closing_date, accounting_dimensions):
 		entries = query.run(as_dict=1)
 
 	return entries
+
+
+def get_last_period_closing_voucher(company, before_date):
+	"""Returns the latest Period Closing Voucher of the company ending before `before_date` whose
+	Account Closing Balances are created.
+
+	Its closing balances are the balances till the period end date, so the reports only need to add
+	the GL Entries posted after it. Returns None if the closing balances are ignored in Accounts
+	Settings."""
+	if frappe.db.get_single_value("Accounts Settings", "ignore_account_closing_balance"):
+		return None
+
+	period_closing_vouchers = frappe.db.get_all(
+		"Period Closing Voucher",
+		filters={
+			"docstatus": 1,
+			"company": company,
+			"period_end_date": ("<", before_date),
+			"gle_processing_status": ("not in", ["In Progress", "Failed"]),
+		},
+		fields=["period_end_date", "name"],
+		order_by="period_end_date desc",
+		limit=1,
+	)
+
+	return period_closing_vouchers[0] if period_closing_vouchers else None
@@ -12,6 +12,7 @@ from frappe.utils import cint
 
 from erpnext.accounts.utils import sync_auto_reconcile_config
 from erpnext.stock.utils import check_pending_reposting
+from erpnext.utilities.summary_table import reset_summary_table
 
 
 class AccountsSettings(Document):
@@ -43,6 +44,7 @@ class AccountsSettings(Document):
 		credit_controller: DF.Link | None
 		delete_linked_ledger_entries: DF.Check
 		determine_address_tax_category_from: DF.Literal["Billing Address", "Shipping Address"]
+		enable_bulk_gl_posting: DF.Check
 		enable_common_party_accounting: DF.Check
 		enable_fuzzy_matching: DF.Check
 		enable_immutable_ledger: DF.Check
@@ -73,6 +75,9 @@ class AccountsSettings(Document):
 		submit_journal_entries: DF.Check
 		unlink_advance_payment_on_cancelation_of_order: DF.Check
 		unlink_payment_on_cancellation_of_invoice: DF.Check
+		use_daily_account_balances: DF.Check
+		use_pricing_rule_index: DF.Check
+		use_voucher_outstandings: DF.Check
 	# end: auto-generated types
 
 	def validate(self):
@@ -105,6 +110,30 @@ class AccountsSettings(Document):
 
 		self.validate_and_sync_auto_reconcile_config()
 
+	def on_update(self):
+		self.reset_daily_account_balances()
+		self.reset_voucher_outstandings()
+
+	def reset_daily_account_balances(self):
+		"""GL Entries posted while disabled are missing from the daily balances, so the balances of all the
+		accounts are built again once enabled"""
+		reset_summary_table(
+			self,
+			"use_daily_account_balances",
+			"Daily Account Balance",
+			"erpnext.accounts.doctype.daily_account_balance.daily_account_balance.build_daily_account_balances",
+		)
+
+	def reset_voucher_outstandings(self):
+		"""Payments and reconciliations made while disabled leave the outstandings of their vouchers stale,
+		so the outstandings of all the vouchers are built again once enabled"""
+		reset_summary_table(
+			self,
+			"use_voucher_outstandings",
+			"Voucher Outstanding",
+			"erpnext.accounts.doctype.voucher_outstanding.voucher_outstanding.build_voucher_outstandings",
+		)
+
 	def validate_stale_days(self):
 		if not self.allow_stale and cint(self.stale_days) <= 0:
 			frappe.msgprint(
@@ -3,6 +3,7 @@
 
 
 import json
+from collections import defaultdict
 
 import frappe
 from frappe import _
@@ -21,6 +22,10 @@ from erpnext.accounts.report.bank_reconciliation_statement.bank_reconciliation_s
 from erpnext.accounts.utils import get_account_currency, get_balance_on
 from erpnext.setup.utils import get_exchange_rate
 
+DEFAULT_MATCHING_QUERIES = (
+	"erpnext.accounts.doctype.bank_reconciliation_tool.bank_reconciliation_tool.get_matching_queries"
+)
+
 
 class BankReconciliationTool(Document):
 	# begin: auto-generated types
@@ -405,11 +410,11 @@ def start_auto_reconcile(
 ):
 	frappe.flags.auto_reconcile_vouchers = True
 
-	reconciled, partially_reconciled = set(), set()
-	for transaction in bank_transactions:
-		linked_payments = get_linked_payments(
-			transaction.name,
-			["payment_entry", "journal_entry"],
+	candidates = None
+	if frappe.get_hooks("get_matching_queries") == [DEFAULT_MATCHING_QUERIES]:
+		# vouchers are fetched once for all the transactions, instead of querying for each of them
+		candidates = get_auto_reconcile_candidates(
+			bank_transactions,
 			from_date,
 			to_date,
 			filter_by_reference_date,
@@ -417,6 +422,22 @@ def start_auto_reconcile(
 			to_reference_date,
 		)
 
+	reconciled, partially_reconciled = set(), set()
+	allocated_vouchers = set()
+	for transaction in bank_transactions:
+		if candidates is None:
+			linked_payments = get_linked_payments(
+				transaction.name,
+				["payment_entry", "journal_entry"],
+				from_date,
+				to_date,
+				filter_by_reference_date,
+				from_reference_date,
+				to_reference_date,
+			)
+		else:
+			linked_payments = match_auto_reconcile_candidates(transaction, candidates, allocated_vouchers)
+
 		if not linked_payments:
 			continue
 
@@ -432,6 +453,9 @@ def start_auto_reconcile(
 		)
 
 		updated_transaction = reconcile_vouchers(transaction.name, json.dumps(vouchers))
+		allocated_vouchers.update(
+			(voucher["payment_doctype"], voucher["payment_name"]) for voucher in vouchers
+		)
 
 		if updated_transaction.status == "Reconciled":
 			reconciled.add(updated_transaction.name)
@@ -445,6 +469,170 @@ def start_auto_reconcile(
 	frappe.flags.auto_reconcile_vouchers = False
 
 
+def get_match_key(value):
+	"""Values compared like the database does, ignoring case and trailing spaces."""
+	return value.rstrip(" ").casefold() if isinstance(value, str) else value
+
+
+def get_auto_reconcile_candidates(
+	bank_transactions, from_date, to_date, filter_by_reference_date, from_reference_date, to_reference_date
+):
+	"""Payment and Journal Entries with the reference numbers of the bank transactions, indexed by bank
+	account, deposit or withdrawal and reference number."""
+	candidates = frappe._dict(gl_accounts={}, vouchers=defaultdict(list))
+	date_filters = (from_date, to_date, filter_by_reference_date, from_reference_date, to_reference_date)
+
+	reference_nos = defaultdict(set)
+	for transaction in bank_transactions:
+		if transaction.reference_number is not None:
+			is_deposit = flt(transaction.deposit) > 0.0
+			reference_nos[(transaction.bank_account, is_deposit)].add(transaction.reference_number)
+
+	for (bank_account, is_deposit), references in reference_nos.items():
+		if bank_account not in candidates.gl_accounts:
+			candidates.gl_accounts[bank_account] = frappe.db.get_value(
+				"Bank Account", bank_account, "account"
+			)
+
+		gl_account = candidates.gl_accounts[bank_account]
+		vouchers = []
+		for batch in create_batch(sorted(references), 1000):
+			vouchers.extend(get_pe_candidates(gl_account, is_deposit, batch, *date_filters))
+			vouchers.extend(get_je_candidates(gl_account, is_deposit, batch, *date_filters))
+
+		for voucher in vouchers:
+			key = (bank_account, is_deposit, get_match_key(voucher.reference_no))
+			candidates.vouchers[key].append(voucher)
+
+	return candidates
+
+
+def get_pe_candidates(
+	gl_account,
+	is_deposit,
+	reference_nos,
+	from_date,
+	to_date,
+	filter_by_reference_date,
+	from_reference_date,
+	to_reference_date,
+):
+	# Payment Entries matched by `get_pe_matching_query` for any of the reference numbers
+	to_from = "to" if is_deposit else "from"
+	pe = frappe.qb.DocType("Payment Entry")
+
+	filter_by_date = pe.posting_date.between(from_date, to_date)
+	if cint(filter_by_reference_date):
+		filter_by_date = pe.reference_date.between(from_reference_date, to_reference_date)
+
+	return (
+		frappe.qb.from_(pe)
+		.select(
+			ConstantColumn("Payment Entry").as_("doctype"),
+			pe.name,
+			pe.base_paid_amount_after_tax.as_("paid_amount"),
+			pe.paid_amount.as_("amount"),
+			pe.reference_no,
+			pe.reference_date,
+			pe.party,
+			pe.party_type,
+			pe.posting_date,
+			getattr(pe, f"paid_{to_from}_account_currency").as_("currency"),
+		)
+		.where(pe.docstatus == 1)
+		.where(pe.payment_type.isin(["Receive" if is_deposit else "Pay", "Internal Transfer"]))
+		.where(pe.clearance_date.isnull())
+		.where(getattr(pe, f"paid_{to_from}") == gl_account)
+		.where(pe.paid_amount > 0.0)
+		.where(filter_by_date)
+		.where(pe.reference_no.isin(reference_nos))
+		.orderby(pe.reference_date if cint(filter_by_reference_date) else pe.posting_date)
+		.run(as_dict=True)
+	)
+
+
+def get_je_candidates(
+	gl_account,
+	is_deposit,
+	reference_nos,
+	from_date,
+	to_date,
+	filter_by_reference_date,
+	from_reference_date,
+	to_reference_date,
+):
+	# Journal Entries matched by `get_je_matching_query` for any of the reference numbers
+	je = frappe.qb.DocType("Journal Entry")
+	jea = frappe.qb.DocType("Journal Entry Account")
+
+	amount_field = "debit_in_account_currency" if is_deposit else "credit_in_account_currency"
+
+	filter_by_date = je.posting_date.between(from_date, to_date)
+	if cint(filter_by_reference_date):
+		filter_by_date = je.cheque_date.between(from_reference_date, to_reference_date)
+
+	return (
+		frappe.qb.from_(jea)
+		.join(je)
+		.on(jea.parent == je.name)
+		.select(
+			Sum(getattr(jea, amount_field)).as_("paid_amount"),
+			ConstantColumn("Journal Entry").as_("doctype"),
+			je.name,
+			je.cheque_no.as_("reference_no"),
+			je.cheque_date.as_("reference_date"),
+			je.pay_to_recd_from.as_("party"),
+			jea.party_type,
+			je.posting_date,
+			jea.account_currency.as_("currency"),
+		)
+		.where(je.docstatus == 1)
+		.where(je.voucher_type != "Opening Entry")
+		.where(je.clearance_date.isnull())
+		.where(jea.account == gl_account)
+		.where(filter_by_date)
+		.where(je.cheque_no.isin(reference_nos))
+		.groupby(je.name)
+		.having(Sum(getattr(jea, amount_field)) > 0.0)
+		.orderby(je.cheque_date if cint(filter_by_reference_date) else je.posting_date)
+		.run(as_dict=True)
+	)
+
+
+def match_auto_reconcile_candidates(transaction, candidates, allocated_vouchers):
+	"""Returns the candidates matching the transaction, ranked like `check_matching` does.
+
+	`allocated_vouchers` were allocated to the previous transactions and may have been cleared since."""
+	key = (
+		transaction.bank_account,
+		flt(transaction.deposit) > 0.0,
+		get_match_key(transaction.reference_number),
+	)
+
+	matching = []
+	for voucher in candidates.vouchers.get(key, []):
+		voucher_key = (voucher.doctype, voucher.name)
+		if voucher_key in allocated_vouchers and frappe.db.get_value(*voucher_key, "clearance_date"):
+			continue
+
+		rank = 2 + (flt(voucher.get("amount", voucher.paid_amount)) == flt(transaction.unallocated_amount))
+		if voucher.doctype == "Payment Entry":
+			rank += bool(
+				voucher.party
+				and get_match_key(voucher.party_type) == get_match_key(transaction.party_type)
+				and get_match_key(voucher.party) == get_match_key(transaction.party)
+			)
+
+		matching.append(frappe._dict(voucher, rank=rank))
+
+	if not matching:
+		return []
+
+	# Payment Entries before Journal Entries with the same rank, like the union of the queries
+	matching.sort(key=lambda voucher: (-voucher.rank, voucher.doctype != "Payment Entry"))
+	return subtract_allocations(candidates.gl_accounts[transaction.bank_account], matching)
+
+
 def get_auto_reconcile_message(partially_reconciled, reconciled):
 	"""Returns alert message and indicator for auto reconciliation depending on result state."""
 	alert_message, indicator = "", "blue"
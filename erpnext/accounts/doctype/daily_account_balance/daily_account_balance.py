@@ -0,0 +1,271 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+"""Debit and credit of each account posted on each day.
+
+Used by `get_balance_on` instead of summing up all the GL Entries of the
+account. The amounts are grouped by party and cost center as well, so that all
+the filters of `get_balance_on` can be applied to the balances.
+
+Each balance is the sum of the amounts of the GL Entries rounded to the currency
+precision, like `get_balance_on` does, hence the balances are cleared if the
+currency precision is changed.
+
+The balances of all the accounts are built in the background once enabled in
+Accounts Settings, or once the currency precision is changed, see
+`erpnext.utilities.summary_table`. They are kept up to date whenever the GL
+Entries of a voucher are posted, cancelled or deleted, and are added up again
+for the account, cost center or party another one is merged into.
+"""
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import create_batch, cstr
+
+from erpnext.accounts.utils import get_currency_precision
+from erpnext.utilities.summary_table import (
+	build_in_batches,
+	clear_summary_table,
+	enqueue_summary_table_build,
+	is_summary_table_built,
+)
+
+PRECISION_KEY = "daily_account_balance_precision"
+
+BUILD_METHOD = (
+	"erpnext.accounts.doctype.daily_account_balance.daily_account_balance.build_daily_account_balances"
+)
+
+ACCOUNT_BATCH_SIZE = 100
+
+BALANCE_FIELDS = ["debit", "credit", "debit_in_account_currency", "credit_in_account_currency"]
+
+
+class DailyAccountBalance(Document):
+	# begin: auto-generated types
+	# This code is auto-generated. Do not modify anything in this block.
+
+	from typing import TYPE_CHECKING
+
+	if TYPE_CHECKING:
+		from frappe.types import DF
+
+		account: DF.Link
+		company: DF.Link
+		cost_center: DF.Link | None
+		credit: DF.Currency
+		credit_in_account_currency: DF.Currency
+		debit: DF.Currency
+		debit_in_account_currency: DF.Currency
+		party: DF.DynamicLink | None
+		party_type: DF.Link | None
+		posting_date: DF.Date
+	# end: auto-generated types
+
+	pass
+
+
+def on_doctype_update():
+	frappe.db.add_unique(
+		"Daily Account Balance",
+		["account", "posting_date", "party_type", "party", "cost_center"],
+		constraint_name="unique_account_day",
+	)
+
+
+def is_daily_account_balance_enabled():
+	return frappe.db.get_single_value("Accounts Settings", "use_daily_account_balances")
+
+
+def is_daily_account_balance_built() -> bool:
+	"""Returns True if the balances are built with the current currency precision."""
+	return bool(
+		is_daily_account_balance_enabled()
+		and is_summary_table_built("Daily Account Balance")
+		and frappe.db.get_default(PRECISION_KEY) == cstr(get_currency_precision())
+	)
+
+
+def rebuild_on_precision_change(doc, method=None):
+	"""Build the balances again once the currency precision is changed in System Settings."""
+	if not is_daily_account_balance_enabled():
+		return
+
+	if frappe.db.get_default(PRECISION_KEY) != cstr(get_currency_precision()):
+		clear_summary_table("Daily Account Balance")
+		enqueue_summary_table_build(
+			"Accounts Settings", "use_daily_account_balances", "Daily Account Balance", BUILD_METHOD
+		)
+
+
+def get_gl_balances(condition, values) -> list:
+	"""Rounded amounts of the GL Entries matching `condition`, grouped by account, day, party and cost
+	center."""
+	return frappe.db.sql(
+		f"""
+		select
+			company, account, posting_date,
+			ifnull(party_type, '') as party_type,
+			ifnull(party, '') as party,
+			ifnull(cost_center, '') as cost_center,
+			sum(round(debit, %(precision)s)) as debit,
+			sum(round(credit, %(precision)s)) as credit,
+			sum(round(debit_in_account_currency, %(precision)s)) as debit_in_account_currency,
+			sum(round(credit_in_account_currency, %(precision)s)) as credit_in_account_currency
+		from `tabGL Entry`
+		where is_cancelled = 0 and {condition}
+		group by
+			company, account, posting_date,
+			ifnull(party_type, ''), ifnull(party, ''), ifnull(cost_center, '')
+		""",
+		{**values, "precision": get_currency_precision()},
+		as_dict=True,
+	)
+
+
+def get_balance_key(row):
+	return (row.account, row.posting_date, row.party_type, row.party, row.cost_center)
+
+
+def insert_balances(rows):
+	frappe.db.bulk_insert(
+		"Daily Account Balance",
+		fields=[
+			"name",
+			"company",
+			"account",
+			"posting_date",
+			"party_type",
+			"party",
+			"cost_center",
+			*BALANCE_FIELDS,
+		],
+		values=[
+			(
+				frappe.generate_hash(length=10),
+				row.company,
+				*get_balance_key(row),
+				*(row[fieldname] or 0 for fieldname in BALANCE_FIELDS),
+			)
+			for row in rows
+		],
+	)
+
+
+def build_daily_account_balances():
+	"""Build the balances of all the accounts, run by `build_summary_table`."""
+	frappe.db.set_default(PRECISION_KEY, cstr(get_currency_precision()))
+
+	accounts = frappe.get_all("Account", filters={"is_group": 0}, pluck="name", order_by="name")
+	build_in_batches(create_batch(accounts, ACCOUNT_BATCH_SIZE), build_account_balances)
+
+
+def build_account_balances(accounts):
+	"""Rebuild the balances of the accounts from their GL Entries."""
+	frappe.db.delete("Daily Account Balance", {"account": ("in", accounts)})
+
+	if rows := get_gl_balances("account in %(accounts)s", {"accounts": tuple(accounts)}):
+		insert_balances(rows)
+
+
+def get_merge_condition(doctype) -> str | None:
+	"""Condition on the GL Entries and balances of a document which can be merged into another one."""
+	if doctype == "Account":
+		return "account = %(name)s"
+
+	if doctype == "Cost Center":
+		return "cost_center = %(name)s"
+
+	if frappe.db.exists("Party Type", doctype):
+		return "party_type = %(doctype)s and party = %(name)s"
+
+
+def before_rename(doc, method, old, new, merge=False):
+	"""The balances of a merged account, cost center or party would collide with the ones of the
+	document it is merged into, hence they are deleted and added up again in `after_rename`."""
+	if merge and is_daily_account_balance_enabled() and (condition := get_merge_condition(doc.doctype)):
+		frappe.db.sql(
+			f"delete from `tabDaily Account Balance` where {condition}",
+			{"doctype": doc.doctype, "name": old},
+		)
+
+
+def after_rename(doc, method, old, new, merge=False):
+	if merge and is_daily_account_balance_enabled() and (condition := get_merge_condition(doc.doctype)):
+		values = {"doctype": doc.doctype, "name": new}
+		frappe.db.sql(f"delete from `tabDaily Account Balance` where {condition}", values)
+
+		if rows := get_gl_balances(condition, values):
+			insert_balances(rows)
+
+
+def get_voucher_balances(voucher_type, voucher_no) -> dict | None:
+	"""Returns the rounded amounts of the GL Entries of the voucher, to be passed to
+	`update_daily_account_balances` once the entries are changed. Returns None if the balances are not
+	maintained."""
+	if not is_daily_account_balance_enabled():
+		return None
+
+	rows = get_gl_balances(
+		"voucher_type = %(voucher_type)s and voucher_no = %(voucher_no)s",
+		{"voucher_type": voucher_type, "voucher_no": voucher_no},
+	)
+
+	return {get_balance_key(row): row for row in rows}
+
+
+def update_daily_account_balances(voucher_type, voucher_no, previous_balances):
+	"""Apply the change in the GL Entries of the voucher to the balances, `previous_balances` are the
+	amounts of the voucher before the change."""
+	if previous_balances is None:
+		return
+
+	balances = get_voucher_balances(voucher_type, voucher_no) or {}
+
+	changes = {}
+	for key in set(previous_balances) | set(balances):
+		row = balances.get(key) or previous_balances[key]
+		previous = previous_balances.get(key) or {}
+		current = balances.get(key) or {}
+
+		change = frappe._dict(company=row.company, account=row.account)
+		for fieldname in BALANCE_FIELDS:
+			change[fieldname] = (current.get(fieldname) or 0) - (previous.get(fieldname) or 0)
+
+		if any(change[fieldname] for fieldname in BALANCE_FIELDS):
+			changes[key] = change
+
+	if changes:
+		add_to_daily_account_balances(changes)
+
+
+def add_to_daily_account_balances(changes):
+	"""Add the changes to the balances with a single upsert, without any locking read. The rows are
+	ordered by key, so that concurrent postings lock the balances in the same order."""
+	fields = ["name", "company", "account", "posting_date", "party_type", "party", "cost_center"]
+	fields += BALANCE_FIELDS
+
+	values = []
+	for key in sorted(changes, key=lambda key: tuple(cstr(value) for value in key)):
+		change = changes[key]
+		values.extend(
+			[
+				frappe.generate_hash(length=10),
+				change.company,
+				*key,
+				*(change[fieldname] for fieldname in BALANCE_FIELDS),
+			]
+		)
+
+	columns = ", ".join(fields)
+	placeholders = ", ".join(["({})".format(", ".join(["%s"] * len(fields)))] * len(changes))
+	updates = ", ".join(f"{fieldname} = {fieldname} + values({fieldname})" for fieldname in BALANCE_FIELDS)
+
+	frappe.db.sql(
+		f"""
+		insert into `tabDaily Account Balance` ({columns})
+		values {placeholders}
+		on duplicate key update {updates}
+		""",
+		values,
+	)
@@ -0,0 +1,101 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase, change_settings
+from frappe.utils import add_days, nowdate
+
+from erpnext.accounts.doctype.account.account import merge_account
+from erpnext.accounts.doctype.account.test_account import create_account
+from erpnext.accounts.doctype.daily_account_balance.daily_account_balance import (
+	build_daily_account_balances,
+	is_daily_account_balance_built,
+)
+from erpnext.accounts.doctype.journal_entry.test_journal_entry import make_journal_entry
+from erpnext.accounts.doctype.purchase_invoice.test_purchase_invoice import (
+	setup_provisional_accounting,
+	toggle_provisional_accounting_setting,
+)
+from erpnext.accounts.utils import get_balance_on
+from erpnext.stock.doctype.purchase_receipt.purchase_receipt import make_purchase_invoice
+from erpnext.stock.doctype.purchase_receipt.test_purchase_receipt import make_purchase_receipt
+
+
+class TestDailyAccountBalance(FrappeTestCase):
+	def get_gl_balance(self, account, date=None):
+		frappe.db.set_single_value("Accounts Settings", "use_daily_account_balances", 0)
+		try:
+			return get_balance_on(account, date)
+		finally:
+			frappe.db.set_single_value("Accounts Settings", "use_daily_account_balances", 1)
+
+	@change_settings("Accounts Settings", {"use_daily_account_balances": 1})
+	def test_daily_account_balance(self):
+		account = "_Test Bank - _TC"
+		yesterday = add_days(nowdate(), -1)
+
+		# built from the GL Entries once enabled
+		self.assertTrue(is_daily_account_balance_built())
+		opening_balance = get_balance_on(account)
+		self.assertEqual(opening_balance, self.get_gl_balance(account))
+
+		jv1 = make_journal_entry(account, "_Test Cash - _TC", 100, posting_date=yesterday, submit=True)
+		jv2 = make_journal_entry(account, "_Test Cash - _TC", 50, submit=True)
+		self.assertEqual(get_balance_on(account), opening_balance + 150)
+		self.assertEqual(get_balance_on(account, yesterday), self.get_gl_balance(account, yesterday))
+
+		# group account is summed up from the balances of its ledger accounts
+		parent_account = frappe.db.get_value("Account", account, "parent_account")
+		self.assertEqual(get_balance_on(parent_account), self.get_gl_balance(parent_account))
+
+		jv1.cancel()
+		self.assertEqual(get_balance_on(account), opening_balance + 50)
+
+		build_daily_account_balances()
+		self.assertEqual(get_balance_on(account), opening_balance + 50)
+
+		jv2.cancel()
+		self.assertEqual(get_balance_on(account), opening_balance)
+
+	@change_settings("Accounts Settings", {"use_daily_account_balances": 1})
+	def test_merged_account_balance(self):
+		old_account = create_account(
+			account_name="_Test Daily Balance Merged Account",
+			parent_account="Current Assets - _TC",
+			company="_Test Company",
+		)
+		new_account = create_account(
+			account_name="_Test Daily Balance Account",
+			parent_account="Current Assets - _TC",
+			company="_Test Company",
+		)
+
+		# balances of both the accounts on the same day are added up
+		make_journal_entry(old_account, "_Test Cash - _TC", 100, submit=True)
+		make_journal_entry(new_account, "_Test Cash - _TC", 50, submit=True)
+
+		merge_account(old_account, new_account)
+		self.assertEqual(get_balance_on(new_account), 150)
+		self.assertEqual(get_balance_on(new_account), self.get_gl_balance(new_account))
+		self.assertFalse(frappe.db.exists("Daily Account Balance", {"account": old_account}))
+
+	@change_settings("Accounts Settings", {"use_daily_account_balances": 1})
+	def test_cancelled_provisional_entries_balance(self):
+		setup_provisional_accounting()
+		account = "Provision Account - _TC"
+
+		pr = make_purchase_receipt(item_code="_Test Non Stock Item", posting_date=add_days(nowdate(), -2))
+		pi = make_purchase_invoice(pr.name)
+		pi.set_posting_time = 1
+		pi.posting_date = add_days(pr.posting_date, 1)
+		pi.submit()
+		self.assertEqual(get_balance_on(account), self.get_gl_balance(account))
+
+		# the provisional entries of the receipt reversed by the invoice are cancelled in place
+		pi.cancel()
+		self.assertEqual(get_balance_on(account), self.get_gl_balance(account))
+		self.assertEqual(
+			get_balance_on(account, pi.posting_date), self.get_gl_balance(account, pi.posting_date)
+		)
+
+		toggle_provisional_accounting_setting()
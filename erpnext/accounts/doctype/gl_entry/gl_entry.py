@@ -85,8 +85,11 @@ class GLEntry(Document):
 			self.check_mandatory()
 			self.validate_cost_center()
 			self.check_pl_account()
-			self.validate_party()
-			self.validate_currency()
+
+			# set for the entries posted in bulk once validated for the account and party
+			if not self.flags.party_validated:
+				self.validate_party()
+				self.validate_currency()
 
 	def on_update(self):
 		adv_adj = self.flags.adv_adj
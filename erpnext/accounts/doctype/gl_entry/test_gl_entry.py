@@ -6,6 +6,7 @@ import unittest
 
 import frappe
 from frappe.model.naming import parse_naming_series
+from frappe.utils import nowdate
 
 from erpnext.accounts.doctype.gl_entry.gl_entry import rename_gle_sle_docs
 from erpnext.accounts.doctype.journal_entry.test_journal_entry import make_journal_entry
@@ -141,3 +142,62 @@ class TestGLEntry(unittest.TestCase):
 
 		jv.save().submit()
 		self.assertEqual(1, jv.docstatus)
+
+	def test_bulk_posting(self):
+		from erpnext.accounts.general_ledger import BULK_POSTING_THRESHOLD
+
+		frappe.db.set_single_value("Accounts Settings", "enable_bulk_gl_posting", 1)
+		try:
+			jv = frappe.new_doc("Journal Entry")
+			jv.company = "_Test Company"
+			jv.posting_date = nowdate()
+			for _i in range(BULK_POSTING_THRESHOLD):
+				jv.append(
+					"accounts",
+					{
+						"account": "Debtors - _TC",
+						"party_type": "Customer",
+						"party": "_Test Customer",
+						"debit_in_account_currency": 10,
+					},
+				)
+
+			jv.append(
+				"accounts",
+				{
+					"account": "Sales - _TC",
+					"cost_center": "_Test Cost Center - _TC",
+					"credit_in_account_currency": 10 * BULK_POSTING_THRESHOLD,
+				},
+			)
+			jv.submit()
+
+			gl_entries = frappe.get_all(
+				"GL Entry",
+				filters={"voucher_type": "Journal Entry", "voucher_no": jv.name, "is_cancelled": 0},
+				fields=["debit", "credit", "fiscal_year", "account_currency", "docstatus"],
+			)
+			self.assertEqual(len(gl_entries), BULK_POSTING_THRESHOLD + 1)
+			self.assertEqual(sum(d.debit for d in gl_entries), 10 * BULK_POSTING_THRESHOLD)
+			self.assertEqual(sum(d.credit for d in gl_entries), 10 * BULK_POSTING_THRESHOLD)
+			self.assertTrue(
+				all(d.fiscal_year and d.account_currency and d.docstatus == 1 for d in gl_entries)
+			)
+
+			payment_ledger_entries = frappe.get_all(
+				"Payment Ledger Entry",
+				filters={"voucher_type": "Journal Entry", "voucher_no": jv.name, "delinked": 0},
+				pluck="amount",
+			)
+			self.assertEqual(len(payment_ledger_entries), BULK_POSTING_THRESHOLD)
+			self.assertEqual(sum(payment_ledger_entries), 10 * BULK_POSTING_THRESHOLD)
+
+			jv.cancel()
+			self.assertEqual(
+				frappe.db.count(
+					"GL Entry", {"voucher_type": "Journal Entry", "voucher_no": jv.name, "is_cancelled": 1}
+				),
+				2 * (BULK_POSTING_THRESHOLD + 1),
+			)
+		finally:
+			frappe.db.set_single_value("Accounts Settings", "enable_bulk_gl_posting", 0)
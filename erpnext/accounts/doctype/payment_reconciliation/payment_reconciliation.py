@@ -1,6 +1,7 @@
 # Copyright (c) 2015, Frappe Technologies Pvt. Ltd. and Contributors
 # For license information, please see license.txt
 
+from collections import defaultdict, deque
 
 import frappe
 from frappe import _, msgprint, qb
@@ -43,6 +44,7 @@ class PaymentReconciliation(Document):
 		)
 
 		allocation: DF.Table[PaymentReconciliationAllocation]
+		allocation_strategy: DF.Literal["FIFO", "Exact Amount"]
 		bank_cash_account: DF.Link | None
 		company: DF.Link
 		cost_center: DF.Link | None
@@ -434,39 +436,59 @@ class PaymentReconciliation(Document):
 		)
 
 		entries = []
-		for pay in args.get("payments"):
+
+		def allocate(pay, inv):
+			if pay.get("amount") >= inv.get("outstanding_amount"):
+				res = self.get_allocated_entry(pay, inv, inv["outstanding_amount"])
+				pay["amount"] = flt(pay.get("amount")) - flt(inv.get("outstanding_amount"))
+				inv["outstanding_amount"] = 0
+			else:
+				res = self.get_allocated_entry(pay, inv, pay["amount"])
+				inv["outstanding_amount"] = flt(inv.get("outstanding_amount")) - flt(pay.get("amount"))
+				pay["amount"] = 0
+
+			inv["exchange_rate"] = invoice_exchange_map.get(inv.get("invoice_number"))
+			if pay.get("reference_type") in ["Sales Invoice", "Purchase Invoice"]:
+				pay["exchange_rate"] = invoice_exchange_map.get(pay.get("reference_name"))
+
+			res.difference_amount = self.get_difference_amount(pay, inv, res["allocated_amount"])
+			res.difference_account = default_exchange_gain_loss_account
+			res.exchange_rate = inv.get("exchange_rate")
+			res.update({"gain_loss_posting_date": pay.get("posting_date")})
+			if not pay.get("is_advance"):
+				if exc_gain_loss_posting_date == "Invoice":
+					res.update({"gain_loss_posting_date": inv.get("invoice_date")})
+				elif exc_gain_loss_posting_date == "Reconciliation Date":
+					res.update({"gain_loss_posting_date": nowdate()})
+
+			entries.append(res)
+
+		invoices, payments = args.get("invoices"), args.get("payments")
+		for pay in payments:
 			pay.update({"unreconciled_amount": pay.get("amount")})
-			for inv in args.get("invoices"):
-				if pay.get("amount") >= inv.get("outstanding_amount"):
-					res = self.get_allocated_entry(pay, inv, inv["outstanding_amount"])
-					pay["amount"] = flt(pay.get("amount")) - flt(inv.get("outstanding_amount"))
-					inv["outstanding_amount"] = 0
-				else:
-					res = self.get_allocated_entry(pay, inv, pay["amount"])
-					inv["outstanding_amount"] = flt(inv.get("outstanding_amount")) - flt(pay.get("amount"))
-					pay["amount"] = 0
-
-				inv["exchange_rate"] = invoice_exchange_map.get(inv.get("invoice_number"))
-				if pay.get("reference_type") in ["Sales Invoice", "Purchase Invoice"]:
-					pay["exchange_rate"] = invoice_exchange_map.get(pay.get("reference_name"))
-
-				res.difference_amount = self.get_difference_amount(pay, inv, res["allocated_amount"])
-				res.difference_account = default_exchange_gain_loss_account
-				res.exchange_rate = inv.get("exchange_rate")
-				res.update({"gain_loss_posting_date": pay.get("posting_date")})
-				if not pay.get("is_advance"):
-					if exc_gain_loss_posting_date == "Invoice":
-						res.update({"gain_loss_posting_date": inv.get("invoice_date")})
-					elif exc_gain_loss_posting_date == "Reconciliation Date":
-						res.update({"gain_loss_posting_date": nowdate()})
 
-				if pay.get("amount") == 0:
-					entries.append(res)
-					break
-				elif inv.get("outstanding_amount") == 0:
-					entries.append(res)
+		if self.allocation_strategy == "Exact Amount":
+			# payments are first allocated to the earliest invoice of the same amount
+			invoices_by_amount = defaultdict(deque)
+			for inv in invoices:
+				invoices_by_amount[inv.get("outstanding_amount")].append(inv)
+
+			for pay in payments:
+				if pay.get("amount") and invoices_by_amount.get(pay.get("amount")):
+					allocate(pay, invoices_by_amount[pay.get("amount")].popleft())
+
+		# FIFO, the invoices before `invoice_idx` are fully allocated
+		invoice_idx = 0
+		for pay in payments:
+			while invoice_idx < len(invoices):
+				inv = invoices[invoice_idx]
+				if inv.get("outstanding_amount") == 0:
+					invoice_idx += 1
 					continue
 
+				allocate(pay, inv)
+				if pay.get("amount") == 0:
+					break
 			else:
 				break
 
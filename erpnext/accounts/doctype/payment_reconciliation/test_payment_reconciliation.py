@@ -480,6 +480,26 @@ class TestPaymentReconciliation(FrappeTestCase):
 		self.assertEqual(len(pr.get("payments")), 0)
 		self.assertEqual(pr.get("invoices")[0].get("outstanding_amount"), 165)
 
+	def test_allocation_strategy(self):
+		si1 = self.create_sales_invoice(qty=1, rate=100)
+		si2 = self.create_sales_invoice(qty=1, rate=60)
+		self.create_payment_entry(amount=60).save().submit()
+		self.create_payment_entry(amount=70).save().submit()
+
+		pr = self.create_payment_reconciliation()
+		pr.get_unreconciled_entries()
+
+		def get_allocation(allocation_strategy):
+			pr.allocation_strategy = allocation_strategy
+			# invoice of 100 and payment of 60 first
+			invoices = sorted((x.as_dict() for x in pr.get("invoices")), key=lambda x: -x.outstanding_amount)
+			payments = sorted((x.as_dict() for x in pr.get("payments")), key=lambda x: x.amount)
+			pr.allocate_entries(frappe._dict({"invoices": invoices, "payments": payments}))
+			return [(row.invoice_number, row.allocated_amount) for row in pr.allocation]
+
+		self.assertEqual(get_allocation("FIFO"), [(si1.name, 60), (si1.name, 40), (si2.name, 30)])
+		self.assertEqual(get_allocation("Exact Amount"), [(si2.name, 60), (si1.name, 70)])
+
 	def test_payment_against_journal(self):
 		transaction_date = nowdate()
 
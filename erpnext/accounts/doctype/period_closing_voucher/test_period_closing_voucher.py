@@ -324,6 +324,72 @@ class TestPeriodClosingVoucher(unittest.TestCase):
 		repost_doc.posting_date = today()
 		repost_doc.save()
 
+	def test_report_openings_from_closing_balances(self):
+		from erpnext.accounts.report.general_ledger.general_ledger import execute as general_ledger
+		from erpnext.accounts.report.trial_balance.trial_balance import execute as trial_balance
+
+		frappe.db.sql("delete from `tabGL Entry` where company='Test PCV Company'")
+		frappe.db.sql("delete from `tabPeriod Closing Voucher` where company='Test PCV Company'")
+
+		company = create_company()
+		cost_center = create_cost_center("Test Cost Center 1")
+
+		for posting_date, amount, account1, account2 in (
+			("2021-03-15", 400, "Cash - TPC", "Sales - TPC"),
+			("2021-03-15", 600, "Cost of Goods Sold - TPC", "Cash - TPC"),
+			("2022-02-10", 300, "Cash - TPC", "Sales - TPC"),
+			("2022-03-10", 200, "Cash - TPC", "Sales - TPC"),
+		):
+			if posting_date == "2022-02-10":
+				self.make_period_closing_voucher(posting_date="2021-03-31")
+
+			jv = make_journal_entry(
+				posting_date=posting_date,
+				amount=amount,
+				account1=account1,
+				account2=account2,
+				cost_center=cost_center,
+				company=company,
+				save=False,
+			)
+			jv.company = company
+			jv.save()
+			jv.submit()
+
+		fiscal_year = get_fiscal_year("2022-03-01", company=company)[0]
+
+		def get_reports():
+			trial_balance_data = trial_balance(
+				frappe._dict(
+					company=company,
+					fiscal_year=fiscal_year,
+					from_date="2022-03-01",
+					to_date="2022-03-31",
+					show_unclosed_fy_pl_balances=1,
+				)
+			)[1]
+			general_ledger_data = general_ledger(
+				frappe._dict(
+					company=company,
+					from_date="2022-03-01",
+					to_date="2022-03-31",
+					account=["Cash - TPC"],
+					categorize_by="Categorize by Voucher (Consolidated)",
+				)
+			)[1]
+			return trial_balance_data, general_ledger_data
+
+		# openings start from the closing balances of the period closing voucher
+		trial_balance_data, general_ledger_data = get_reports()
+		self.assertEqual(general_ledger_data[0]["balance"], 100)
+
+		# and are the same as the openings summed up from all the GL Entries
+		frappe.db.set_single_value("Accounts Settings", "ignore_account_closing_balance", 1)
+		try:
+			self.assertEqual(get_reports(), (trial_balance_data, general_ledger_data))
+		finally:
+			frappe.db.set_single_value("Accounts Settings", "ignore_account_closing_balance", 0)
+
 	def make_period_closing_voucher(self, posting_date, submit=True):
 		surplus_account = create_account()
 		cost_center = create_cost_center("Test Cost Center 1")
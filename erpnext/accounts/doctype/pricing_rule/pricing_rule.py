@@ -12,6 +12,8 @@ from frappe import _, throw
 from frappe.model.document import Document
 from frappe.utils import cint, flt
 
+from erpnext.accounts.doctype.pricing_rule.pricing_rule_index import clear_pricing_rule_index
+
 apply_on_dict = {"Item Code": "items", "Item Group": "item_groups", "Brand": "brands"}
 
 other_fields = ["other_item_code", "other_item_group", "other_brand"]
@@ -145,6 +147,10 @@ class PricingRule(Document):
 		if not self.margin_type:
 			self.margin_rate_or_amount = 0.0
 
+	def clear_cache(self):
+		clear_pricing_rule_index()
+		return super().clear_cache()
+
 	def validate_duplicate_apply_on(self):
 		if self.apply_on != "Transaction":
 			apply_on_table = apply_on_dict.get(self.apply_on)
@@ -355,25 +361,26 @@ def apply_pricing_rule(args, doc=None):
 	if args.get("doctype") == "Material Request":
 		return out
 
+	from erpnext.accounts.doctype.pricing_rule.utils import pricing_rule_batch
+
 	item_list = args.get("items")
 	args.pop("items")
 
-	item_code_list = tuple(item.get("item_code") for item in item_list)
-	query_items = frappe.get_all(
-		"Item",
-		fields=["item_code", "has_serial_no"],
-		filters=[["item_code", "in", item_code_list]],
-		as_list=1,
-	)
-	serialized_items = dict()
-	for item_code, val in query_items:
-		serialized_items.setdefault(item_code, val)
+	# resolved once for all the items
+	update_party_args_for_pricing_rule(args)
 
-	for item in item_list:
-		args_copy = copy.deepcopy(args)
-		args_copy.update(item)
-		data = get_pricing_rule_for_item(args_copy, doc=doc)
-		out.append(data)
+	if isinstance(doc, str):
+		doc = json.loads(doc)
+
+	if doc:
+		doc = frappe.get_doc(doc)
+
+	with pricing_rule_batch():
+		for item in item_list:
+			args_copy = copy.deepcopy(args)
+			args_copy.update(item)
+			data = get_pricing_rule_for_item(args_copy, doc=doc)
+			out.append(data)
 
 	return out
 
@@ -525,6 +532,10 @@ def update_args_for_pricing_rule(args):
 		if not args.item_group:
 			frappe.throw(_("Item Group not mentioned in item master for item {0}").format(args.item_code))
 
+	update_party_args_for_pricing_rule(args)
+
+
+def update_party_args_for_pricing_rule(args):
 	if args.transaction_type == "selling":
 		if args.customer and not (args.customer_group and args.territory):
 			if args.quotation_to and args.quotation_to != "Customer":
@@ -0,0 +1,117 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# License: GNU General Public License v3. See license.txt
+
+"""In-memory index of the enabled Pricing Rules.
+
+Used by `_get_pricing_rules` to match the items of a transaction against the Pricing Rules, instead of
+querying the Pricing Rules of each item. The rows of the Item Code, Item Group and Brand tables of the
+rules are indexed by transaction type and value, and the rules they match are then checked against the
+other conditions of the query, like the price list, warehouse, party and validity.
+
+The index is built on first use in each process, and rebuilt by every process once a Pricing Rule is
+changed. It is rebuilt again once the transaction which changed the rule is committed or rolled back, as
+another process may have rebuilt it in the meantime.
+
+The values are indexed and matched casefolded, like the case-insensitive collation of the query.
+"""
+
+from collections import defaultdict
+
+import frappe
+from frappe import qb
+from frappe.utils import cstr
+
+VERSION_KEY = "pricing_rule_index_version"
+
+APPLY_ON_FIELDS = {"Item Code": "item_code", "Item Group": "item_group", "Brand": "brand"}
+
+# indexes built by this process, by site
+_indexes = {}
+
+
+def is_pricing_rule_index_enabled():
+	return frappe.db.get_single_value("Accounts Settings", "use_pricing_rule_index")
+
+
+def casefold(value) -> str:
+	return cstr(value).casefold()
+
+
+def clear_pricing_rule_index():
+	_clear_pricing_rule_index()
+
+	# once per transaction, however many rules are changed in it
+	if not frappe.flags.pricing_rule_index_clear_registered:
+		frappe.flags.pricing_rule_index_clear_registered = True
+		frappe.db.after_commit.add(_clear_pricing_rule_index)
+		frappe.db.after_rollback.add(_clear_pricing_rule_index)
+
+
+def _clear_pricing_rule_index():
+	frappe.flags.pricing_rule_index_clear_registered = False
+	frappe.cache.delete_value(VERSION_KEY)
+	_indexes.pop(frappe.local.site, None)
+
+
+def get_pricing_rule_index():
+	"""Returns the index of the site, rebuilt if a Pricing Rule was changed since it was built."""
+	version = frappe.cache.get_value(VERSION_KEY)
+	if not version:
+		version = frappe.generate_hash()
+		frappe.cache.set_value(VERSION_KEY, version)
+
+	index = _indexes.get(frappe.local.site)
+	if not index or index.version != version:
+		index = _indexes[frappe.local.site] = build_pricing_rule_index(version)
+
+	return index
+
+
+def build_pricing_rule_index(version=None):
+	"""Index the enabled Pricing Rules.
+
+	`rows` are the rows of the apply on tables, joined with their rule like `_get_pricing_rules` does,
+	by (transaction type, apply on field, casefolded value). `other_rows` are all the rows of the rules
+	which apply on another item, by (transaction type, apply on field, casefolded value of the other
+	field)."""
+	rules = {rule.name: rule for rule in frappe.get_all("Pricing Rule", filters={"disable": 0}, fields=["*"])}
+
+	index = frappe._dict(
+		version=version,
+		transaction_types={
+			transaction_type: any(rule[transaction_type] for rule in rules.values())
+			for transaction_type in ("selling", "buying")
+		},
+		rows=defaultdict(list),
+		other_rows=defaultdict(list),
+	)
+
+	for apply_on, fieldname in APPLY_ON_FIELDS.items():
+		child = qb.DocType(f"Pricing Rule {apply_on}")
+		other_fieldname = f"other_{fieldname}"
+
+		child_rows = (
+			qb.from_(child)
+			.select(child.parent, child[fieldname], child.uom)
+			.where(child.parenttype == "Pricing Rule")
+			.run()
+		)
+
+		for parent, value, uom in child_rows:
+			rule = rules.get(parent)
+			if not rule:
+				continue
+
+			row = frappe._dict(rule)
+			row.update({fieldname: value, "uom": uom})
+
+			for transaction_type in ("selling", "buying"):
+				if not rule[transaction_type]:
+					continue
+
+				index.rows[(transaction_type, fieldname, casefold(value))].append(row)
+				if rule.apply_rule_on_other is not None and rule[other_fieldname]:
+					other_value = casefold(rule[other_fieldname])
+					index.other_rows[(transaction_type, fieldname, other_value)].append(row)
+
+	return index
@@ -1520,6 +1520,127 @@ class TestPricingRule(FrappeTestCase):
 		debit_note.delete()
 		pi.cancel()
 
+	@change_settings("Accounts Settings", {"use_pricing_rule_index": 1})
+	def test_pricing_rule_index(self):
+		make_pricing_rule(selling=1, discount_percentage=10)
+		make_pricing_rule(
+			title="_Test Pricing Rule 1",
+			apply_on="Item Group",
+			item_group="All Item Groups",
+			selling=1,
+			discount_percentage=15,
+		)
+		customer_rule = make_pricing_rule(
+			title="_Test Pricing Rule 2",
+			applicable_for="Customer",
+			customer="_Test Customer",
+			selling=1,
+			discount_percentage=20,
+			priority=2,
+		)
+
+		def get_discount_percentage(**kwargs):
+			args = frappe._dict(
+				{
+					"item_code": "_Test Item",
+					"company": "_Test Company",
+					"price_list": "_Test Price List",
+					"currency": "_Test Currency",
+					"doctype": "Sales Order",
+					"conversion_rate": 1,
+					"price_list_currency": "_Test Currency",
+					"plc_conversion_rate": 1,
+					"order_type": "Sales",
+					"customer": "_Test Customer",
+					"name": None,
+				}
+			)
+			args.update(kwargs)
+
+			discount_percentage = get_item_details(args.copy()).get("discount_percentage")
+
+			# same rules as the ones queried from the database
+			frappe.db.set_single_value("Accounts Settings", "use_pricing_rule_index", 0)
+			try:
+				self.assertEqual(
+					get_item_details(args.copy()).get("discount_percentage"), discount_percentage
+				)
+			finally:
+				frappe.db.set_single_value("Accounts Settings", "use_pricing_rule_index", 1)
+
+			return discount_percentage
+
+		self.assertEqual(get_discount_percentage(), 20)
+		self.assertEqual(get_discount_percentage(customer="_Test Customer 1"), 10)
+		self.assertEqual(get_discount_percentage(item_code="_Test Item 2"), 15)
+
+		# matched regardless of case, like in the query
+		self.assertEqual(get_discount_percentage(customer="_test customer"), 20)
+
+		# rebuilt once a rule is changed
+		customer_rule.discount_percentage = 25
+		customer_rule.save()
+		self.assertEqual(get_discount_percentage(), 25)
+
+		customer_rule.db_set("disable", 1)
+		self.assertEqual(get_discount_percentage(), 10)
+
+	def test_apply_pricing_rule_for_multiple_items(self):
+		from erpnext.accounts.doctype.pricing_rule.pricing_rule import (
+			apply_pricing_rule,
+			get_pricing_rule_for_item,
+		)
+
+		make_pricing_rule(selling=1, discount_percentage=10)
+		make_pricing_rule(
+			title="_Test Pricing Rule 1",
+			apply_on="Item Group",
+			item_group="All Item Groups",
+			selling=1,
+			discount_percentage=15,
+		)
+
+		args = frappe._dict(
+			{
+				"company": "_Test Company",
+				"customer": "_Test Customer",
+				"price_list": "_Test Price List",
+				"currency": "_Test Currency",
+				"conversion_rate": 1,
+				"price_list_currency": "_Test Currency",
+				"plc_conversion_rate": 1,
+				"doctype": "Sales Order",
+				"transaction_date": frappe.utils.nowdate(),
+				"items": [
+					{
+						"doctype": "Sales Order Item",
+						"name": f"row-{idx}",
+						"item_code": item_code,
+						"qty": 1,
+						"price_list_rate": 100,
+					}
+					for idx, item_code in enumerate(
+						["_Test Item", "_Test Item 2", "_Test Item", "_Test Item 2"]
+					)
+				],
+			}
+		)
+
+		# same as pricing the items one by one
+		expected = []
+		for item in args["items"]:
+			item_args = frappe._dict({key: value for key, value in args.items() if key != "items"})
+			item_args.update(item)
+			item_args.transaction_type = "selling"
+			expected.append(get_pricing_rule_for_item(item_args))
+
+		out = apply_pricing_rule(args)
+		self.assertEqual(out, expected)
+		self.assertEqual(
+			[frappe.parse_json(row.pricing_rules) for row in out],
+			[[name] for name in frappe.get_all("Pricing Rule", order_by="title", pluck="name")] * 2,
+		)
+
 
 test_dependencies = ["Campaign"]
 
@@ -7,11 +7,17 @@
 import copy
 import json
 import math
+from contextlib import contextmanager
 
 import frappe
 from frappe import _, bold
 from frappe.utils import cint, flt, fmt_money, get_link_to_form, getdate, today
 
+from erpnext.accounts.doctype.pricing_rule.pricing_rule_index import (
+	casefold,
+	get_pricing_rule_index,
+	is_pricing_rule_index_enabled,
+)
 from erpnext.setup.doctype.item_group.item_group import get_child_item_groups
 from erpnext.stock.doctype.warehouse.warehouse import get_child_warehouses
 from erpnext.stock.get_item_details import get_conversion_factor
@@ -23,12 +29,71 @@ class MultiplePricingRuleConflict(frappe.ValidationError):
 
 apply_on_table = {"Item Code": "items", "Item Group": "item_groups", "Brand": "brands"}
 
+selling_doctypes = [
+	"Quotation",
+	"Quotation Item",
+	"Sales Order",
+	"Sales Order Item",
+	"Delivery Note",
+	"Delivery Note Item",
+	"Sales Invoice",
+	"Sales Invoice Item",
+	"POS Invoice",
+	"POS Invoice Item",
+]
+
+# values of the transaction which select the Pricing Rules of an item, besides its item code, group and brand
+pricing_rule_fields = [
+	"transaction_type",
+	"doctype",
+	"company",
+	"customer",
+	"supplier",
+	"campaign",
+	"sales_partner",
+	"customer_group",
+	"territory",
+	"supplier_group",
+	"warehouse",
+	"price_list",
+	"transaction_date",
+]
+
+
+@contextmanager
+def pricing_rule_batch():
+	"""Share the Pricing Rules and cumulative quantities fetched for an item with the other items priced
+	in the block, like the items of a document."""
+	if frappe.flags.pricing_rule_batch is not None:
+		yield
+		return
+
+	frappe.flags.pricing_rule_batch = {}
+	try:
+		yield
+	finally:
+		frappe.flags.pricing_rule_batch = None
+
+
+def get_batch_cached_value(key, generator):
+	batch = frappe.flags.pricing_rule_batch
+	if batch is None:
+		return generator()
+
+	if key not in batch:
+		batch[key] = generator()
+
+	return batch[key]
+
 
 def get_pricing_rules(args, doc=None):
 	pricing_rules = []
 	values = {}
 
-	if not frappe.db.exists("Pricing Rule", {"disable": 0, args.transaction_type: 1}):
+	if is_pricing_rule_index_enabled():
+		if not get_pricing_rule_index().transaction_types.get(args.transaction_type):
+			return
+	elif not frappe.db.exists("Pricing Rule", {"disable": 0, args.transaction_type: 1}):
 		return
 
 	for apply_on in ["Item Code", "Item Group", "Brand"]:
@@ -84,10 +149,14 @@ def sorted_by_priority(pricing_rules, args, doc=None):
 def filter_pricing_rule_based_on_condition(pricing_rules, doc=None):
 	filtered_pricing_rules = []
 	if doc:
+		doc_dict = None
 		for pricing_rule in pricing_rules:
 			if pricing_rule.condition:
+				if doc_dict is None:
+					doc_dict = get_batch_cached_value(("doc", id(doc)), doc.as_dict)
+
 				try:
-					if frappe.safe_eval(pricing_rule.condition, None, doc.as_dict()):
+					if frappe.safe_eval(pricing_rule.condition, None, doc_dict):
 						filtered_pricing_rules.append(pricing_rule)
 				except Exception:
 					pass
@@ -105,6 +174,34 @@ def _get_pricing_rules(apply_on, args, values):
 	if not args.get(apply_on_field):
 		return []
 
+	if apply_on_field == "item_code" and "variant_of" not in args:
+		args.variant_of = frappe.get_cached_value("Item", args.item_code, "variant_of")
+
+	if not args.price_list:
+		args.price_list = None
+
+	key = (
+		apply_on_field,
+		args.get(apply_on_field),
+		args.get("uom") if apply_on_field != "brand" else None,
+		args.variant_of if apply_on_field == "item_code" else None,
+		*(args.get(field) for field in pricing_rule_fields),
+	)
+
+	pricing_rules = get_batch_cached_value(
+		("pricing_rules", key), lambda: _get_matching_pricing_rules(apply_on, args, values)
+	)
+
+	# the rules are updated while they are filtered
+	return [frappe._dict(pricing_rule) for pricing_rule in pricing_rules]
+
+
+def _get_matching_pricing_rules(apply_on, args, values):
+	apply_on_field = frappe.scrub(apply_on)
+
+	if is_pricing_rule_index_enabled():
+		return _get_indexed_pricing_rules(apply_on_field, args)
+
 	child_doc = f"`tabPricing Rule {apply_on}`"
 
 	conditions = item_variant_condition = item_conditions = ""
@@ -119,9 +216,6 @@ def _get_pricing_rules(apply_on, args, values):
 						child_doc=child_doc, item_uom=args.get("uom")
 					)
 				)
-			if "variant_of" not in args:
-				args.variant_of = frappe.get_cached_value("Item", args.item_code, "variant_of")
-
 			if args.variant_of:
 				item_variant_condition = f" or {child_doc}.item_code=%(variant_of)s "
 				values["variant_of"] = args.variant_of
@@ -137,9 +231,6 @@ def _get_pricing_rules(apply_on, args, values):
 	if warehouse_conditions:
 		warehouse_conditions = f" and {warehouse_conditions}"
 
-	if not args.price_list:
-		args.price_list = None
-
 	conditions += " and ifnull(`tabPricing Rule`.for_price_list, '') in (%(price_list)s, '')"
 	values["price_list"] = args.get("price_list")
 
@@ -173,6 +264,76 @@ def _get_pricing_rules(apply_on, args, values):
 	return pricing_rules
 
 
+def _get_indexed_pricing_rules(apply_on_field, args):
+	"""Returns the same rows as the query of `_get_pricing_rules`, matched with the Pricing Rule index."""
+	index = get_pricing_rule_index()
+	value = args.get(apply_on_field)
+
+	def get_rows(value):
+		return index.rows.get((args.transaction_type, apply_on_field, casefold(value)), [])
+
+	rows = []
+	if apply_on_field == "item_group":
+		for item_group in _get_parent_groups("Item Group", value):
+			rows.extend(get_rows(item_group))
+	else:
+		rows.extend(get_rows(value))
+
+	if args.get("uom") and apply_on_field in ["item_code", "item_group"]:
+		rows = [row for row in rows if not row.uom or casefold(row.uom) == casefold(args.uom)]
+
+	if apply_on_field == "item_code" and args.variant_of:
+		rows.extend(get_rows(args.variant_of))
+
+	rows.extend(index.other_rows.get((args.transaction_type, apply_on_field, casefold(value)), []))
+
+	# blank or the value of the transaction
+	values = {"for_price_list": casefold(args.price_list)}
+	for field in ["company", "customer", "supplier", "campaign", "sales_partner"]:
+		values[field] = casefold(args.get(field))
+
+	# blank or one of the ancestors, no condition if the record is not in the tree
+	tree_values = {}
+	for parenttype in ["Customer Group", "Territory", "Supplier Group", "Warehouse"]:
+		field = frappe.scrub(parenttype)
+		if args.get(field):
+			parent_groups = _get_parent_groups(parenttype, args.get(field))
+			if parent_groups:
+				tree_values[field] = {"", *(casefold(group) for group in parent_groups)}
+		else:
+			tree_values[field] = {""}
+
+	transaction_date = getdate(args.transaction_date) if args.get("transaction_date") else None
+	applicable_for = "selling" if args.get("doctype") in selling_doctypes else "buying"
+
+	def is_applicable(rule):
+		if not rule.get(applicable_for):
+			return False
+
+		for field, value in values.items():
+			if casefold(rule.get(field)) not in ("", value):
+				return False
+
+		for field, allowed_values in tree_values.items():
+			if casefold(rule.get(field)) not in allowed_values:
+				return False
+
+		if transaction_date:
+			valid_from = getdate(rule.valid_from or "2000-01-01")
+			valid_upto = getdate(rule.valid_upto or "2500-12-31")
+			return valid_from <= transaction_date <= valid_upto
+
+		return True
+
+	# a row matched by more than one condition is returned once
+	pricing_rules = {id(row): row for row in rows if is_applicable(row)}.values()
+
+	return [
+		frappe._dict(row)
+		for row in sorted(pricing_rules, key=lambda row: (row.priority or "", row.name), reverse=True)
+	]
+
+
 def apply_multiple_pricing_rules(pricing_rules):
 	for d in pricing_rules:
 		if not d.apply_multiple_pricing_rules:
@@ -191,10 +352,34 @@ def _get_tree_conditions(args, parenttype, table, allow_blank=True):
 		if key in frappe.flags.tree_conditions:
 			return frappe.flags.tree_conditions[key]
 
+		parent_groups = _get_parent_groups(parenttype, args.get(field))
+		if parent_groups:
+			if allow_blank:
+				parent_groups.append("")
+			condition = "ifnull({table}.{field}, '') in ({parent_groups})".format(
+				table=table, field=field, parent_groups=", ".join(frappe.db.escape(d) for d in parent_groups)
+			)
+
+			frappe.flags.tree_conditions[key] = condition
+
+	elif allow_blank:
+		condition = f"ifnull({table}.{field}, '') = ''"
+
+	return condition
+
+
+def _get_parent_groups(parenttype, name):
+	"""Returns the record and its ancestors, and the root of the Customer Group, Item Group and Territory
+	trees."""
+	if not frappe.flags.parent_groups:
+		frappe.flags.parent_groups = {}
+
+	key = (parenttype, name)
+	if key not in frappe.flags.parent_groups:
 		try:
-			lft, rgt = frappe.db.get_value(parenttype, args.get(field), ["lft", "rgt"])
+			lft, rgt = frappe.db.get_value(parenttype, name, ["lft", "rgt"])
 		except TypeError:
-			frappe.throw(_("Invalid {0}").format(args.get(field)))
+			frappe.throw(_("Invalid {0}").format(name))
 
 		parent_groups = frappe.db.sql_list(
 			"""select name from `tab{}`
@@ -215,19 +400,9 @@ def _get_tree_conditions(args, parenttype, table, allow_blank=True):
 			if root_name and root_name[0][0]:
 				parent_groups.append(root_name[0][0])
 
-		if parent_groups:
-			if allow_blank:
-				parent_groups.append("")
-			condition = "ifnull({table}.{field}, '') in ({parent_groups})".format(
-				table=table, field=field, parent_groups=", ".join(frappe.db.escape(d) for d in parent_groups)
-			)
-
-			frappe.flags.tree_conditions[key] = condition
-
-	elif allow_blank:
-		condition = f"ifnull({table}.{field}, '') = ''"
+		frappe.flags.parent_groups[key] = parent_groups
 
-	return condition
+	return list(frappe.flags.parent_groups[key])
 
 
 def get_other_conditions(conditions, values, args):
@@ -248,18 +423,7 @@ def get_other_conditions(conditions, values, args):
 			and ifnull(`tabPricing Rule`.valid_upto, '2500-12-31')"""
 		values["transaction_date"] = args.get("transaction_date")
 
-	if args.get("doctype") in [
-		"Quotation",
-		"Quotation Item",
-		"Sales Order",
-		"Sales Order Item",
-		"Delivery Note",
-		"Delivery Note Item",
-		"Sales Invoice",
-		"Sales Invoice Item",
-		"POS Invoice",
-		"POS Invoice Item",
-	]:
+	if args.get("doctype") in selling_doctypes:
 		conditions += """ and ifnull(`tabPricing Rule`.selling, 0) = 1"""
 	else:
 		conditions += """ and ifnull(`tabPricing Rule`.buying, 0) = 1"""
@@ -501,8 +665,17 @@ def get_qty_and_rate_for_other_item(doc, pr_doc, pricing_rules, row_item):
 def get_qty_amount_data_for_cumulative(pr_doc, doc, items=None):
 	if items is None:
 		items = []
-	sum_qty, sum_amt = [0, 0]
+
 	doctype = doc.get("parenttype") or doc.doctype
+	key = ("cumulative", pr_doc.name, doctype, frozenset(items))
+
+	return list(
+		get_batch_cached_value(key, lambda: _get_qty_amount_data_for_cumulative(pr_doc, doctype, items))
+	)
+
+
+def _get_qty_amount_data_for_cumulative(pr_doc, doctype, items):
+	sum_qty, sum_amt = [0, 0]
 
 	date_field = (
 		"transaction_date" if frappe.get_meta(doctype).has_field("transaction_date") else "posting_date"
@@ -9,6 +9,9 @@ from frappe.model.document import Document
 from frappe.utils import get_link_to_form
 from frappe.utils.scheduler import is_scheduler_inactive
 
+# payments and journals reconciled by a job, progress is committed after each of them
+REFERENCES_PER_JOB = 20
+
 
 class ProcessPaymentReconciliation(Document):
 	# begin: auto-generated types
@@ -19,6 +22,7 @@ class ProcessPaymentReconciliation(Document):
 	if TYPE_CHECKING:
 		from frappe.types import DF
 
+		allocation_strategy: DF.Literal["FIFO", "Exact Amount"]
 		amended_from: DF.Link | None
 		bank_cash_account: DF.Link | None
 		company: DF.Link
@@ -107,6 +111,7 @@ def get_pr_instance(doc: str):
 		"to_invoice_date",
 		"from_payment_date",
 		"to_payment_date",
+		"allocation_strategy",
 	]
 	d = {}
 	for field in fields:
@@ -201,27 +206,26 @@ def trigger_reconciliation_for_queued_docs():
 
 	if not is_scheduler_inactive():
 		# Get all queued documents
+		fields = ["company", "party_type", "party", "receivable_payable_account", "default_advance_account"]
+
 		all_queued = frappe.db.get_all(
 			"Process Payment Reconciliation",
 			filters={"docstatus": 1, "status": "Queued"},
+			fields=["name", *fields],
 			order_by="creation desc",
-			as_list=1,
 		)
 
 		docs_to_trigger = []
 		unique_filters = set()
 		queue_size = frappe.db.get_single_value("Accounts Settings", "reconciliation_queue_size") or 5
 
-		fields = ["company", "party_type", "party", "receivable_payable_account", "default_advance_account"]
-
 		def get_filters_as_tuple(fields, doc):
 			filters = ()
 			for x in fields:
 				filters += tuple(doc.get(x))
 			return filters
 
-		for x in all_queued:
-			doc = frappe.get_doc("Process Payment Reconciliation", x)
+		for doc in all_queued:
 			filters = get_filters_as_tuple(fields, doc)
 			if filters not in unique_filters:
 				unique_filters.add(filters)
@@ -403,44 +407,30 @@ def reconcile(doc: None | str = None) -> None:
 			reconciled_entries, total_allocations = res[0]
 			if reconciled_entries != total_allocations:
 				try:
-					# Fetch next allocation
-					allocations = get_next_allocation(log)
-
-					pr = get_pr_instance(doc)
-
-					# pass allocation to PR instance
-					for x in allocations:
-						pr.append("allocation", x)
-
-					# reconcile
-					pr.reconcile_allocations(skip_ref_details_update_for_pe=True)
-
-					# If Payment Entry, update details only for newly linked references
-					# This is for performance
-					if allocations[0].reference_type == "Payment Entry":
-						references = [(x.invoice_type, x.invoice_number) for x in allocations]
-						pe = frappe.get_doc(allocations[0].reference_type, allocations[0].reference_name)
-						pe.flags.ignore_validate_update_after_submit = True
-						pe.set_missing_ref_details(update_ref_details_only_for=references)
-						pe.save()
-
-					# Update reconciled flag
-					allocation_names = [x.name for x in allocations]
-					ppa = qb.DocType("Process Payment Reconciliation Log Allocations")
-					qb.update(ppa).set(ppa.reconciled, True).where(ppa.name.isin(allocation_names)).run()
-
-					# Update reconciled count
-					reconciled_count = frappe.db.count(
-						"Process Payment Reconciliation Log Allocations",
-						filters={"parent": log, "reconciled": True},
-					)
-					frappe.db.set_value(
-						"Process Payment Reconciliation Log", log, "reconciled_entries", reconciled_count
+					for _i in range(REFERENCES_PER_JOB):
+						# Fetch next allocation
+						allocations = get_next_allocation(log)
+						if not allocations:
+							break
+
+						reconcile_allocation(doc, log, allocations)
+
+						# keep the progress if the next reference fails
+						frappe.db.commit()
+
+						if frappe.db.get_value("Process Payment Reconciliation", doc, "status") == "Paused":
+							break
+
+					reconciled_entries = frappe.db.get_value(
+						"Process Payment Reconciliation Log", log, "reconciled_entries"
 					)
 
 				except Exception:
 					# Update the parent doc about the exception
 					frappe.db.rollback()
+					reconciled_entries = frappe.db.get_value(
+						"Process Payment Reconciliation Log", log, "reconciled_entries"
+					)
 
 					traceback = frappe.get_traceback(with_context=True)
 					if traceback:
@@ -503,6 +493,39 @@ def reconcile(doc: None | str = None) -> None:
 				frappe.db.set_value("Process Payment Reconciliation", doc, "status", "Completed")
 
 
+def reconcile_allocation(doc: str, log: str, allocations: list) -> None:
+	"""Reconcile the allocations of a payment or journal and update the progress in the log."""
+	pr = get_pr_instance(doc)
+
+	# pass allocation to PR instance
+	for x in allocations:
+		pr.append("allocation", x)
+
+	# reconcile
+	pr.reconcile_allocations(skip_ref_details_update_for_pe=True)
+
+	# If Payment Entry, update details only for newly linked references
+	# This is for performance
+	if allocations[0].reference_type == "Payment Entry":
+		references = [(x.invoice_type, x.invoice_number) for x in allocations]
+		pe = frappe.get_doc(allocations[0].reference_type, allocations[0].reference_name)
+		pe.flags.ignore_validate_update_after_submit = True
+		pe.set_missing_ref_details(update_ref_details_only_for=references)
+		pe.save()
+
+	# Update reconciled flag
+	allocation_names = [x.name for x in allocations]
+	ppa = qb.DocType("Process Payment Reconciliation Log Allocations")
+	qb.update(ppa).set(ppa.reconciled, True).where(ppa.name.isin(allocation_names)).run()
+
+	# Update reconciled count
+	reconciled_count = frappe.db.count(
+		"Process Payment Reconciliation Log Allocations",
+		filters={"parent": log, "reconciled": True},
+	)
+	frappe.db.set_value("Process Payment Reconciliation Log", log, "reconciled_entries", reconciled_count)
+
+
 @frappe.whitelist()
 def is_any_doc_running(for_filter: str | dict | None = None) -> str | None:
 	running_doc = None
@@ -10,6 +10,10 @@ from frappe.utils import cint, cstr, flt, formatdate, get_link_to_form, getdate,
 
 import erpnext
 from erpnext.accounts.deferred_revenue import validate_service_stop_date
+from erpnext.accounts.doctype.daily_account_balance.daily_account_balance import (
+	get_voucher_balances,
+	update_daily_account_balances,
+)
 from erpnext.accounts.doctype.repost_accounting_ledger.repost_accounting_ledger import (
 	validate_docs_for_deferred_accounting,
 	validate_docs_for_voucher_types,
@@ -816,6 +820,10 @@ class PurchaseInvoice(BuyingController):
 		self.update_supplier_outstanding(update_outstanding)
 
 	def cancel_provisional_entries(self):
+		from erpnext.accounts.report.consolidated_financial_statement.consolidated_financial_statement import (
+			invalidate_ledger_version,
+		)
+
 		rows = set()
 		purchase_receipts = set()
 		for d in self.items:
@@ -824,6 +832,11 @@ class PurchaseInvoice(BuyingController):
 				rows.add(d.name)
 
 		if rows:
+			previous_balances = {
+				purchase_receipt: get_voucher_balances("Purchase Receipt", purchase_receipt)
+				for purchase_receipt in purchase_receipts
+			}
+
 			# cancel gl entries
 			gle = qb.DocType("GL Entry")
 			gle_update_query = (
@@ -837,6 +850,11 @@ class PurchaseInvoice(BuyingController):
 			)
 			gle_update_query.run()
 
+			for purchase_receipt, balances in previous_balances.items():
+				update_daily_account_balances("Purchase Receipt", purchase_receipt, balances)
+
+			invalidate_ledger_version()
+
 	def update_supplier_outstanding(self, update_outstanding):
 		if update_outstanding == "No":
 			update_voucher_outstanding(
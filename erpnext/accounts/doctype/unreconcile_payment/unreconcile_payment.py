@@ -12,6 +12,7 @@ from frappe.utils.data import comma_and
 
 from erpnext.accounts.utils import (
 	cancel_exchange_gain_loss_journal,
+	defer_outstanding_updates,
 	unlink_ref_doc_from_payment_entries,
 	update_voucher_outstanding,
 )
@@ -58,21 +59,22 @@ class UnreconcilePayment(Document):
 
 	def on_submit(self):
 		# todo: more granular unreconciliation
-		for alloc in self.allocations:
-			doc = frappe.get_doc(alloc.reference_doctype, alloc.reference_name)
-			unlink_ref_doc_from_payment_entries(doc, self.voucher_no)
-			cancel_exchange_gain_loss_journal(doc, self.voucher_type, self.voucher_no)
-
-			# update outstanding amounts
-			update_voucher_outstanding(
-				alloc.reference_doctype,
-				alloc.reference_name,
-				alloc.account,
-				alloc.party_type,
-				alloc.party,
-			)
+		with defer_outstanding_updates():
+			for alloc in self.allocations:
+				doc = frappe.get_doc(alloc.reference_doctype, alloc.reference_name)
+				unlink_ref_doc_from_payment_entries(doc, self.voucher_no)
+				cancel_exchange_gain_loss_journal(doc, self.voucher_type, self.voucher_no)
+
+				# update outstanding amounts
+				update_voucher_outstanding(
+					alloc.reference_doctype,
+					alloc.reference_name,
+					alloc.account,
+					alloc.party_type,
+					alloc.party,
+				)
 
-			frappe.db.set_value("Unreconcile Payment Entries", alloc.name, "unlinked", True)
+				frappe.db.set_value("Unreconcile Payment Entries", alloc.name, "unlinked", True)
 
 
 @frappe.whitelist()
@@ -0,0 +1,74 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase, change_settings
+from frappe.utils import flt, today
+
+from erpnext.accounts.doctype.payment_entry.payment_entry import get_payment_entry
+from erpnext.accounts.doctype.sales_invoice.test_sales_invoice import create_sales_invoice
+from erpnext.accounts.doctype.voucher_outstanding.voucher_outstanding import (
+	build_voucher_outstandings,
+	is_voucher_outstanding_built,
+	refresh_voucher_outstanding_rows,
+)
+from erpnext.accounts.report.accounts_receivable.accounts_receivable import execute
+
+
+class TestVoucherOutstanding(FrappeTestCase):
+	def get_outstanding(self, voucher_no):
+		outstanding = frappe.db.get_value(
+			"Voucher Outstanding",
+			{"voucher_type": "Sales Invoice", "voucher_no": voucher_no},
+			["invoiced", "paid", "outstanding", "outstanding_in_account_currency"],
+			as_dict=True,
+		)
+
+		return [flt(outstanding[fieldname], 2) for fieldname in outstanding]
+
+	def get_receivables(self):
+		filters = {"company": "_Test Company", "report_date": today(), "range": "30, 60, 90, 120"}
+		return sorted((row.voucher_no, flt(row.outstanding, 2)) for row in execute(filters)[1])
+
+	@change_settings("Accounts Settings", {"use_voucher_outstandings": 1})
+	def test_voucher_outstanding(self):
+		# built from the Payment Ledger Entries once enabled
+		self.assertTrue(is_voucher_outstanding_built())
+
+		si = create_sales_invoice(rate=100)
+		self.assertEqual(self.get_outstanding(si.name), [100, 0, 100, 100])
+
+		pe = get_payment_entry(si.doctype, si.name, party_amount=40, bank_account="_Test Cash - _TC")
+		pe.submit()
+		self.assertEqual(self.get_outstanding(si.name), [100, 40, 60, 60])
+
+		# settled vouchers are skipped by the report
+		receivables = self.get_receivables()
+		self.assertIn((si.name, 60), receivables)
+		frappe.db.set_single_value("Accounts Settings", "use_voucher_outstandings", 0)
+		try:
+			self.assertEqual(receivables, self.get_receivables())
+		finally:
+			frappe.db.set_single_value("Accounts Settings", "use_voucher_outstandings", 1)
+
+		pe.cancel()
+		self.assertEqual(self.get_outstanding(si.name), [100, 0, 100, 100])
+
+		# rebuilt from the Payment Ledger Entries
+		build_voucher_outstandings()
+		self.assertEqual(self.get_outstanding(si.name), [100, 0, 100, 100])
+
+	@change_settings("Accounts Settings", {"use_voucher_outstandings": 1})
+	def test_outstanding_rows_are_upserted(self):
+		si = create_sales_invoice(rate=100)
+		name = frappe.db.get_value("Voucher Outstanding", {"voucher_no": si.name})
+
+		pe = get_payment_entry(si.doctype, si.name, party_amount=100, bank_account="_Test Cash - _TC")
+		pe.submit()
+		self.assertEqual(self.get_outstanding(si.name), [100, 100, 0, 0])
+		self.assertEqual(frappe.db.get_value("Voucher Outstanding", {"voucher_no": si.name}), name)
+
+		# rows without any entry against the voucher are deleted
+		frappe.db.set_value("Payment Ledger Entry", {"against_voucher_no": si.name}, "delinked", 1)
+		refresh_voucher_outstanding_rows([(si.doctype, si.name)])
+		self.assertFalse(frappe.db.exists("Voucher Outstanding", {"voucher_no": si.name}))
@@ -0,0 +1,325 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+"""Invoiced, paid, credit note and outstanding amounts of each voucher.
+
+Used by the Accounts Receivable/Payable reports and by `QueryPaymentLedger`
+to skip the Payment Ledger Entries against the settled vouchers, instead of
+summing up all the Payment Ledger Entries on each run.
+
+The amounts are the sum of the Payment Ledger Entries against the voucher for
+each account and party, split like the Accounts Receivable report does. They
+can only be used when the entries are filtered by company, account and party,
+as the amounts of a voucher add up to zero for these filters alone.
+
+The amounts of all the vouchers are built in the background once enabled in
+Accounts Settings, see `erpnext.utilities.summary_table`. The amounts of a
+voucher are recomputed whenever the Payment Ledger Entries against it are
+posted, delinked, unlinked or deleted, and those of the vouchers of an account
+or party are recomputed once another one is merged into it.
+"""
+
+from collections import defaultdict
+
+import frappe
+from frappe import qb
+from frappe.model.document import Document
+from frappe.query_builder import Case
+from frappe.query_builder.functions import Max, Sum
+from frappe.utils import create_batch
+
+from erpnext.utilities.summary_table import build_in_batches, is_summary_table_built
+
+VOUCHER_BATCH_SIZE = 1000
+
+VOUCHER_FIELDS = [
+	"company",
+	"voucher_type",
+	"voucher_no",
+	"account_type",
+	"account",
+	"account_currency",
+	"party_type",
+	"party",
+	"last_posting_date",
+]
+
+AMOUNT_FIELDS = [
+	"invoiced",
+	"paid",
+	"credit_note",
+	"outstanding",
+	"invoiced_in_account_currency",
+	"paid_in_account_currency",
+	"credit_note_in_account_currency",
+	"outstanding_in_account_currency",
+]
+
+# fields of the Payment Ledger Entry which select all or none of the entries of a voucher outstanding
+KEY_FIELDS = ["company", "account_type", "account", "party_type", "party"]
+
+UNIQUE_FIELDS = ["voucher_type", "voucher_no", "account", "party_type", "party"]
+
+
+class VoucherOutstanding(Document):
+	# begin: auto-generated types
+	# This code is auto-generated. Do not modify anything in this block.
+
+	from typing import TYPE_CHECKING
+
+	if TYPE_CHECKING:
+		from frappe.types import DF
+
+		account: DF.Link
+		account_currency: DF.Link | None
+		account_type: DF.Literal["Receivable", "Payable"]
+		company: DF.Link
+		credit_note: DF.Currency
+		credit_note_in_account_currency: DF.Currency
+		invoiced: DF.Currency
+		invoiced_in_account_currency: DF.Currency
+		last_posting_date: DF.Date | None
+		outstanding: DF.Currency
+		outstanding_in_account_currency: DF.Currency
+		paid: DF.Currency
+		paid_in_account_currency: DF.Currency
+		party: DF.DynamicLink | None
+		party_type: DF.Link | None
+		voucher_no: DF.DynamicLink
+		voucher_type: DF.Link
+	# end: auto-generated types
+
+	pass
+
+
+def on_doctype_update():
+	frappe.db.add_unique(
+		"Voucher Outstanding",
+		["voucher_type", "voucher_no", "account", "party_type", "party"],
+		constraint_name="unique_voucher_account_party",
+	)
+
+
+def get_merge_field(doctype) -> str | None:
+	"""Field of the outstandings linked to a document which can be merged into another one."""
+	if doctype == "Account":
+		return "account"
+
+	if frappe.db.exists("Party Type", doctype):
+		return "party"
+
+
+def before_rename(doc, method, old, new, merge=False):
+	"""The outstandings of a merged account or party would collide with the ones of the document it is
+	merged into, hence they are deleted and recomputed in `after_rename`."""
+	if merge and is_voucher_outstanding_enabled() and (fieldname := get_merge_field(doc.doctype)):
+		filters = {fieldname: old}
+		if fieldname == "party":
+			filters["party_type"] = doc.doctype
+
+		frappe.db.delete("Voucher Outstanding", filters)
+
+
+def after_rename(doc, method, old, new, merge=False):
+	if not (merge and is_voucher_outstanding_enabled() and (fieldname := get_merge_field(doc.doctype))):
+		return
+
+	ple = qb.DocType("Payment Ledger Entry")
+	query = (
+		qb.from_(ple)
+		.select(ple.against_voucher_type, ple.against_voucher_no)
+		.distinct()
+		.where((ple[fieldname] == new) & (ple.delinked == 0))
+	)
+	if fieldname == "party":
+		query = query.where(ple.party_type == doc.doctype)
+
+	refresh_voucher_outstanding_rows(query.run())
+
+
+def is_voucher_outstanding_enabled():
+	return frappe.db.get_single_value("Accounts Settings", "use_voucher_outstandings")
+
+
+def is_voucher_outstanding_built() -> bool:
+	return bool(is_voucher_outstanding_enabled() and is_summary_table_built("Voucher Outstanding"))
+
+
+def get_outstandings_query():
+	"""Amounts of the Payment Ledger Entries grouped by against voucher, account and party."""
+	ple = qb.DocType("Payment Ledger Entry")
+
+	is_invoiced = (ple.amount > 0) & ~(
+		ple.voucher_type.isin(["Journal Entry", "Payment Entry"]) & (ple.voucher_no != ple.against_voucher_no)
+	)
+	is_credit_note = (
+		(ple.amount <= 0)
+		& ple.voucher_type.isin(["Sales Invoice", "Purchase Invoice"])
+		& (ple.voucher_no != ple.against_voucher_no)
+	)
+
+	query = (
+		qb.from_(ple)
+		.select(
+			ple.company,
+			ple.against_voucher_type.as_("voucher_type"),
+			ple.against_voucher_no.as_("voucher_no"),
+			ple.account_type,
+			ple.account,
+			ple.account_currency,
+			ple.party_type,
+			ple.party,
+			Max(ple.posting_date).as_("last_posting_date"),
+		)
+		.where(ple.delinked == 0)
+		.groupby(ple.against_voucher_type, ple.against_voucher_no, ple.account, ple.party_type, ple.party)
+	)
+
+	for suffix in ("", "_in_account_currency"):
+		amount = ple["amount" + suffix]
+		query = query.select(
+			Sum(Case().when(is_invoiced, amount).else_(0)).as_("invoiced" + suffix),
+			Sum(Case().when(is_invoiced | is_credit_note, 0).else_(-amount)).as_("paid" + suffix),
+			Sum(Case().when(is_credit_note, -amount).else_(0)).as_("credit_note" + suffix),
+			Sum(amount).as_("outstanding" + suffix),
+		)
+
+	return query
+
+
+def upsert_outstandings(rows):
+	"""Insert the outstandings, or update the existing ones of the same voucher, account and party."""
+	fields = ["name", *VOUCHER_FIELDS, *AMOUNT_FIELDS]
+
+	values = []
+	for row in rows:
+		values.extend(
+			[
+				frappe.generate_hash(length=10),
+				*(row[fieldname] for fieldname in VOUCHER_FIELDS),
+				*(row[fieldname] or 0 for fieldname in AMOUNT_FIELDS),
+			]
+		)
+
+	columns = ", ".join(fields)
+	placeholders = ", ".join(["({})".format(", ".join(["%s"] * len(fields)))] * len(rows))
+	updates = ", ".join(f"{fieldname} = values({fieldname})" for fieldname in fields[1:])
+
+	frappe.db.sql(
+		f"""
+		insert into `tabVoucher Outstanding` ({columns})
+		values {placeholders}
+		on duplicate key update {updates}
+		""",
+		values,
+	)
+
+
+def build_voucher_outstandings():
+	"""Build the outstandings of all the vouchers, run by `build_summary_table`."""
+	ple = qb.DocType("Payment Ledger Entry")
+
+	vouchers = (
+		qb.from_(ple)
+		.select(ple.against_voucher_type, ple.against_voucher_no)
+		.distinct()
+		.where((ple.delinked == 0) & ple.against_voucher_no.isnotnull())
+	).run()
+
+	build_in_batches(create_batch(sorted(vouchers), VOUCHER_BATCH_SIZE), refresh_voucher_outstanding_rows)
+
+
+def refresh_voucher_outstanding_rows(vouchers):
+	"""Recompute the outstandings of the vouchers, a list of (voucher_type, voucher_no), from the Payment
+	Ledger Entries against them.
+
+	The outstandings are upserted and only the existing rows without entries are deleted, so that no gap
+	is locked in the table by a posting."""
+	if not is_voucher_outstanding_enabled():
+		return
+
+	voucher_nos = defaultdict(set)
+	for voucher_type, voucher_no in vouchers:
+		if voucher_type and voucher_no:
+			voucher_nos[voucher_type].add(voucher_no)
+
+	ple = qb.DocType("Payment Ledger Entry")
+	vo = qb.DocType("Voucher Outstanding")
+
+	for voucher_type, names in voucher_nos.items():
+		for batch in create_batch(sorted(names), VOUCHER_BATCH_SIZE):
+			existing_rows = (
+				qb.from_(vo)
+				.select(vo.name, *(vo[fieldname] for fieldname in UNIQUE_FIELDS))
+				.where((vo.voucher_type == voucher_type) & vo.voucher_no.isin(batch))
+				.run(as_dict=True)
+			)
+
+			# locking read, to see the entries committed by a concurrent posting against the voucher
+			rows = (
+				get_outstandings_query()
+				.where((ple.against_voucher_type == voucher_type) & ple.against_voucher_no.isin(batch))
+				.for_update()
+				.run(as_dict=True)
+			)
+			if rows:
+				upsert_outstandings(rows)
+
+			keys = {get_unique_key(row) for row in rows}
+			if deleted := [row.name for row in existing_rows if get_unique_key(row) not in keys]:
+				qb.from_(vo).delete().where(vo.name.isin(deleted)).run()
+
+
+def get_unique_key(row):
+	return tuple(row[fieldname] for fieldname in UNIQUE_FIELDS)
+
+
+def get_against_vouchers(voucher_type, voucher_no) -> list:
+	"""Vouchers against which the voucher has Payment Ledger Entries, to be passed to
+	`refresh_voucher_outstanding_rows` once the entries are changed."""
+	if not is_voucher_outstanding_enabled():
+		return []
+
+	ple = qb.DocType("Payment Ledger Entry")
+	return (
+		qb.from_(ple)
+		.select(ple.against_voucher_type, ple.against_voucher_no)
+		.distinct()
+		.where((ple.voucher_type == voucher_type) & (ple.voucher_no == voucher_no) & (ple.delinked == 0))
+		.run()
+	)
+
+
+def is_filtered_by_key_fields(criteria) -> bool:
+	"""Returns True if the criteria on the Payment Ledger Entry only filter the entries by the fields an
+	outstanding is grouped by."""
+	ple = qb.DocType("Payment Ledger Entry")
+
+	for criterion in criteria:
+		for field in criterion.fields_():
+			if field.table == ple and field.name not in KEY_FIELDS:
+				return False
+
+	return True
+
+
+def get_open_vouchers_query(company=None, posting_date=None, criteria=None):
+	"""Vouchers with an outstanding, or with Payment Ledger Entries posted after the posting date.
+
+	`criteria` are on the Payment Ledger Entry and must be filtered by key fields only."""
+	ple = qb.DocType("Payment Ledger Entry")
+	vo = qb.DocType("Voucher Outstanding")
+
+	is_open = (vo.outstanding != 0) | (vo.outstanding_in_account_currency != 0)
+	if posting_date:
+		is_open |= vo.last_posting_date > posting_date
+
+	query = qb.from_(vo).select(vo.voucher_no).distinct().where(is_open)
+
+	if company:
+		query = query.where(vo.company == company)
+
+	for criterion in criteria or []:
+		query = query.where(criterion.replace_table(ple, vo))
+
+	return query
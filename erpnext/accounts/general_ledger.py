@@ -18,9 +18,21 @@ from erpnext.accounts.doctype.accounting_dimension_filter.accounting_dimension_f
 )
 from erpnext.accounts.doctype.accounting_period.accounting_period import ClosedAccountingPeriod
 from erpnext.accounts.doctype.budget.budget import validate_expense_against_budget
-from erpnext.accounts.utils import create_payment_ledger_entry
+from erpnext.accounts.doctype.daily_account_balance.daily_account_balance import (
+	get_voucher_balances,
+	update_daily_account_balances,
+)
+from erpnext.accounts.doctype.gl_entry.gl_entry import (
+	update_outstanding_amt,
+	validate_balance_type,
+	validate_frozen_account,
+)
+from erpnext.accounts.utils import bulk_insert_documents, create_payment_ledger_entry
 from erpnext.exceptions import InvalidAccountDimensionError, MandatoryAccountDimensionError
 
+# vouchers with more GL Entries are posted in bulk, if enabled in Accounts Settings
+BULK_POSTING_THRESHOLD = 100
+
 
 def make_gl_entries(
 	gl_map,
@@ -44,8 +56,13 @@ def make_gl_entries(
 						adv_adj=adv_adj,
 						update_outstanding=update_outstanding,
 						from_repost=from_repost,
+						bulk=is_bulk_posting(gl_map),
 					)
+
+				voucher_type, voucher_no = gl_map[0]["voucher_type"], gl_map[0]["voucher_no"]
+				previous_balances = get_voucher_balances(voucher_type, voucher_no)
 				save_entries(gl_map, adv_adj, update_outstanding, from_repost)
+				update_daily_account_balances(voucher_type, voucher_no, previous_balances)
 			# Post GL Map proccess there may no be any GL Entries
 			elif gl_map:
 				frappe.throw(
@@ -196,18 +213,23 @@ def distribute_gl_based_on_cost_center_allocation(gl_map, precision=None, from_r
 		)
 
 	new_gl_map = []
+	validate_budget = not from_repost and has_budgets()
+	cost_center_allocations = {}
 	for d in gl_map:
 		cost_center = d.get("cost_center")
 
 		# Validate budget against main cost center
-		if not from_repost:
+		if validate_budget:
 			validate_expense_against_budget(
 				d, expense_amount=flt(d.debit, precision) - flt(d.credit, precision)
 			)
 
-		cost_center_allocation = get_cost_center_allocation_data(
-			gl_map[0]["company"], gl_map[0]["posting_date"], cost_center
-		)
+		if cost_center not in cost_center_allocations:
+			cost_center_allocations[cost_center] = get_cost_center_allocation_data(
+				gl_map[0]["company"], gl_map[0]["posting_date"], cost_center
+			)
+
+		cost_center_allocation = cost_center_allocations[cost_center]
 		if not cost_center_allocation:
 			new_gl_map.append(d)
 			continue
@@ -227,6 +249,10 @@ def distribute_gl_based_on_cost_center_allocation(gl_map, precision=None, from_r
 	return new_gl_map
 
 
+def has_budgets():
+	return bool(frappe.get_all("Budget", limit=1))
+
+
 def get_cost_center_allocation_data(company, posting_date, cost_center):
 	cost_center_allocation = frappe.db.get_value(
 		"Cost Center Allocation",
@@ -255,6 +281,7 @@ def get_cost_center_allocation_data(company, posting_date, cost_center):
 
 def merge_similar_entries(gl_map, precision=None):
 	merged_gl_map = []
+	merged_entries = {}
 	accounting_dimensions = get_accounting_dimensions()
 	merge_properties = get_merge_properties(accounting_dimensions)
 
@@ -266,7 +293,7 @@ def merge_similar_entries(gl_map, precision=None):
 		entry.merge_key = get_merge_key(entry, merge_properties)
 		# if there is already an entry in this account then just add it
 		# to that entry
-		same_head = check_if_in_list(entry, merged_gl_map)
+		same_head = merged_entries.get(entry.merge_key)
 		if same_head:
 			same_head.debit = flt(same_head.debit) + flt(entry.debit)
 			same_head.debit_in_account_currency = flt(same_head.debit_in_account_currency) + flt(
@@ -283,6 +310,7 @@ def merge_similar_entries(gl_map, precision=None):
 				entry.credit_in_transaction_currency
 			)
 		else:
+			merged_entries[entry.merge_key] = entry
 			merged_gl_map.append(entry)
 
 	company = gl_map[0].company if gl_map else erpnext.get_default_company()
@@ -397,6 +425,13 @@ def save_entries(gl_map, adv_adj, update_outstanding, from_repost=False):
 		if gl_map[0]["voucher_type"] != "Period Closing Voucher":
 			validate_against_pcv(is_opening, gl_map[0]["posting_date"], gl_map[0]["company"])
 
+	if is_bulk_posting(gl_map):
+		for entry in gl_map:
+			validate_allowed_dimensions(entry, dimension_filter_map)
+
+		make_entries_in_bulk(gl_map, adv_adj, update_outstanding, from_repost)
+		return
+
 	for entry in gl_map:
 		validate_allowed_dimensions(entry, dimension_filter_map)
 		make_entry(entry, adv_adj, update_outstanding, from_repost)
@@ -416,6 +451,88 @@ def make_entry(args, adv_adj, update_outstanding, from_repost=False):
 		validate_expense_against_budget(args)
 
 
+def is_bulk_posting(gl_map):
+	return len(gl_map) > BULK_POSTING_THRESHOLD and cint(
+		frappe.db.get_single_value("Accounts Settings", "enable_bulk_gl_posting")
+	)
+
+
+def make_entries_in_bulk(gl_map, adv_adj, update_outstanding, from_repost=False):
+	"""Insert the GL Entries of a large voucher with multi-row inserts.
+
+	Each entry is validated like in `make_entry`, except the validations which query the
+	database. Those are run once per account, party or budget, and the outstanding of each
+	against voucher is updated once."""
+	voucher_type = gl_map[0]["voucher_type"]
+	validate_ledger = not from_repost and voucher_type != "Period Closing Voucher"
+
+	entries, validated_accounts, account_currencies = [], set(), {}
+	for args in gl_map:
+		gle = frappe.new_doc("GL Entry")
+		gle.update(args)
+		gle.flags.from_repost = from_repost
+		gle.flags.adv_adj = adv_adj
+
+		# party and currency are validated once for each account and party
+		party_key = (gle.account, gle.party_type, gle.party, gle.account_currency)
+		if party_key in account_currencies:
+			gle.flags.party_validated = True
+			gle.account_currency = account_currencies[party_key]
+
+		gle.autoname()
+		gle.validate()
+		account_currencies[party_key] = gle.account_currency
+
+		if validate_ledger:
+			if gle.account not in validated_accounts:
+				validated_accounts.add(gle.account)
+				gle.validate_account_details(adv_adj)
+				validate_frozen_account(gle.account, adv_adj)
+
+			gle.validate_dimensions_for_pl_and_bs()
+
+		gle.docstatus = 1
+		entries.append(gle)
+
+	bulk_insert_documents(entries)
+
+	if not validate_ledger:
+		return
+
+	for account in validated_accounts:
+		validate_balance_type(account, adv_adj)
+
+	if (
+		(update_outstanding or "Yes") == "Yes"
+		and not frappe.flags.is_reverse_depr_entry
+		and not (
+			voucher_type == "Journal Entry"
+			and frappe.get_cached_value("Journal Entry", gl_map[0]["voucher_no"], "voucher_type")
+			== "Exchange Gain Or Loss"
+		)
+	):
+		against_vouchers = {
+			(gle.account, gle.party_type, gle.party, gle.against_voucher_type, gle.against_voucher)
+			for gle in entries
+			if gle.against_voucher_type in ["Journal Entry", "Sales Invoice", "Purchase Invoice", "Fees"]
+			and gle.against_voucher
+			and frappe.get_cached_value("Account", gle.account, "account_type")
+			not in ["Receivable", "Payable"]
+		}
+
+		for against_voucher in against_vouchers:
+			update_outstanding_amt(*against_voucher)
+
+	if has_budgets():
+		budget_keys = set()
+		budget_fields = ["account", "cost_center", "project", *get_accounting_dimensions()]
+		for args in gl_map:
+			budget_key = tuple(args.get(fieldname) for fieldname in budget_fields)
+			if budget_key not in budget_keys:
+				budget_keys.add(budget_key)
+				validate_expense_against_budget(args)
+
+
 def validate_cwip_accounts(gl_map):
 	"""Validate that CWIP account are not used in Journal Entry"""
 	if gl_map and gl_map[0].voucher_type != "Journal Entry":
@@ -668,6 +785,9 @@ def make_reverse_gl_entries(
 		).run(as_dict=1)
 
 	if gl_entries:
+		voucher_type, voucher_no = gl_entries[0]["voucher_type"], gl_entries[0]["voucher_no"]
+		previous_balances = get_voucher_balances(voucher_type, voucher_no)
+
 		create_payment_ledger_entry(
 			gl_entries,
 			cancel=1,
@@ -721,6 +841,7 @@ def make_reverse_gl_entries(
 						(now(), frappe.session.user, tuple(gle_names)),
 					)
 
+		reverse_entries = []
 		for entry in gl_entries:
 			new_gle = copy.deepcopy(entry)
 			new_gle["name"] = None
@@ -747,7 +868,15 @@ def make_reverse_gl_entries(
 				new_gle["posting_date"] = frappe.form_dict.get("posting_date") or getdate()
 
 			if new_gle["debit"] or new_gle["credit"]:
-				make_entry(new_gle, adv_adj, "Yes")
+				reverse_entries.append(new_gle)
+
+		if is_bulk_posting(reverse_entries):
+			make_entries_in_bulk(reverse_entries, adv_adj, "Yes")
+		else:
+			for entry in reverse_entries:
+				make_entry(entry, adv_adj, "Yes")
+
+		update_daily_account_balances(voucher_type, voucher_no, previous_balances)
 
 
 def check_freezing_date(posting_date, adv_adj=False):
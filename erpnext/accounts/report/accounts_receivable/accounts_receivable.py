@@ -15,6 +15,11 @@ from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
 	get_accounting_dimensions,
 	get_dimension_with_children,
 )
+from erpnext.accounts.doctype.voucher_outstanding.voucher_outstanding import (
+	get_open_vouchers_query,
+	is_filtered_by_key_fields,
+	is_voucher_outstanding_built,
+)
 from erpnext.accounts.utils import (
 	build_qb_match_conditions,
 	get_advance_payment_doctypes,
@@ -891,6 +896,7 @@ class ReceivablePayableReport:
 		# get all the GL entries filtered by the given filters
 
 		self.prepare_conditions()
+		skip_settled_vouchers = self.can_skip_settled_vouchers()
 
 		if self.filters.show_future_payments:
 			self.qb_selection_filter.append(
@@ -937,6 +943,8 @@ class ReceivablePayableReport:
 
 		if match_conditions := build_qb_match_conditions("Payment Ledger Entry"):
 			query = query.where(Criterion.all(match_conditions))
+		elif skip_settled_vouchers:
+			query = query.where(self.get_open_vouchers_filter())
 
 		if self.filters.get("group_by_party"):
 			query = query.orderby(self.ple.party, self.ple.posting_date)
@@ -945,6 +953,30 @@ class ReceivablePayableReport:
 
 		self.ple_query = query
 
+	def can_skip_settled_vouchers(self):
+		"""Entries against the settled vouchers add up to zero, unless they are filtered by other fields
+		than company, account and party."""
+		if not self.filters.company or not is_filtered_by_key_fields(
+			self.qb_selection_filter + self.or_filters
+		):
+			return False
+
+		return is_voucher_outstanding_built()
+
+	def get_open_vouchers_filter(self):
+		"""Entries against the vouchers with an outstanding or with entries posted after the report date.
+
+		Entries against the returns and their original invoices are always fetched, as they are added up
+		in the row of the original invoice."""
+		open_vouchers = get_open_vouchers_query(self.filters.company, self.filters.report_date)
+		condition = self.ple.against_voucher_no.isin(open_vouchers)
+
+		if return_entries := getattr(self, "return_entries", None):
+			returns = list(return_entries) + [d for d in return_entries.values() if d]
+			condition |= self.ple.against_voucher_no.isin(returns)
+
+		return condition
+
 	def get_sales_invoices_or_customers_based_on_sales_person(self):
 		if self.filters.get("sales_person"):
 			lft, rgt = frappe.db.get_value("Sales Person", self.filters.get("sales_person"), ["lft", "rgt"])
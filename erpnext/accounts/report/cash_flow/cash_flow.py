@@ -359,6 +359,7 @@ def get_net_income(company, period_list, filters):
 				root.rgt,
 				root_type=root_type,
 				ignore_closing_entries=True,
+				group_by_account=True,
 			)
 
 	for entries in gl_entries_by_account_for_income.values():
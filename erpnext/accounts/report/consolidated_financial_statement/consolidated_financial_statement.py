@@ -2,11 +2,13 @@
 # For license information, please see license.txt
 
 
+import hashlib
 from collections import defaultdict
 
 import frappe
 from frappe import _
-from frappe.query_builder import Criterion
+from frappe.query_builder import Case, Criterion
+from frappe.query_builder.functions import Max, Sum
 from frappe.utils import flt, getdate
 
 import erpnext
@@ -39,6 +41,8 @@ from erpnext.accounts.report.profit_and_loss_statement.profit_and_loss_statement
 )
 from erpnext.accounts.report.utils import convert, convert_to_presentation_currency
 
+LEDGER_VERSION_KEY = "consolidated_financial_statement_ledger_version"
+
 
 def execute(filters=None):
 	columns, data, message, chart = [], [], [], []
@@ -333,6 +337,9 @@ def get_data(companies, root_type, balance_must_be, fiscal_year, filters=None, i
 		end_date = filters.period_end_date
 
 	filters.end_date = end_date
+	opening_date = (
+		fiscal_year.year_start_date if filters.filter_based_on == "Fiscal Year" else filters.period_start_date
+	)
 
 	gl_entries_by_account = {}
 	for root in frappe.db.sql(
@@ -344,6 +351,7 @@ def get_data(companies, root_type, balance_must_be, fiscal_year, filters=None, i
 		set_gl_entries_by_account(
 			start_date,
 			end_date,
+			opening_date,
 			root.lft,
 			root.rgt,
 			filters,
@@ -579,6 +587,7 @@ def prepare_data(accounts, start_date, end_date, balance_must_be, companies, com
 def set_gl_entries_by_account(
 	from_date,
 	to_date,
+	opening_date,
 	root_lft,
 	root_rgt,
 	filters,
@@ -588,7 +597,9 @@ def set_gl_entries_by_account(
 	ignore_closing_entries=False,
 	root_type=None,
 ):
-	"""Returns a dict like { "account": [gl entries], ... }"""
+	"""Returns a dict like { "account": [gl entries], ... }
+
+	The GL Entries of each company are summed up per account, before and after `opening_date`."""
 
 	company_lft, company_rgt = frappe.get_cached_value("Company", filters.get("company"), ["lft", "rgt"])
 
@@ -607,49 +618,28 @@ def set_gl_entries_by_account(
 	)
 
 	for d in companies:
-		gle = frappe.qb.DocType("GL Entry")
-		account = frappe.qb.DocType("Account")
-		query = (
-			frappe.qb.from_(gle)
-			.inner_join(account)
-			.on(account.name == gle.account)
-			.select(
-				gle.posting_date,
-				gle.account,
-				gle.debit,
-				gle.credit,
-				gle.is_opening,
-				gle.company,
-				gle.fiscal_year,
-				gle.debit_in_account_currency,
-				gle.credit_in_account_currency,
-				gle.account_currency,
-				account.account_name,
-				account.account_number,
-			)
-			.where(
-				(gle.company == d.name)
-				& (gle.is_cancelled == 0)
-				& (gle.posting_date <= to_date)
-				& (account.lft >= root_lft)
-				& (account.rgt <= root_rgt)
-			)
-			.orderby(gle.account, gle.posting_date)
+		gl_entries = get_company_gl_entries(
+			d,
+			from_date,
+			to_date,
+			opening_date,
+			root_lft,
+			root_rgt,
+			filters,
+			ignore_closing_entries,
+			root_type,
 		)
 
-		if root_type:
-			query = query.where(account.root_type == root_type)
-		additional_conditions = get_additional_conditions(from_date, ignore_closing_entries, filters, d)
-		if additional_conditions:
-			query = query.where(Criterion.all(additional_conditions))
-		gl_entries = query.run(as_dict=True)
-
 		if filters and filters.get("presentation_currency") != d.default_currency:
 			currency_info["company"] = d.name
 			currency_info["company_currency"] = d.default_currency
 			convert_to_presentation_currency(gl_entries, currency_info)
 
 		for entry in gl_entries:
+			entry.account_name, entry.account_number = frappe.get_cached_value(
+				"Account", entry.account, ["account_name", "account_number"]
+			)
+
 			if entry.account_number:
 				account_name = entry.account_number + " - " + entry.account_name
 			else:
@@ -661,6 +651,108 @@ def set_gl_entries_by_account(
 	return gl_entries_by_account
 
 
+def get_company_gl_entries(
+	d, from_date, to_date, opening_date, root_lft, root_rgt, filters, ignore_closing_entries, root_type
+):
+	"""Returns the GL Entries of the company summed up per account, before and after `opening_date`.
+
+	The sums are cached until the ledger or the chart of accounts of the company is changed, so that
+	the statements of the companies which were not changed are not computed again."""
+	args = [
+		from_date,
+		to_date,
+		opening_date,
+		root_lft,
+		root_rgt,
+		ignore_closing_entries,
+		root_type,
+		filters.get("finance_book"),
+		filters.get("include_default_book_entries"),
+		frappe.get_cached_value("Company", d.name, "default_finance_book"),
+		get_ledger_version(d.name),
+	]
+	args_hash = hashlib.sha256(frappe.as_json(args).encode()).hexdigest()
+	cache_key = f"consolidated_financial_statement:{d.name}:{args_hash}"
+
+	if (gl_entries := frappe.cache().get_value(cache_key)) is not None:
+		return [frappe._dict(entry) for entry in gl_entries]
+
+	gle = frappe.qb.DocType("GL Entry")
+	account = frappe.qb.DocType("Account")
+	is_opening_balance = Case().when(gle.posting_date < opening_date, 1).else_(0)
+	query = (
+		frappe.qb.from_(gle)
+		.inner_join(account)
+		.on(account.name == gle.account)
+		.select(
+			Max(gle.posting_date).as_("posting_date"),
+			gle.account,
+			Sum(gle.debit).as_("debit"),
+			Sum(gle.credit).as_("credit"),
+			gle.company,
+			Sum(gle.debit_in_account_currency).as_("debit_in_account_currency"),
+			Sum(gle.credit_in_account_currency).as_("credit_in_account_currency"),
+			gle.account_currency,
+		)
+		.where(
+			(gle.company == d.name)
+			& (gle.is_cancelled == 0)
+			& (gle.posting_date <= to_date)
+			& (account.lft >= root_lft)
+			& (account.rgt <= root_rgt)
+		)
+		.groupby(gle.account, gle.account_currency, gle.company, is_opening_balance)
+		.orderby(gle.account)
+	)
+
+	if root_type:
+		query = query.where(account.root_type == root_type)
+	additional_conditions = get_additional_conditions(from_date, ignore_closing_entries, filters, d)
+	if additional_conditions:
+		query = query.where(Criterion.all(additional_conditions))
+	gl_entries = query.run(as_dict=True)
+
+	frappe.cache().set_value(cache_key, gl_entries, expires_in_sec=24 * 60 * 60)
+
+	return gl_entries
+
+
+def get_ledger_version(company):
+	"""Changes whenever GL Entries or Accounts of the company are created or changed. Cancelled and
+	reposted entries are created again, hence the creation of the last GL Entry is enough, along with
+	the version changed by `invalidate_ledger_version` for the entries changed in place or deleted."""
+	gle = frappe.qb.DocType("GL Entry")
+	account = frappe.qb.DocType("Account")
+
+	version = frappe.cache.get_value(LEDGER_VERSION_KEY)
+	if not version:
+		version = frappe.generate_hash()
+		frappe.cache.set_value(LEDGER_VERSION_KEY, version)
+
+	return [
+		frappe.qb.from_(gle).select(Max(gle.creation)).where(gle.company == company).run()[0][0],
+		frappe.qb.from_(account).select(Max(account.modified)).where(account.company == company).run()[0][0],
+		version,
+	]
+
+
+def invalidate_ledger_version():
+	"""Change the ledger version of all the companies, once GL Entries are cancelled in place, changed or
+	deleted without creating any other one."""
+	_invalidate_ledger_version()
+
+	# again once the transaction is over, as the old entries may have been cached in the meantime
+	if not frappe.flags.ledger_version_invalidation_registered:
+		frappe.flags.ledger_version_invalidation_registered = True
+		frappe.db.after_commit.add(_invalidate_ledger_version)
+		frappe.db.after_rollback.add(_invalidate_ledger_version)
+
+
+def _invalidate_ledger_version():
+	frappe.flags.ledger_version_invalidation_registered = False
+	frappe.cache.delete_value(LEDGER_VERSION_KEY)
+
+
 def get_account_details(account):
 	return frappe.get_cached_value(
 		"Account",
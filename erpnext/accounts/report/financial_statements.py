@@ -13,6 +13,9 @@ from frappe.query_builder.functions import Max, Min, Sum
 from frappe.utils import add_days, add_months, cint, cstr, flt, formatdate, get_first_day, getdate
 from pypika.terms import ExistsCriterion
 
+from erpnext.accounts.doctype.account_closing_balance.account_closing_balance import (
+	get_last_period_closing_voucher,
+)
 from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
 	get_accounting_dimensions,
 	get_dimension_with_children,
@@ -195,6 +198,7 @@ def get_data(
 			root.rgt,
 			root_type=root_type,
 			ignore_closing_entries=ignore_closing_entries,
+			period_list=period_list,
 		)
 
 	calculate_values(
@@ -435,25 +439,18 @@ def set_gl_entries_by_account(
 	ignore_closing_entries=False,
 	ignore_opening_entries=False,
 	group_by_account=False,
+	period_list=None,
 ):
-	"""Returns a dict like { "account": [gl entries], ... }"""
+	"""Returns a dict like { "account": [gl entries], ... }
+
+	If `period_list` is passed, the GL Entries are summed up per account and period instead of being
+	fetched one by one, see `get_accounting_entries`."""
 	gl_entries = []
 
 	# For balance sheet
-	ignore_closing_balances = frappe.db.get_single_value(
-		"Accounts Settings", "ignore_account_closing_balance"
-	)
-	if not from_date and not ignore_closing_balances:
-		last_period_closing_voucher = frappe.db.get_all(
-			"Period Closing Voucher",
-			filters={
-				"docstatus": 1,
-				"company": filters.company,
-				"period_end_date": ("<", filters["period_start_date"]),
-			},
-			fields=["period_end_date", "name"],
-			order_by="period_end_date desc",
-			limit=1,
+	if not from_date:
+		last_period_closing_voucher = get_last_period_closing_voucher(
+			filters.company, filters["period_start_date"]
 		)
 		if last_period_closing_voucher:
 			gl_entries += get_accounting_entries(
@@ -465,10 +462,10 @@ def set_gl_entries_by_account(
 				root_rgt,
 				root_type,
 				ignore_closing_entries,
-				last_period_closing_voucher[0].name,
+				last_period_closing_voucher.name,
 				group_by_account=group_by_account,
 			)
-			from_date = add_days(last_period_closing_voucher[0].period_end_date, 1)
+			from_date = add_days(last_period_closing_voucher.period_end_date, 1)
 			ignore_opening_entries = True
 
 	gl_entries += get_accounting_entries(
@@ -482,6 +479,7 @@ def set_gl_entries_by_account(
 		ignore_closing_entries,
 		ignore_opening_entries=ignore_opening_entries,
 		group_by_account=group_by_account,
+		period_list=period_list,
 	)
 
 	if filters and filters.get("presentation_currency"):
@@ -505,19 +503,28 @@ def get_accounting_entries(
 	period_closing_voucher=None,
 	ignore_opening_entries=False,
 	group_by_account=False,
+	period_list=None,
 ):
+	"""Returns the GL Entries, or the Account Closing Balances, of the accounts.
+
+	If `period_list` is passed, the GL Entries are summed up per account, fiscal year and period in
+	the query, with the last posting date of each sum as its `posting_date`, instead of being fetched
+	one by one. Each sum is then counted in the same periods as each of its entries would be."""
+	group_by_period = doctype == "GL Entry" and period_list and not group_by_account
+	sum_amounts = group_by_account or group_by_period
+
 	gl_entry = frappe.qb.DocType(doctype)
 	query = (
 		frappe.qb.from_(gl_entry)
 		.select(
 			gl_entry.account,
-			gl_entry.debit if not group_by_account else Sum(gl_entry.debit).as_("debit"),
-			gl_entry.credit if not group_by_account else Sum(gl_entry.credit).as_("credit"),
+			gl_entry.debit if not sum_amounts else Sum(gl_entry.debit).as_("debit"),
+			gl_entry.credit if not sum_amounts else Sum(gl_entry.credit).as_("credit"),
 			gl_entry.debit_in_account_currency
-			if not group_by_account
+			if not sum_amounts
 			else Sum(gl_entry.debit_in_account_currency).as_("debit_in_account_currency"),
 			gl_entry.credit_in_account_currency
-			if not group_by_account
+			if not sum_amounts
 			else Sum(gl_entry.credit_in_account_currency).as_("credit_in_account_currency"),
 			gl_entry.account_currency,
 		)
@@ -529,7 +536,8 @@ def get_accounting_entries(
 	)
 
 	if doctype == "GL Entry":
-		query = query.select(gl_entry.posting_date, gl_entry.is_opening, gl_entry.fiscal_year)
+		posting_date = gl_entry.posting_date if not group_by_period else Max(gl_entry.posting_date)
+		query = query.select(posting_date.as_("posting_date"), gl_entry.is_opening, gl_entry.fiscal_year)
 		query = query.where(gl_entry.is_cancelled == 0)
 		query = query.where(gl_entry.posting_date <= to_date)
 
@@ -555,10 +563,30 @@ def get_accounting_entries(
 
 	if group_by_account:
 		query += " GROUP BY `account`"
+	elif group_by_period:
+		period_bucket = get_period_bucket(period_list)
+		query += f" GROUP BY `account`, `account_currency`, `fiscal_year`, `is_opening`, {period_bucket}"
 
 	return frappe.db.sql(query, params, as_dict=True)
 
 
+def get_period_bucket(period_list):
+	"""Returns an SQL expression numbering the ranges of posting dates between the start and end dates
+	of the periods and the start date of the first fiscal year, which `calculate_values` compares the
+	posting dates with."""
+	dates = {getdate(period_list[0].year_start_date)}
+	for period in period_list:
+		dates.add(getdate(period.from_date))
+		dates.add(getdate(add_days(period.to_date, 1)))
+
+	conditions = " ".join(
+		f"WHEN `tabGL Entry`.`posting_date` < {frappe.db.escape(cstr(date))} THEN {i}"
+		for i, date in enumerate(sorted(dates))
+	)
+
+	return f"CASE {conditions} ELSE {len(dates)} END"
+
+
 def get_account_filter_query(root_lft, root_rgt, root_type, gl_entry):
 	acc = frappe.qb.DocType("Account")
 	exists_query = (
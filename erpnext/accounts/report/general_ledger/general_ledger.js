@@ -223,6 +223,32 @@ frappe.query_reports["General Ledger"] = {
 			fieldtype: "Check",
 		},
 	],
+
+	onload: function (report) {
+		report.page.add_menu_item(__("Export in Background"), function () {
+			frappe.prompt(
+				{
+					fieldname: "file_format",
+					label: __("File Format"),
+					fieldtype: "Select",
+					options: ["CSV", "Excel"],
+					default: "CSV",
+					reqd: 1,
+				},
+				(values) => {
+					frappe.call({
+						method: "erpnext.accounts.report.general_ledger.general_ledger.export_general_ledger",
+						args: {
+							filters: report.get_values(),
+							file_format: values.file_format,
+						},
+					});
+				},
+				__("Export in Background"),
+				__("Export")
+			);
+		});
+	},
 };
 
 erpnext.utils.add_dimensions("General Ledger", 15);
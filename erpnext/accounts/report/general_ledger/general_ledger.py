@@ -3,14 +3,20 @@
 
 
 import copy
+import csv
 from collections import OrderedDict
 
 import frappe
+import openpyxl
 from frappe import _, _dict
+from frappe.desk.doctype.notification_log.notification_log import make_notification_logs
 from frappe.query_builder import Criterion
-from frappe.utils import cstr, getdate
+from frappe.utils import cint, cstr, getdate
 
 from erpnext import get_company_currency, get_default_company
+from erpnext.accounts.doctype.account_closing_balance.account_closing_balance import (
+	get_last_period_closing_voucher,
+)
 from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
 	get_accounting_dimensions,
 	get_dimension_with_children,
@@ -19,11 +25,23 @@ from erpnext.accounts.report.financial_statements import get_cost_centers_with_c
 from erpnext.accounts.report.utils import convert_to_presentation_currency, get_currency
 from erpnext.accounts.utils import get_account_currency
 
+GL_ENTRY_PAGE_LENGTH = 10000
+
 
 def execute(filters=None):
 	if not filters:
 		return [], []
 
+	filters, account_details = prepare_filters(filters)
+
+	columns = get_columns(filters)
+
+	res = get_result(filters, account_details)
+
+	return columns, res
+
+
+def prepare_filters(filters):
 	account_details = {}
 
 	if filters and filters.get("print_in_account_currency") and not filters.get("account"):
@@ -41,11 +59,7 @@ def execute(filters=None):
 
 	filters = set_account_currency(filters)
 
-	columns = get_columns(filters)
-
-	res = get_result(filters, account_details)
-
-	return columns, res
+	return filters, account_details
 
 
 def validate_filters(filters, account_details):
@@ -151,17 +165,354 @@ def get_result(filters, account_details):
 	return result
 
 
-def get_gl_entries(filters, accounting_dimensions):
+@frappe.whitelist()
+def export_general_ledger(filters, file_format="CSV"):
+	"""Exports the General Ledger to a file in the background, the user is notified once it is ready."""
+	if not frappe.get_doc("Report", "General Ledger").is_permitted():
+		frappe.throw(
+			_("You don't have access to Report: {0}").format(_("General Ledger")), frappe.PermissionError
+		)
+
+	if file_format not in ("CSV", "Excel"):
+		frappe.throw(_("File Format must be CSV or Excel"))
+
+	frappe.enqueue(
+		make_general_ledger_export,
+		queue="long",
+		timeout=4 * 60 * 60,
+		filters=frappe.parse_json(filters),
+		file_format=file_format,
+		user=frappe.session.user,
+	)
+
+	frappe.msgprint(
+		_("The General Ledger is being exported in the background. You will be notified once it is ready."),
+		alert=True,
+	)
+
+
+def make_general_ledger_export(filters, file_format, user):
+	"""Writes the rows of the report to a private file as they are computed, see `iter_result`."""
+	filters = prepare_filters(frappe._dict(filters))[0]
+	columns = [column for column in get_columns(filters) if not column.get("hidden")]
+
+	file_name = "general_ledger_{}.{}".format(
+		frappe.generate_hash(length=10), "csv" if file_format == "CSV" else "xlsx"
+	)
+	file_path = frappe.get_site_path("private", "files", file_name)
+
+	rows = ([row.get(column["fieldname"]) for column in columns] for row in iter_result(filters))
+	header = [column["label"] for column in columns]
+
+	if file_format == "CSV":
+		with open(file_path, "w", newline="") as file:
+			writer = csv.writer(file)
+			writer.writerow(header)
+			writer.writerows(rows)
+	else:
+		# rows of a write-only workbook are not kept in memory
+		workbook = openpyxl.Workbook(write_only=True)
+		sheet = workbook.create_sheet(_("General Ledger"))
+		sheet.append(header)
+		for row in rows:
+			sheet.append(row)
+
+		workbook.save(file_path)
+
+	file_doc = frappe.get_doc(
+		{
+			"doctype": "File",
+			"file_name": file_name,
+			"file_url": f"/private/files/{file_name}",
+			"is_private": 1,
+		}
+	).insert(ignore_permissions=True)
+
+	make_notification_logs(
+		{
+			"subject": _("General Ledger export {0} is ready").format(file_name),
+			"type": "Alert",
+			"document_type": "File",
+			"document_name": file_doc.name,
+		},
+		[user],
+	)
+
+
+def iter_result(filters):
+	"""Yields the rows of `get_result` one by one, without loading all the GL Entries.
+
+	The GL Entries are read page by page in the order of `get_keyset_fields`, in which the entries of
+	each group are next to each other, so that the balances and the totals of each group are computed
+	in one pass. The opening of each group is summed up in the query beforehand. The groups are in the
+	order of the keyset fields, which may differ from the order of `get_result` within a day."""
+	yield from iter_result_as_list(iter_data_with_opening_closing(filters), filters)
+
+
+def iter_data_with_opening_closing(filters):
+	accounting_dimensions = []
+	if filters.get("include_dimensions"):
+		accounting_dimensions = get_accounting_dimensions()
+
+	group_by = group_by_field(filters.get("categorize_by"))
+	group_by_voucher_consolidated = filters.get("categorize_by") == "Categorize by Voucher (Consolidated)"
+	show_group_opening_closing = (not filters.get("categorize_by") and not filters.get("voucher_no")) or (
+		filters.get("categorize_by") and filters.get("categorize_by") != "Categorize by Voucher"
+	)
+	show_group_total = filters.get("categorize_by") or not filters.voucher_no
+
+	account_type_map = None
+	if filters.get("show_net_values_in_party_account"):
+		account_type_map = get_account_type_map(filters.get("company"))
+
 	currency_map = get_currency(filters)
-	select_fields = """, debit, credit, debit_in_account_currency,
-		credit_in_account_currency """
+	set_company_finance_book(filters)
+	conditions = get_conditions(filters)
+	account_currencies = frappe.db.sql_list(
+		f"select distinct account_currency from `tabGL Entry` where company=%(company)s {conditions}",
+		filters,
+	)
 
-	if filters.get("show_remarks"):
-		if remarks_length := frappe.db.get_single_value("Accounts Settings", "general_ledger_remarks_length"):
-			select_fields += f",substr(remarks, 1, {remarks_length}) as 'remarks'"
-		else:
-			select_fields += """,remarks"""
+	opening_entries = []
+	if includes_opening_balance(filters):
+		opening_entries = get_opening_entries(filters, conditions)
+		conditions += " and posting_date >= %(from_date)s"
+
+	opening_entries += get_entries_added_to_opening(filters, conditions)
+	if not includes_opening_balance(filters):
+		conditions += " and posting_date >= %(from_date)s"
+
+	if not filters.get("show_opening_entries"):
+		conditions += " and coalesce(is_opening, 'No') != 'Yes'"
+
+	totals = get_totals_dict()
+	group_totals = {}
+
+	for gle in convert_gl_entries(opening_entries, filters, currency_map, account_currencies):
+		if not group_by_voucher_consolidated:
+			group_value = gle.get(group_by)
+			group_totals.setdefault(group_value, copy.deepcopy(get_totals_dict()))
+			update_value_in_dict(group_totals[group_value], "opening", gle, filters, account_type_map)
+			update_value_in_dict(group_totals[group_value], "closing", gle, filters, account_type_map)
+
+		update_value_in_dict(totals, "opening", gle, filters, account_type_map)
+		update_value_in_dict(totals, "closing", gle, filters, account_type_map)
+
+	# Opening for filtered account
+	yield totals.opening
+
+	keyset_fields = get_keyset_fields(filters)
+	consolidation_key_fields = get_consolidation_key_fields(filters, accounting_dimensions)
+	immutable_ledger = frappe.db.get_single_value("Accounts Settings", "enable_immutable_ledger")
+	inv_details = get_supplier_invoice_details()
+
+	group_value, group = None, None
+	consolidated_gle, consolidation_run = OrderedDict(), None
 
+	for gl_entries in get_gl_entries_in_pages(
+		filters, get_gl_entry_fields(filters, accounting_dimensions), conditions, keyset_fields
+	):
+		for gle in convert_gl_entries(gl_entries, filters, currency_map, account_currencies):
+			gle["bill_no"] = inv_details.get(gle.get("against_voucher"), "")
+
+			if group_by_voucher_consolidated:
+				# entries with the same key are posted on the same date to the same account
+				run = (gle.posting_date, gle.account)
+				if run != consolidation_run:
+					yield from flush_consolidated_gle(consolidated_gle, totals, filters, account_type_map)
+					consolidation_run = run
+
+				keylist = [gle.get(fieldname) for fieldname in consolidation_key_fields]
+				if immutable_ledger:
+					keylist.insert(6, gle.get("creation"))
+
+				key = tuple(keylist)
+				if key not in consolidated_gle:
+					consolidated_gle.setdefault(key, gle)
+				else:
+					update_value_in_dict(consolidated_gle, key, gle, filters, account_type_map)
+
+				continue
+
+			if group is None or gle.get(group_by) != group_value:
+				if group is not None:
+					yield from get_group_totals(group, show_group_opening_closing, show_group_total)
+
+				group_value = gle.get(group_by)
+				group = group_totals.pop(group_value, None) or copy.deepcopy(get_totals_dict())
+
+				# opening
+				yield {"debit_in_transaction_currency": None, "credit_in_transaction_currency": None}
+				if show_group_opening_closing:
+					yield group.opening
+
+			update_value_in_dict(group, "total", gle, filters, account_type_map)
+			update_value_in_dict(group, "closing", gle, filters, account_type_map)
+			update_value_in_dict(totals, "total", gle, filters, account_type_map)
+			update_value_in_dict(totals, "closing", gle, filters, account_type_map)
+
+			yield gle
+
+	if group_by_voucher_consolidated:
+		yield from flush_consolidated_gle(consolidated_gle, totals, filters, account_type_map)
+	else:
+		if group is not None:
+			yield from get_group_totals(group, show_group_opening_closing, show_group_total)
+
+		yield {"debit_in_transaction_currency": None, "credit_in_transaction_currency": None}
+
+	# totals
+	yield totals.total
+
+	# closing
+	yield totals.closing
+
+
+def get_group_totals(group, show_group_opening_closing, show_group_total):
+	if show_group_total:
+		yield group.total
+
+	if show_group_opening_closing:
+		yield group.closing
+
+
+def flush_consolidated_gle(consolidated_gle, totals, filters, account_type_map):
+	for value in consolidated_gle.values():
+		update_value_in_dict(totals, "total", value, filters, account_type_map)
+		update_value_in_dict(totals, "closing", value, filters, account_type_map)
+		yield value
+
+	consolidated_gle.clear()
+
+
+def get_consolidation_key_fields(filters, accounting_dimensions):
+	fields = ["posting_date", "voucher_type", "voucher_no", "account", "party_type", "party"]
+	if filters.get("include_dimensions"):
+		fields += [*accounting_dimensions, "cost_center", "project"]
+
+	return fields
+
+
+def convert_gl_entries(gl_entries, filters, currency_map, account_currencies):
+	"""Sets the party names and converts the GL Entries to the presentation currency, like
+	`get_gl_entries` does for all the entries at once."""
+	party_name_map = get_party_name_map()
+
+	for gl_entry in gl_entries:
+		if gl_entry.party_type and gl_entry.party:
+			gl_entry.party_name = party_name_map.get(gl_entry.party_type, {}).get(gl_entry.party)
+
+	if filters.get("presentation_currency"):
+		return convert_to_presentation_currency(
+			gl_entries, currency_map, filters, account_currencies=account_currencies
+		)
+
+	return gl_entries
+
+
+def get_opening_condition(filters):
+	"""Condition for the entries which are added to the opening, like in `get_accountwise_gle`."""
+	if filters.get("show_opening_entries"):
+		return "(posting_date < %(from_date)s)"
+
+	return "(posting_date < %(from_date)s or is_opening = 'Yes')"
+
+
+def get_entries_added_to_opening(filters, conditions):
+	"""Returns the entries matching `conditions` which are added to the opening instead of being shown,
+	summed up by group and account."""
+	group_by = group_by_field(filters.get("categorize_by"))
+	group_by_fields = ["account", "account_currency"]
+	if group_by == "party":
+		group_by_fields = ["party_type", "party", *group_by_fields]
+	elif group_by != "account":
+		group_by_fields = [group_by, *group_by_fields]
+
+	fields = ", ".join(group_by_fields)
+	return frappe.db.sql(
+		f"""
+		select
+			{fields}, min(posting_date) as posting_date, 'Yes' as is_opening,
+			sum(debit) as debit, sum(credit) as credit,
+			sum(debit_in_account_currency) as debit_in_account_currency,
+			sum(credit_in_account_currency) as credit_in_account_currency
+		from `tabGL Entry`
+		where company=%(company)s {conditions} and {get_opening_condition(filters)}
+		group by {fields}
+	""",
+		filters,
+		as_dict=1,
+	)
+
+
+def get_keyset_fields(filters):
+	"""Fields by which the GL Entries are ordered and paginated when streamed, the entries of each group
+	of the report are next to each other in this order."""
+	categorize_by = filters.get("categorize_by")
+	if categorize_by == "Categorize by Account":
+		return ["account", "posting_date", "creation", "name"]
+	elif categorize_by == "Categorize by Party":
+		return ["party", "posting_date", "creation", "name"]
+	elif categorize_by == "Categorize by Voucher (Consolidated)":
+		return ["posting_date", "account", "creation", "name"]
+
+	return ["posting_date", "voucher_type", "voucher_no", "creation", "name"]
+
+
+def get_keyset_column(fieldname):
+	"""The entries without a party are ordered and compared as an empty party, as null is neither equal
+	to nor greater than the last party."""
+	return f"ifnull({fieldname}, '')" if fieldname == "party" else fieldname
+
+
+def get_keyset_condition(keyset_fields):
+	"""Condition for the entries after the `last_` values of `keyset_fields`, in their order."""
+	condition = f"{get_keyset_column(keyset_fields[-1])} > %(last_{keyset_fields[-1]})s"
+	for fieldname in reversed(keyset_fields[:-1]):
+		column = get_keyset_column(fieldname)
+		condition = f"{column} > %(last_{fieldname})s or ({column} = %(last_{fieldname})s and ({condition}))"
+
+	return f"and ({condition})"
+
+
+def get_gl_entries_in_pages(filters, fields, conditions, keyset_fields, page_length=None):
+	"""Yields the GL Entries page by page. Each page is read after the last entry of the previous page
+	in the order of `keyset_fields`, instead of by an offset, so that reading a page does not get slower
+	the further it is."""
+	page_length = page_length or GL_ENTRY_PAGE_LENGTH
+	values = dict(filters)
+	keyset_condition = ""
+	order_by = ", ".join(get_keyset_column(fieldname) for fieldname in keyset_fields)
+
+	while True:
+		gl_entries = frappe.db.sql(
+			f"""
+			select {fields}
+			from `tabGL Entry`
+			where company=%(company)s {conditions} {keyset_condition}
+			order by {order_by}
+			limit {cint(page_length)}
+		""",
+			values,
+			as_dict=1,
+		)
+
+		if gl_entries:
+			yield gl_entries
+
+		if len(gl_entries) < page_length:
+			return
+
+		last_entry = gl_entries[-1]
+		for fieldname in keyset_fields:
+			value = last_entry[fieldname if fieldname != "name" else "gl_entry"]
+			values[f"last_{fieldname}"] = cstr(value) if fieldname == "party" else value
+
+		keyset_condition = get_keyset_condition(keyset_fields)
+
+
+def get_gl_entries(filters, accounting_dimensions):
+	currency_map = get_currency(filters)
 	order_by_statement = "order by posting_date, account, creation"
 
 	if filters.get("include_dimensions"):
@@ -172,37 +523,31 @@ def get_gl_entries(filters, accounting_dimensions):
 	if filters.get("categorize_by") == "Categorize by Account":
 		order_by_statement = "order by account, posting_date, creation"
 
-	if filters.get("include_default_book_entries"):
-		filters["company_fb"] = frappe.get_cached_value(
-			"Company", filters.get("company"), "default_finance_book"
-		)
-
-	dimension_fields = ""
-	if accounting_dimensions:
-		dimension_fields = ", ".join(accounting_dimensions) + ","
+	set_company_finance_book(filters)
+	conditions = get_conditions(filters)
 
-	transaction_currency_fields = ""
-	if filters.get("add_values_in_transaction_currency"):
-		transaction_currency_fields = (
-			"debit_in_transaction_currency, credit_in_transaction_currency, transaction_currency,"
-		)
+	opening_entries = []
+	if includes_opening_balance(filters):
+		# entries before the from date are only needed for the opening, which is summed up in the query
+		opening_entries = get_opening_entries(filters, conditions)
+		conditions += " and posting_date >= %(from_date)s"
 
 	gl_entries = frappe.db.sql(
 		f"""
-		select
-			name as gl_entry, posting_date, account, party_type, party,
-			voucher_type, voucher_subtype, voucher_no, {dimension_fields}
-			cost_center, project, {transaction_currency_fields}
-			against_voucher_type, against_voucher, account_currency,
-			against, is_opening, creation {select_fields}
+		select {get_gl_entry_fields(filters, accounting_dimensions)}
 		from `tabGL Entry`
-		where company=%(company)s {get_conditions(filters)}
+		where company=%(company)s {conditions}
 		{order_by_statement}
 	""",
 		filters,
 		as_dict=1,
 	)
 
+	if filters.get("categorize_by") == "Categorize by Account":
+		gl_entries = sorted(opening_entries + gl_entries, key=lambda d: d.account)
+	else:
+		gl_entries = opening_entries + gl_entries
+
 	party_name_map = get_party_name_map()
 
 	for gl_entry in gl_entries:
@@ -215,6 +560,41 @@ def get_gl_entries(filters, accounting_dimensions):
 		return gl_entries
 
 
+def set_company_finance_book(filters):
+	if filters.get("include_default_book_entries"):
+		filters["company_fb"] = frappe.get_cached_value(
+			"Company", filters.get("company"), "default_finance_book"
+		)
+
+
+def get_gl_entry_fields(filters, accounting_dimensions):
+	select_fields = """, debit, credit, debit_in_account_currency,
+		credit_in_account_currency """
+
+	if filters.get("show_remarks"):
+		if remarks_length := frappe.db.get_single_value("Accounts Settings", "general_ledger_remarks_length"):
+			select_fields += f",substr(remarks, 1, {remarks_length}) as 'remarks'"
+		else:
+			select_fields += """,remarks"""
+
+	dimension_fields = ""
+	if accounting_dimensions:
+		dimension_fields = ", ".join(accounting_dimensions) + ","
+
+	transaction_currency_fields = ""
+	if filters.get("add_values_in_transaction_currency"):
+		transaction_currency_fields = (
+			"debit_in_transaction_currency, credit_in_transaction_currency, transaction_currency,"
+		)
+
+	return f"""
+			name as gl_entry, posting_date, account, party_type, party,
+			voucher_type, voucher_subtype, voucher_no, {dimension_fields}
+			cost_center, project, {transaction_currency_fields}
+			against_voucher_type, against_voucher, account_currency,
+			against, is_opening, creation {select_fields}"""
+
+
 def get_conditions(filters):
 	conditions = []
 
@@ -279,11 +659,7 @@ def get_conditions(filters):
 	if filters.get("party"):
 		conditions.append("party in %(party)s")
 
-	if not (
-		filters.get("account")
-		or filters.get("party")
-		or filters.get("categorize_by") in ["Categorize by Account", "Categorize by Party"]
-	):
+	if not includes_opening_balance(filters):
 		if not ignore_is_opening:
 			conditions.append("(posting_date >=%(from_date)s or is_opening = 'Yes')")
 		else:
@@ -297,23 +673,7 @@ def get_conditions(filters):
 	if filters.get("project"):
 		conditions.append("project in %(project)s")
 
-	if filters.get("include_default_book_entries"):
-		if filters.get("finance_book"):
-			if filters.get("company_fb") and cstr(filters.get("finance_book")) != cstr(
-				filters.get("company_fb")
-			):
-				frappe.throw(
-					_("To use a different finance book, please uncheck 'Include Default FB Entries'")
-				)
-			else:
-				conditions.append("(finance_book in (%(finance_book)s, '') OR finance_book IS NULL)")
-		else:
-			conditions.append("(finance_book in (%(company_fb)s, '') OR finance_book IS NULL)")
-	else:
-		if filters.get("finance_book"):
-			conditions.append("(finance_book in (%(finance_book)s, '') OR finance_book IS NULL)")
-		else:
-			conditions.append("(finance_book in ('') OR finance_book IS NULL)")
+	conditions.append(get_finance_book_condition(filters))
 
 	if not filters.get("show_cancelled_entries"):
 		conditions.append("is_cancelled = 0")
@@ -343,6 +703,135 @@ def get_conditions(filters):
 	return "and {}".format(" and ".join(conditions)) if conditions else ""
 
 
+def includes_opening_balance(filters):
+	"""Returns True if the opening is shown for the filters, for which the entries before the from
+	date are fetched as well."""
+	return bool(
+		filters.get("account")
+		or filters.get("party")
+		or filters.get("categorize_by") in ["Categorize by Account", "Categorize by Party"]
+	)
+
+
+def get_finance_book_condition(filters):
+	if filters.get("include_default_book_entries"):
+		if filters.get("finance_book"):
+			if filters.get("company_fb") and cstr(filters.get("finance_book")) != cstr(
+				filters.get("company_fb")
+			):
+				frappe.throw(
+					_("To use a different finance book, please uncheck 'Include Default FB Entries'")
+				)
+
+			return "(finance_book in (%(finance_book)s, '') OR finance_book IS NULL)"
+
+		return "(finance_book in (%(company_fb)s, '') OR finance_book IS NULL)"
+
+	if filters.get("finance_book"):
+		return "(finance_book in (%(finance_book)s, '') OR finance_book IS NULL)"
+
+	return "(finance_book in ('') OR finance_book IS NULL)"
+
+
+def get_opening_entries(filters, conditions):
+	"""Returns the opening of each account (and party, if categorized by party) summed up from the
+	entries before the from date.
+
+	The Account Closing Balances of the last Period Closing Voucher before the from date are used if
+	they have all the fields of the filters, only the entries after it are summed up then."""
+	group_by_fields = ["account", "account_currency"]
+	if group_by_field(filters.get("categorize_by")) == "party":
+		group_by_fields = ["party_type", "party", *group_by_fields]
+
+	opening_entries = []
+	values = dict(filters)
+	start_date_condition = ""
+
+	if period_closing_voucher := get_period_closing_voucher_for_opening(filters):
+		opening_entries = get_closing_balances(filters, period_closing_voucher.name)
+		values["period_end_date"] = period_closing_voucher.period_end_date
+		start_date_condition = "and posting_date > %(period_end_date)s"
+
+	fields = ", ".join(group_by_fields)
+	opening_entries += frappe.db.sql(
+		f"""
+		select
+			{fields}, min(posting_date) as posting_date, 'No' as is_opening,
+			sum(debit) as debit, sum(credit) as credit,
+			sum(debit_in_account_currency) as debit_in_account_currency,
+			sum(credit_in_account_currency) as credit_in_account_currency
+		from `tabGL Entry`
+		where company=%(company)s {conditions}
+			and posting_date < %(from_date)s {start_date_condition}
+		group by {fields}
+		order by min(posting_date), account
+	""",
+		values,
+		as_dict=1,
+	)
+
+	return opening_entries
+
+
+def get_period_closing_voucher_for_opening(filters):
+	"""Returns the last Period Closing Voucher before the from date, if its Account Closing Balances
+	can be filtered like the GL Entries."""
+	from frappe.desk.reportview import build_match_conditions
+
+	if group_by_field(filters.get("categorize_by")) == "party":
+		return None
+
+	for fieldname in (
+		"party_type",
+		"party",
+		"voucher_no",
+		"against_voucher_no",
+		"voucher_no_not_in",
+		"show_cancelled_entries",
+	):
+		if filters.get(fieldname):
+			return None
+
+	if build_match_conditions("GL Entry"):
+		return None
+
+	return get_last_period_closing_voucher(filters.company, filters.from_date)
+
+
+def get_closing_balances(filters, period_closing_voucher):
+	"""Account Closing Balances of the Period Closing Voucher, summed up by account."""
+	conditions = ["period_closing_voucher = %(period_closing_voucher)s", get_finance_book_condition(filters)]
+
+	for fieldname in ("account", "cost_center", "project"):
+		if filters.get(fieldname):
+			conditions.append(f"{fieldname} in %({fieldname})s")
+
+	# dimension filters are already extended with their children in `get_conditions`
+	for dimension in get_accounting_dimensions(as_list=False):
+		if (
+			not dimension.disabled
+			and dimension.document_type != "Finance Book"
+			and filters.get(dimension.fieldname)
+		):
+			conditions.append(f"{dimension.fieldname} in %({dimension.fieldname})s")
+
+	return frappe.db.sql(
+		"""
+		select
+			account, account_currency, closing_date as posting_date, 'No' as is_opening,
+			sum(debit) as debit, sum(credit) as credit,
+			sum(debit_in_account_currency) as debit_in_account_currency,
+			sum(credit_in_account_currency) as credit_in_account_currency
+		from `tabAccount Closing Balance`
+		where company=%(company)s and {}
+		group by account, account_currency, closing_date
+		order by account
+	""".format(" and ".join(conditions)),
+		{**filters, "period_closing_voucher": period_closing_voucher},
+		as_dict=1,
+	)
+
+
 def get_party_name_map():
 	party_map = {}
 
@@ -477,46 +966,12 @@ def get_accountwise_gle(filters, accounting_dimensions, gl_entries, gle_map, tot
 	group_by = group_by_field(filters.get("categorize_by"))
 	group_by_voucher_consolidated = filters.get("categorize_by") == "Categorize by Voucher (Consolidated)"
 
+	account_type_map = None
 	if filters.get("show_net_values_in_party_account"):
 		account_type_map = get_account_type_map(filters.get("company"))
 
 	immutable_ledger = frappe.db.get_single_value("Accounts Settings", "enable_immutable_ledger")
 
-	def update_value_in_dict(data, key, gle):
-		data[key].debit += gle.debit
-		data[key].credit += gle.credit
-
-		data[key].debit_in_account_currency += gle.debit_in_account_currency
-		data[key].credit_in_account_currency += gle.credit_in_account_currency
-
-		if filters.get("add_values_in_transaction_currency") and key not in ["opening", "closing", "total"]:
-			data[key].debit_in_transaction_currency += gle.debit_in_transaction_currency
-			data[key].credit_in_transaction_currency += gle.credit_in_transaction_currency
-
-		if filters.get("show_net_values_in_party_account") and account_type_map.get(data[key].account) in (
-			"Receivable",
-			"Payable",
-		):
-			net_value = data[key].debit - data[key].credit
-			net_value_in_account_currency = (
-				data[key].debit_in_account_currency - data[key].credit_in_account_currency
-			)
-
-			if net_value < 0:
-				dr_or_cr = "credit"
-				rev_dr_or_cr = "debit"
-			else:
-				dr_or_cr = "debit"
-				rev_dr_or_cr = "credit"
-
-			data[key][dr_or_cr] = abs(net_value)
-			data[key][dr_or_cr + "_in_account_currency"] = abs(net_value_in_account_currency)
-			data[key][rev_dr_or_cr] = 0
-			data[key][rev_dr_or_cr + "_in_account_currency"] = 0
-
-		if data[key].against_voucher and gle.against_voucher:
-			data[key].against_voucher += ", " + gle.against_voucher
-
 	from_date, to_date = getdate(filters.from_date), getdate(filters.to_date)
 	show_opening_entries = filters.get("show_opening_entries")
 
@@ -526,18 +981,24 @@ def get_accountwise_gle(filters, accounting_dimensions, gl_entries, gle_map, tot
 
 		if gle.posting_date < from_date or (cstr(gle.is_opening) == "Yes" and not show_opening_entries):
 			if not group_by_voucher_consolidated:
-				update_value_in_dict(gle_map[group_by_value].totals, "opening", gle)
-				update_value_in_dict(gle_map[group_by_value].totals, "closing", gle)
+				update_value_in_dict(
+					gle_map[group_by_value].totals, "opening", gle, filters, account_type_map
+				)
+				update_value_in_dict(
+					gle_map[group_by_value].totals, "closing", gle, filters, account_type_map
+				)
 
-			update_value_in_dict(totals, "opening", gle)
-			update_value_in_dict(totals, "closing", gle)
+			update_value_in_dict(totals, "opening", gle, filters, account_type_map)
+			update_value_in_dict(totals, "closing", gle, filters, account_type_map)
 
 		elif gle.posting_date <= to_date or (cstr(gle.is_opening) == "Yes" and show_opening_entries):
 			if not group_by_voucher_consolidated:
-				update_value_in_dict(gle_map[group_by_value].totals, "total", gle)
-				update_value_in_dict(gle_map[group_by_value].totals, "closing", gle)
-				update_value_in_dict(totals, "total", gle)
-				update_value_in_dict(totals, "closing", gle)
+				update_value_in_dict(gle_map[group_by_value].totals, "total", gle, filters, account_type_map)
+				update_value_in_dict(
+					gle_map[group_by_value].totals, "closing", gle, filters, account_type_map
+				)
+				update_value_in_dict(totals, "total", gle, filters, account_type_map)
+				update_value_in_dict(totals, "closing", gle, filters, account_type_map)
 
 				gle_map[group_by_value].entries.append(gle)
 
@@ -564,16 +1025,52 @@ def get_accountwise_gle(filters, accounting_dimensions, gl_entries, gle_map, tot
 				if key not in consolidated_gle:
 					consolidated_gle.setdefault(key, gle)
 				else:
-					update_value_in_dict(consolidated_gle, key, gle)
+					update_value_in_dict(consolidated_gle, key, gle, filters, account_type_map)
 
 	for value in consolidated_gle.values():
-		update_value_in_dict(totals, "total", value)
-		update_value_in_dict(totals, "closing", value)
+		update_value_in_dict(totals, "total", value, filters, account_type_map)
+		update_value_in_dict(totals, "closing", value, filters, account_type_map)
 		entries.append(value)
 
 	return totals, entries
 
 
+def update_value_in_dict(data, key, gle, filters, account_type_map=None):
+	data[key].debit += gle.debit
+	data[key].credit += gle.credit
+
+	data[key].debit_in_account_currency += gle.debit_in_account_currency
+	data[key].credit_in_account_currency += gle.credit_in_account_currency
+
+	if filters.get("add_values_in_transaction_currency") and key not in ["opening", "closing", "total"]:
+		data[key].debit_in_transaction_currency += gle.debit_in_transaction_currency
+		data[key].credit_in_transaction_currency += gle.credit_in_transaction_currency
+
+	if filters.get("show_net_values_in_party_account") and account_type_map.get(data[key].account) in (
+		"Receivable",
+		"Payable",
+	):
+		net_value = data[key].debit - data[key].credit
+		net_value_in_account_currency = (
+			data[key].debit_in_account_currency - data[key].credit_in_account_currency
+		)
+
+		if net_value < 0:
+			dr_or_cr = "credit"
+			rev_dr_or_cr = "debit"
+		else:
+			dr_or_cr = "debit"
+			rev_dr_or_cr = "credit"
+
+		data[key][dr_or_cr] = abs(net_value)
+		data[key][dr_or_cr + "_in_account_currency"] = abs(net_value_in_account_currency)
+		data[key][rev_dr_or_cr] = 0
+		data[key][rev_dr_or_cr + "_in_account_currency"] = 0
+
+	if data[key].against_voucher and gle.against_voucher:
+		data[key].against_voucher += ", " + gle.against_voucher
+
+
 def get_account_type_map(company):
 	account_type_map = frappe._dict(
 		frappe.get_all("Account", fields=["name", "account_type"], filters={"company": company}, as_list=1)
@@ -583,6 +1080,10 @@ def get_account_type_map(company):
 
 
 def get_result_as_list(data, filters):
+	return list(iter_result_as_list(data, filters))
+
+
+def iter_result_as_list(data, filters):
 	balance = 0
 
 	for d in data:
@@ -597,7 +1098,7 @@ def get_result_as_list(data, filters):
 
 		d["presentation_currency"] = filters.presentation_currency
 
-	return data
+		yield d
 
 
 def get_supplier_invoice_details():
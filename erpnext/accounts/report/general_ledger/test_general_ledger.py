@@ -1,13 +1,15 @@
 # Copyright (c) 2022, Frappe Technologies Pvt. Ltd. and Contributors
 # MIT License. See license.txt
 
+from unittest.mock import patch
+
 import frappe
 from frappe import qb
 from frappe.tests.utils import FrappeTestCase, change_settings
-from frappe.utils import flt, today
+from frappe.utils import add_days, flt, today
 
 from erpnext.accounts.doctype.sales_invoice.test_sales_invoice import create_sales_invoice
-from erpnext.accounts.report.general_ledger.general_ledger import execute
+from erpnext.accounts.report.general_ledger.general_ledger import execute, iter_result, prepare_filters
 from erpnext.controllers.sales_and_purchase_return import make_return_doc
 
 
@@ -332,3 +334,57 @@ class TestGeneralLedger(FrappeTestCase):
 		)
 		actual = set([x.voucher_no for x in data if x.voucher_no])
 		self.assertEqual(expected, actual)
+
+	def test_streamed_result(self):
+		create_sales_invoice(posting_date=add_days(today(), -10), rate=300)
+		si = create_sales_invoice(rate=100)
+		create_sales_invoice(rate=200)
+
+		for categorize_by in ("Categorize by Voucher (Consolidated)", "Categorize by Voucher", ""):
+			filters = {
+				"company": si.company,
+				"from_date": add_days(today(), -1),
+				"to_date": today(),
+				"account": [si.debit_to],
+				"categorize_by": categorize_by,
+			}
+
+			data = execute(frappe._dict(filters))[1]
+			with patch("erpnext.accounts.report.general_ledger.general_ledger.GL_ENTRY_PAGE_LENGTH", 1):
+				streamed_data = list(iter_result(prepare_filters(frappe._dict(filters))[0]))
+
+			with self.subTest(categorize_by=categorize_by):
+				self.assertEqual(
+					[(d.get("voucher_no"), d.get("debit"), d.get("credit"), d.get("balance")) for d in data],
+					[
+						(d.get("voucher_no"), d.get("debit"), d.get("credit"), d.get("balance"))
+						for d in streamed_data
+					],
+				)
+				self.assertEqual(streamed_data[0]["balance"], 300)
+
+	def test_streamed_result_by_party(self):
+		# entries of the income account have no party, they are paged along with the entries of the customer
+		create_sales_invoice(rate=100)
+		create_sales_invoice(rate=200)
+
+		filters = {
+			"company": self.company,
+			"from_date": today(),
+			"to_date": today(),
+			"categorize_by": "Categorize by Party",
+		}
+
+		def get_entries(rows):
+			return sorted(
+				(d.get("voucher_no"), d.get("account"), d.get("debit"), d.get("credit"))
+				for d in rows
+				if d.get("voucher_no")
+			)
+
+		data = execute(frappe._dict(filters))[1]
+		with patch("erpnext.accounts.report.general_ledger.general_ledger.GL_ENTRY_PAGE_LENGTH", 1):
+			streamed_data = list(iter_result(prepare_filters(frappe._dict(filters))[0]))
+
+		self.assertEqual(len(get_entries(streamed_data)), 4)
+		self.assertEqual(get_entries(streamed_data), get_entries(data))
@@ -7,7 +7,7 @@ from frappe.tests.utils import FrappeTestCase
 from frappe.utils import add_days, getdate, today
 
 from erpnext.accounts.doctype.sales_invoice.test_sales_invoice import create_sales_invoice
-from erpnext.accounts.report.financial_statements import get_period_list
+from erpnext.accounts.report.financial_statements import get_period_list, set_gl_entries_by_account
 from erpnext.accounts.report.profit_and_loss_statement.profit_and_loss_statement import execute
 from erpnext.accounts.test.accounts_mixin import AccountsTestMixin
 
@@ -170,3 +170,39 @@ class TestProfitAndLossStatement(AccountsTestMixin, FrappeTestCase):
 		for key in expected.keys():
 			with self.subTest(key=key):
 				self.assertEqual(expected.get(key), actual.get(key))
+
+	def test_entries_summed_up_by_period(self):
+		si = self.create_sales_invoice(qty=1, rate=150)
+		self.create_sales_invoice(qty=1, rate=50)
+		income_account = si.items[0].income_account
+
+		filters = self.get_report_filters()
+		period_list = get_period_list(
+			filters.from_fiscal_year,
+			filters.to_fiscal_year,
+			filters.period_start_date,
+			filters.period_end_date,
+			filters.filter_based_on,
+			filters.periodicity,
+			company=filters.company,
+		)
+
+		gl_entries, summed_gl_entries = {}, {}
+		for entries, kwargs in ((gl_entries, {}), (summed_gl_entries, {"period_list": period_list})):
+			set_gl_entries_by_account(
+				self.company,
+				None,
+				period_list[-1].to_date,
+				filters,
+				entries,
+				root_type="Income",
+				ignore_closing_entries=True,
+				**kwargs,
+			)
+
+		self.assertEqual(len(gl_entries[income_account]), 2)
+		self.assertEqual(len(summed_gl_entries[income_account]), 1)
+
+		summed_entry = summed_gl_entries[income_account][0]
+		self.assertEqual(summed_entry.credit, 200)
+		self.assertEqual(summed_entry.posting_date, getdate())
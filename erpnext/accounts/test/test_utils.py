@@ -5,8 +5,10 @@ from frappe.test_runner import make_test_objects
 
 from erpnext.accounts.doctype.payment_entry.payment_entry import get_payment_entry
 from erpnext.accounts.doctype.purchase_invoice.test_purchase_invoice import make_purchase_invoice
+from erpnext.accounts.doctype.sales_invoice.test_sales_invoice import create_sales_invoice
 from erpnext.accounts.party import get_party_shipping_address
 from erpnext.accounts.utils import (
+	defer_outstanding_updates,
 	get_future_stock_vouchers,
 	get_voucherwise_gl_entries,
 	sort_stock_vouchers_by_posting_date,
@@ -128,6 +130,27 @@ class TestUtils(unittest.TestCase):
 		self.assertEqual(len(payment_entry.references), 1)
 		self.assertEqual(payment_entry.difference_amount, 0)
 
+	def test_defer_outstanding_updates(self):
+		si1 = create_sales_invoice(rate=100)
+		si2 = create_sales_invoice(rate=100)
+
+		with defer_outstanding_updates():
+			for si, amount in ((si1, 40), (si2, 100)):
+				pe = get_payment_entry(
+					si.doctype, si.name, party_amount=amount, bank_account="_Test Cash - _TC"
+				)
+				pe.submit()
+
+			# updated once on exit
+			self.assertEqual(frappe.db.get_value(si1.doctype, si1.name, "outstanding_amount"), 100)
+
+		self.assertEqual(
+			frappe.db.get_value(si1.doctype, si1.name, ["outstanding_amount", "status"]), (60, "Partly Paid")
+		)
+		self.assertEqual(
+			frappe.db.get_value(si2.doctype, si2.name, ["outstanding_amount", "status"]), (0, "Paid")
+		)
+
 	def test_naming_series_variable_parsing(self):
 		"""
 		Tests parsing utility used by Naming Series Variable hook for FY
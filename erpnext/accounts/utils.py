@@ -3,6 +3,7 @@
 
 
 from collections import defaultdict
+from contextlib import contextmanager
 from json import loads
 from typing import TYPE_CHECKING, Optional
 
@@ -11,6 +12,7 @@ import frappe.defaults
 from frappe import _, qb, throw
 from frappe.desk.reportview import build_match_conditions
 from frappe.model.meta import get_field_precision
+from frappe.model.naming import set_new_name
 from frappe.query_builder import AliasedQuery, Case, Criterion, Table
 from frappe.query_builder.functions import Count, Max, Sum
 from frappe.query_builder.utils import DocType
@@ -36,6 +38,14 @@ import erpnext
 # imported to enable erpnext.accounts.utils.get_account_currency
 from erpnext.accounts.doctype.account.account import get_account_currency
 from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import get_dimensions
+from erpnext.accounts.doctype.voucher_outstanding.voucher_outstanding import (
+	get_against_vouchers,
+	get_open_vouchers_query,
+	is_filtered_by_key_fields,
+	is_voucher_outstanding_built,
+	is_voucher_outstanding_enabled,
+	refresh_voucher_outstanding_rows,
+)
 from erpnext.stock import get_warehouse_account_map
 from erpnext.stock.utils import get_stock_value_on
 
@@ -199,6 +209,10 @@ def get_balance_on(
 	if not cost_center and frappe.form_dict.get("cost_center"):
 		cost_center = frappe.form_dict.get("cost_center")
 
+	from erpnext.accounts.doctype.daily_account_balance.daily_account_balance import (
+		is_daily_account_balance_built,
+	)
+
 	cond = ["is_cancelled=0"]
 	if start_date:
 		cond.append("posting_date >= %s" % frappe.db.escape(cstr(start_date)))
@@ -285,6 +299,10 @@ def get_balance_on(
 		cond.append("""gle.company = %s """ % (frappe.db.escape(company)))
 
 	if account or (party_type and party) or account_type:
+		# the balance of a party across all its accounts is summed up from the GL Entries
+		if (account or account_type) and is_daily_account_balance_built():
+			return get_balance_from_daily_balances(cond, in_account_currency)
+
 		precision = get_currency_precision()
 		if in_account_currency:
 			select_field = (
@@ -304,6 +322,24 @@ def get_balance_on(
 		return flt(bal)
 
 
+def get_balance_from_daily_balances(cond, in_account_currency=True):
+	"""Balance from the Daily Account Balances, `cond` are the conditions of `get_balance_on`."""
+	cond = [d for d in cond if d != "is_cancelled=0"]
+	if in_account_currency:
+		select_field = "sum(debit_in_account_currency) - sum(credit_in_account_currency)"
+	else:
+		select_field = "sum(debit) - sum(credit)"
+
+	bal = frappe.db.sql(
+		"""
+		SELECT {}
+		FROM `tabDaily Account Balance` gle
+		WHERE {}""".format(select_field, " and ".join(cond))
+	)[0][0]
+
+	return flt(bal)
+
+
 def get_count_on(account, fieldname, date):
 	cond = ["is_cancelled=0"]
 	if date:
@@ -518,14 +554,15 @@ def reconcile_against_document(
 			create_payment_ledger_entry(gl_map, update_outstanding="No", cancel=0, adv_adj=1)
 
 		# Only update outstanding for newly linked vouchers
-		for entry in entries:
-			update_voucher_outstanding(
-				entry.against_voucher_type,
-				entry.against_voucher,
-				entry.account,
-				entry.party_type,
-				entry.party,
-			)
+		with defer_outstanding_updates():
+			for entry in entries:
+				update_voucher_outstanding(
+					entry.against_voucher_type,
+					entry.against_voucher,
+					entry.account,
+					entry.party_type,
+					entry.party,
+				)
 		frappe.flags.ignore_party_validation = False
 
 
@@ -912,20 +949,35 @@ def update_accounting_ledgers_after_reference_removal(
 
 	# Payment Ledger
 	ple = qb.DocType("Payment Ledger Entry")
-	ple_update_query = (
+	ple_filters = [
+		(ple.against_voucher_type == ref_type) & (ple.against_voucher_no == ref_no) & (ple.delinked == 0)
+	]
+
+	if payment_name:
+		ple_filters.append(ple.voucher_no == payment_name)
+
+	# unlinked entries are moved against their own vouchers
+	unlinked_vouchers = []
+	if is_voucher_outstanding_enabled():
+		unlinked_vouchers = (
+			qb.from_(ple)
+			.select(ple.voucher_type, ple.voucher_no)
+			.distinct()
+			.where(Criterion.all(ple_filters))
+			.run()
+		)
+
+	(
 		qb.update(ple)
 		.set(ple.against_voucher_type, ple.voucher_type)
 		.set(ple.against_voucher_no, ple.voucher_no)
 		.set(ple.modified, now())
 		.set(ple.modified_by, frappe.session.user)
-		.where(
-			(ple.against_voucher_type == ref_type) & (ple.against_voucher_no == ref_no) & (ple.delinked == 0)
-		)
+		.where(Criterion.all(ple_filters))
+		.run()
 	)
 
-	if payment_name:
-		ple_update_query = ple_update_query.where(ple.voucher_no == payment_name)
-	ple_update_query.run()
+	refresh_voucher_outstanding_rows([(ref_type, ref_no), *unlinked_vouchers])
 
 	# Advance Payment
 	adv = qb.DocType("Advance Payment Ledger Entry")
@@ -1099,6 +1151,14 @@ def get_company_default(company, fieldname, ignore_validation=False):
 
 
 def fix_total_debit_credit():
+	from erpnext.accounts.doctype.daily_account_balance.daily_account_balance import (
+		get_voucher_balances,
+		update_daily_account_balances,
+	)
+	from erpnext.accounts.report.consolidated_financial_statement.consolidated_financial_statement import (
+		invalidate_ledger_version,
+	)
+
 	vouchers = frappe.db.sql(
 		"""select voucher_type, voucher_no,
 		sum(debit) - sum(credit) as diff
@@ -1111,6 +1171,7 @@ def fix_total_debit_credit():
 	for d in vouchers:
 		if abs(d.diff) > 0:
 			dr_or_cr = d.voucher_type == "Sales Invoice" and "credit" or "debit"
+			previous_balances = get_voucher_balances(d.voucher_type, d.voucher_no)
 
 			frappe.db.sql(
 				"""update `tabGL Entry` set {} = {} + {}
@@ -1120,6 +1181,10 @@ def fix_total_debit_credit():
 				(d.diff, d.voucher_type, d.voucher_no),
 			)
 
+			update_daily_account_balances(d.voucher_type, d.voucher_no, previous_balances)
+
+	invalidate_ledger_version()
+
 
 def get_currency_precision():
 	precision = cint(frappe.db.get_default("currency_precision"))
@@ -1490,9 +1555,13 @@ def repost_gle_for_stock_vouchers(
 
 
 def _delete_pl_entries(voucher_type, voucher_no):
+	against_vouchers = get_against_vouchers(voucher_type, voucher_no)
+
 	ple = qb.DocType("Payment Ledger Entry")
 	qb.from_(ple).delete().where((ple.voucher_type == voucher_type) & (ple.voucher_no == voucher_no)).run()
 
+	refresh_voucher_outstanding_rows(against_vouchers)
+
 
 def _delete_adv_pl_entries(voucher_type, voucher_no):
 	adv = qb.DocType("Advance Payment Ledger Entry")
@@ -1500,9 +1569,22 @@ def _delete_adv_pl_entries(voucher_type, voucher_no):
 
 
 def _delete_gl_entries(voucher_type, voucher_no):
+	from erpnext.accounts.doctype.daily_account_balance.daily_account_balance import (
+		get_voucher_balances,
+		update_daily_account_balances,
+	)
+	from erpnext.accounts.report.consolidated_financial_statement.consolidated_financial_statement import (
+		invalidate_ledger_version,
+	)
+
+	previous_balances = get_voucher_balances(voucher_type, voucher_no)
+
 	gle = qb.DocType("GL Entry")
 	qb.from_(gle).delete().where((gle.voucher_type == voucher_type) & (gle.voucher_no == voucher_no)).run()
 
+	update_daily_account_balances(voucher_type, voucher_no, previous_balances)
+	invalidate_ledger_version()
+
 
 def _delete_accounting_ledger_entries(voucher_type, voucher_no):
 	"""
@@ -1887,28 +1969,124 @@ def get_advance_ledger_entry(gle, against_voucher_type, against_voucher_no, amou
 
 
 def create_payment_ledger_entry(
-	gl_entries, cancel=0, adv_adj=0, update_outstanding="Yes", from_repost=0, partial_cancel=False
+	gl_entries,
+	cancel=0,
+	adv_adj=0,
+	update_outstanding="Yes",
+	from_repost=0,
+	partial_cancel=False,
+	bulk=False,
 ):
 	if gl_entries:
 		ple_map = get_payment_ledger_entries(gl_entries, cancel=cancel)
 
-		for entry in ple_map:
-			ple = frappe.get_doc(entry)
+		# each against voucher is updated once, after all the entries are posted
+		with defer_outstanding_updates():
+			if bulk and not cancel:
+				make_payment_ledger_entries_in_bulk(ple_map, adv_adj, update_outstanding, from_repost)
+			else:
+				for entry in ple_map:
+					ple = frappe.get_doc(entry)
+
+					if cancel:
+						delink_original_entry(ple, partial_cancel=partial_cancel)
+
+					ple.flags.ignore_permissions = 1
+					ple.flags.adv_adj = adv_adj
+					ple.flags.from_repost = from_repost
+					ple.flags.update_outstanding = update_outstanding
+					ple.submit()
+
+		# the delinked entries are against the same vouchers as the reversed ones
+		refresh_voucher_outstanding_rows(
+			(entry.against_voucher_type, entry.against_voucher_no)
+			for entry in ple_map
+			if entry.doctype == "Payment Ledger Entry"
+		)
+
+
+def make_payment_ledger_entries_in_bulk(ple_map, adv_adj=0, update_outstanding="Yes", from_repost=0):
+	"""Insert the Payment Ledger Entries of a large voucher with multi-row inserts.
 
-			if cancel:
-				delink_original_entry(ple, partial_cancel=partial_cancel)
+	The validations which query the database are run once per account and the outstanding
+	of each against voucher is updated once, instead of once per entry."""
+	from erpnext.accounts.doctype.gl_entry.gl_entry import validate_balance_type, validate_frozen_account
 
-			ple.flags.ignore_permissions = 1
-			ple.flags.adv_adj = adv_adj
-			ple.flags.from_repost = from_repost
-			ple.flags.update_outstanding = update_outstanding
+	entries, validated_accounts = [], set()
+	for entry in ple_map:
+		ple = frappe.get_doc(entry)
+		ple.flags.ignore_permissions = 1
+		ple.flags.adv_adj = adv_adj
+		ple.flags.from_repost = from_repost
+		ple.flags.update_outstanding = update_outstanding
+
+		if ple.doctype != "Payment Ledger Entry":
 			ple.submit()
+			continue
+
+		if ple.account not in validated_accounts:
+			validated_accounts.add(ple.account)
+			ple.validate_account()
+
+			if not from_repost:
+				validate_frozen_account(ple.account, adv_adj)
+				ple.validate_account_details()
+
+		if not from_repost and not ple.delinked:
+			ple.validate_dimensions_for_pl_and_bs()
+			ple.validate_allowed_dimensions()
+
+		ple.docstatus = 1
+		entries.append(ple)
+
+	bulk_insert_documents(entries)
+
+	if not from_repost:
+		for account in validated_accounts:
+			validate_balance_type(account, adv_adj)
+
+	if update_outstanding != "Yes" or frappe.flags.is_reverse_depr_entry:
+		return
+
+	against_vouchers = {
+		(ple.against_voucher_type, ple.against_voucher_no, ple.account, ple.party_type, ple.party)
+		for ple in entries
+		if ple.against_voucher_type in ["Journal Entry", "Sales Invoice", "Purchase Invoice", "Fees"]
+	}
+
+	for against_voucher in against_vouchers:
+		update_voucher_outstanding(*against_voucher)
+
+
+def bulk_insert_documents(docs, chunk_size=1000):
+	"""Insert new documents of a doctype with multi-row inserts, their controller methods are not run."""
+	if not docs:
+		return
+
+	fields, values = None, []
+	for doc in docs:
+		if not doc.name:
+			set_new_name(doc)
+
+		doc.set_user_and_timestamp()
+
+		doc_values = doc.get_valid_dict(convert_dates_to_str=True, ignore_virtual=True)
+		fields = fields or list(doc_values)
+		values.append([doc_values.get(field) for field in fields])
+
+	frappe.db.bulk_insert(docs[0].doctype, fields=fields, values=values, chunk_size=chunk_size)
 
 
 def update_voucher_outstanding(voucher_type, voucher_no, account, party_type, party):
 	if not voucher_type or not voucher_no:
 		return
 
+	deferred_vouchers = frappe.flags.deferred_outstanding_vouchers
+	if deferred_vouchers is not None:
+		# updated by `defer_outstanding_updates` on exit
+		deferred_vouchers[(voucher_type, voucher_no, account, party_type, party)] = None
+		return
+
 	if voucher_type in get_advance_payment_doctypes():
 		ref_doc = frappe.get_lazy_doc(voucher_type, voucher_no)
 		ref_doc.set_total_advance_paid()
@@ -1955,6 +2133,84 @@ def update_voucher_outstanding(voucher_type, voucher_no, account, party_type, pa
 		ref_doc.notify_update()
 
 
+@contextmanager
+def defer_outstanding_updates():
+	"""Collect the vouchers passed to `update_voucher_outstanding` and update each of them once on exit.
+
+	Nested calls are collected and updated by the outermost one."""
+	if frappe.flags.deferred_outstanding_vouchers is not None:
+		yield
+		return
+
+	frappe.flags.deferred_outstanding_vouchers = {}
+	try:
+		yield
+		vouchers = list(frappe.flags.deferred_outstanding_vouchers)
+	finally:
+		frappe.flags.deferred_outstanding_vouchers = None
+
+	update_invoice_outstandings(vouchers)
+
+
+def update_invoice_outstandings(vouchers, batch_size=1000):
+	"""Update the outstanding amount and status of the vouchers, a list of
+	(voucher_type, voucher_no, account, party_type, party).
+
+	The outstandings of the invoices are fetched with a query per account and party, and the invoices of
+	a doctype are updated with a single query."""
+	invoices = defaultdict(list)
+	advance_payment_doctypes = get_advance_payment_doctypes()
+	for voucher_type, voucher_no, account, party_type, party in vouchers:
+		if voucher_type in advance_payment_doctypes:
+			update_voucher_outstanding(voucher_type, voucher_no, account, party_type, party)
+		elif voucher_type in ["Sales Invoice", "Purchase Invoice", "Fees"] and party_type and party:
+			invoices[(account, party_type, party)].append(
+				frappe._dict({"voucher_type": voucher_type, "voucher_no": voucher_no})
+			)
+
+	ple = frappe.qb.DocType("Payment Ledger Entry")
+	for (account, party_type, party), party_invoices in invoices.items():
+		common_filter = [ple.party_type == party_type, ple.party == party]
+		if account:
+			common_filter.append(ple.account == account)
+
+		for batch in create_batch(party_invoices, batch_size):
+			# on cancellation outstanding can be an empty list
+			outstandings = QueryPaymentLedger().get_voucher_outstandings(batch, common_filter=common_filter)
+			ref_docs = defaultdict(list)
+			for outstanding in outstandings:
+				ref_doc = frappe.get_doc(outstanding.voucher_type, outstanding.voucher_no)
+				ref_doc.outstanding_amount = flt(
+					outstanding.outstanding_in_account_currency, ref_doc.precision("outstanding_amount")
+				)
+				ref_doc.set_status()
+				ref_docs[ref_doc.doctype].append(ref_doc)
+
+			for doctype, docs in ref_docs.items():
+				set_outstanding_and_status(doctype, docs)
+
+				for ref_doc in docs:
+					ref_doc.notify_update()
+
+
+def set_outstanding_and_status(doctype, docs):
+	"""Write the outstanding amount and status of the documents with a single query."""
+	dt = frappe.qb.DocType(doctype)
+	outstanding_amount, status = Case(), Case()
+	for doc in docs:
+		outstanding_amount = outstanding_amount.when(dt.name == doc.name, doc.outstanding_amount)
+		status = status.when(dt.name == doc.name, doc.status)
+
+	(
+		frappe.qb.update(dt)
+		.set(dt.outstanding_amount, outstanding_amount)
+		.set(dt.status, status)
+		.set(dt.modified, now())
+		.set(dt.modified_by, frappe.session.user)
+		.where(dt.name.isin([doc.name for doc in docs]))
+	).run()
+
+
 def delink_original_entry(pl_entry, partial_cancel=False):
 	if not pl_entry:
 		return
@@ -2054,6 +2310,16 @@ class QueryPaymentLedger:
 			filter_on_voucher_no.append(ple.voucher_no.like(f"%{self.voucher_no}%"))
 			filter_on_against_voucher_no.append(ple.against_voucher_no.like(f"%{self.voucher_no}%"))
 
+		# skip the settled vouchers, their outstanding is zero for the common filters
+		if (
+			(self.get_invoices or self.get_payments)
+			and is_filtered_by_key_fields(self.common_filter)
+			and is_voucher_outstanding_built()
+		):
+			open_vouchers = get_open_vouchers_query(criteria=self.common_filter)
+			filter_on_voucher_no.append(ple.voucher_no.isin(open_vouchers))
+			filter_on_against_voucher_no.append(ple.against_voucher_no.isin(open_vouchers))
+
 		# build outstanding amount filter
 		filter_on_outstanding_amount = []
 		if self.min_outstanding:
@@ -2,10 +2,62 @@
 # GPL v3 License. See license.txt
 
 import click
+from frappe.commands import get_site, pass_context
 
 
 def call_command(cmd, context):
 	return click.Context(cmd, obj=context).forward(cmd)
 
 
-commands = []
+@click.command("run-stock-ledger-benchmark")
+@click.option("--items", type=int, default=10, help="Number of items")
+@click.option("--warehouses", type=int, default=3, help="Number of warehouses")
+@click.option("--entries-per-item", type=int, default=20, help="Number of stock entries per item")
+@click.option("--serial-item-ratio", type=float, default=0.0, help="Share of serialized items")
+@click.option("--batch-item-ratio", type=float, default=0.0, help="Share of batched items")
+@click.option("--transfer-ratio", type=float, default=0.3, help="Share of material transfers")
+@click.option("--issue-ratio", type=float, default=0.3, help="Share of material issues")
+@click.option("--days", type=int, default=60, help="Number of days the ledger is spread over")
+@click.option("--backdated-entries", type=int, default=5, help="Number of backdated entries to repost")
+@click.option("--cancellations", type=int, default=5, help="Number of entries to cancel")
+@click.option("--seed", type=int, default=0, help="Seed for the generated ledger")
+@click.option("--output", help="Path of the JSON file to write the results to")
+@click.option("--compare-with", help="Path of the results of a previous run to compare with")
+@click.option("--keep-data", is_flag=True, default=False, help="Do not roll back the generated ledger")
+@pass_context
+def run_stock_ledger_benchmark(context, output=None, compare_with=None, keep_data=False, **config):
+	"Generate a synthetic stock ledger and benchmark submission, cancellation and reposting"
+	import json
+
+	import frappe
+
+	from erpnext.stock.benchmark import compare_results, run_benchmark
+
+	site = get_site(context)
+	frappe.init(site=site)
+	frappe.connect()
+
+	try:
+		results = run_benchmark(config, output=output, keep_data=keep_data)
+	finally:
+		frappe.destroy()
+
+	for result in results["results"]:
+		click.echo(
+			"{name}: {count} in {time}s, {queries_per_operation} queries per operation".format(**result)
+		)
+
+	if compare_with:
+		with open(compare_with) as f:
+			regressions = compare_results(json.load(f), results)
+
+		for regression in regressions:
+			click.secho(
+				"Regression in {name} {metric}: {baseline} -> {current}".format(**regression), fg="red"
+			)
+
+		if regressions:
+			raise SystemExit(1)
+
+
+commands = [run_stock_ledger_benchmark]
@@ -32,6 +32,10 @@ from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
 	get_accounting_dimensions,
 	get_dimensions,
 )
+from erpnext.accounts.doctype.daily_account_balance.daily_account_balance import (
+	get_voucher_balances,
+	update_daily_account_balances,
+)
 from erpnext.accounts.doctype.pricing_rule.utils import (
 	apply_pricing_rule_for_free_items,
 	apply_pricing_rule_on_transaction,
@@ -395,6 +399,9 @@ class AccountsController(TransactionBase):
 			).run()
 
 	def on_trash(self):
+		from erpnext.accounts.report.consolidated_financial_statement.consolidated_financial_statement import (
+			invalidate_ledger_version,
+		)
 		from erpnext.accounts.utils import delete_exchange_gain_loss_journal
 
 		self._remove_references_in_repost_doctypes()
@@ -416,10 +423,13 @@ class AccountsController(TransactionBase):
 					== 1
 				)
 			).run()
+			previous_balances = get_voucher_balances(self.doctype, self.name)
 			gle = frappe.qb.DocType("GL Entry")
 			frappe.qb.from_(gle).delete().where(
 				(gle.voucher_type == self.doctype) & (gle.voucher_no == self.name)
 			).run()
+			update_daily_account_balances(self.doctype, self.name, previous_balances)
+			invalidate_ledger_version()
 			sle = frappe.qb.DocType("Stock Ledger Entry")
 			frappe.qb.from_(sle).delete().where(
 				(sle.voucher_type == self.doctype) & (sle.voucher_no == self.name)
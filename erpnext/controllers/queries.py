@@ -15,6 +15,9 @@ from frappe.utils import cint, nowdate, today, unique
 from pypika import Order
 
 import erpnext
+from erpnext.stock.doctype.batch_warehouse_balance.batch_warehouse_balance import (
+	is_batch_balance_built,
+)
 from erpnext.stock.get_item_details import _get_item_tax_template
 
 
@@ -495,6 +498,9 @@ def get_batches_from_stock_ledger_entries(searchfields, txt, filters, start=0, p
 
 
 def get_batches_from_serial_and_batch_bundle(searchfields, txt, filters, start=0, page_len=100):
+	if is_batch_balance_built():
+		return get_batches_from_batch_balances(searchfields, txt, filters, start, page_len)
+
 	bundle = frappe.qb.DocType("Serial and Batch Entry")
 	stock_ledger_entry = frappe.qb.DocType("Stock Ledger Entry")
 	batch_table = frappe.qb.DocType("Batch")
@@ -549,6 +555,48 @@ def get_batches_from_serial_and_batch_bundle(searchfields, txt, filters, start=0
 	return bundle_query.run(as_list=1)
 
 
+def get_batches_from_batch_balances(searchfields, txt, filters, start=0, page_len=100):
+	balance = frappe.qb.DocType("Batch Warehouse Balance")
+	batch_table = frappe.qb.DocType("Batch")
+
+	expiry_date = filters.get("posting_date") or today()
+
+	query = (
+		frappe.qb.from_(balance)
+		.inner_join(batch_table)
+		.on(batch_table.name == balance.batch_no)
+		.select(
+			balance.batch_no,
+			balance.qty,
+			Concat("MFG-", batch_table.manufacturing_date),
+			Concat("EXP-", batch_table.expiry_date),
+		)
+		.where(
+			(balance.item_code == filters.get("item_code")) & (batch_table.disabled == 0) & (balance.qty != 0)
+		)
+		.offset(start)
+		.limit(page_len)
+	)
+
+	if not filters.get("include_expired_batches"):
+		query = query.where((batch_table.expiry_date >= expiry_date) | (batch_table.expiry_date.isnull()))
+
+	if filters.get("warehouse"):
+		query = query.where(balance.warehouse == filters.get("warehouse"))
+
+	for field in searchfields:
+		query = query.select(batch_table[field])
+
+	if txt:
+		txt_condition = batch_table.name.like(f"%{txt}%")
+		for field in [*searchfields, "name"]:
+			txt_condition |= batch_table[field].like(f"%{txt}%")
+
+		query = query.where(txt_condition)
+
+	return query.run(as_list=1)
+
+
 @frappe.whitelist()
 @frappe.validate_and_sanitize_search_inputs
 def get_account_list(doctype, txt, searchfield, start, page_len, filters):
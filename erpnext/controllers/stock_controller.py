@@ -29,6 +29,7 @@ from erpnext.stock.doctype.serial_and_batch_bundle.serial_and_batch_bundle impor
 	get_type_of_transaction,
 )
 from erpnext.stock.stock_ledger import get_items_to_be_repost
+from erpnext.stock.valuation import get_stock_queue_bins
 
 
 class QualityInspectionRequiredError(frappe.ValidationError):
@@ -1594,7 +1595,7 @@ def repost_required_for_queue(doc: StockController) -> bool:
 		return False
 
 	for sle in consuming_sles:
-		if sle.stock_queue != "[]":  # using FIFO/LIFO valuation
+		if get_stock_queue_bins(sle.stock_queue):  # using FIFO/LIFO valuation
 			return True
 	return False
 
@@ -1758,7 +1759,7 @@ def get_conditions_to_validate_future_sle(sl_entries):
 	for warehouse, items in warehouse_items_map.items():
 		or_conditions.append(
 			f"""warehouse = {frappe.db.escape(warehouse)}
-				and item_code in ({', '.join(frappe.db.escape(item) for item in items)})"""
+				and item_code in ({", ".join(frappe.db.escape(item) for item in items)})"""
 		)
 
 	return or_conditions
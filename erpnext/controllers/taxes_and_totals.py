@@ -36,6 +36,8 @@ class calculate_taxes_and_totals:
 			)
 
 		self._items = self.filter_rows() if self.doc.doctype == "Quotation" else self.doc.get("items")
+		# item tax maps by the json of the item tax rate, parsed once for all the items and passes
+		self._item_tax_maps = {}
 
 		get_round_off_applicable_accounts(self.doc.company, frappe.flags.round_off_applicable_accounts)
 		self.calculate()
@@ -310,7 +312,14 @@ class calculate_taxes_and_totals:
 				self._set_in_company_currency(item, ["net_rate", "net_amount"])
 
 	def _load_item_tax_rate(self, item_tax_rate):
-		return json.loads(item_tax_rate) if item_tax_rate else {}
+		if not item_tax_rate:
+			return {}
+
+		if item_tax_rate not in self._item_tax_maps:
+			self._item_tax_maps[item_tax_rate] = json.loads(item_tax_rate)
+
+		# a copy, as the parsed map is shared by the items with the same tax rates
+		return dict(self._item_tax_maps[item_tax_rate])
 
 	def get_current_tax_fraction(self, tax, item_tax_map):
 		"""
@@ -390,6 +399,53 @@ class calculate_taxes_and_totals:
 			]
 		)
 
+		if self.is_item_tax_calculation_overridden():
+			self.calculate_item_taxes(actual_tax_dict)
+		else:
+			self.calculate_item_taxes_column_wise(actual_tax_dict)
+
+		discount_amount_applied = self.discount_amount_applied
+		if doc.apply_discount_on == "Grand Total" and (
+			discount_amount_applied or doc.discount_amount or doc.additional_discount_percentage
+		):
+			tax_amount_precision = doc.taxes[0].precision("tax_amount")
+
+			for i, tax in enumerate(doc.taxes):
+				if discount_amount_applied:
+					tax.tax_amount_after_discount_amount = flt(
+						tax.tax_amount_after_discount_amount, tax_amount_precision
+					)
+
+				self.set_cumulative_total(i, tax)
+
+			if not discount_amount_applied:
+				self.grand_total_for_distributing_discount = doc.taxes[-1].total
+			else:
+				self.grand_total_diff = flt(
+					self.grand_total_for_distributing_discount - doc.discount_amount - doc.taxes[-1].total,
+					doc.precision("grand_total"),
+				)
+
+		for i, tax in enumerate(doc.taxes):
+			self.round_off_totals(tax)
+			self._set_in_company_currency(tax, ["tax_amount", "tax_amount_after_discount_amount"])
+
+			self.round_off_base_values(tax)
+			self.set_cumulative_total(i, tax)
+
+			self._set_in_company_currency(tax, ["total"])
+
+	def is_item_tax_calculation_overridden(self):
+		"""Returns True if the tax of an item is computed by methods overridden in a subclass, which are
+		only called by `calculate_item_taxes`."""
+		return any(
+			getattr(type(self), method) is not getattr(calculate_taxes_and_totals, method)
+			for method in ("get_current_tax_amount", "_get_tax_rate", "set_item_wise_tax")
+		)
+
+	def calculate_item_taxes(self, actual_tax_dict):
+		doc = self.doc
+
 		for n, item in enumerate(self._items):
 			item_tax_map = self._load_item_tax_rate(item.item_tax_rate)
 			for i, tax in enumerate(doc.taxes):
@@ -430,36 +486,136 @@ class calculate_taxes_and_totals:
 						doc.taxes[i - 1].grand_total_for_current_item + current_tax_amount
 					)
 
-		discount_amount_applied = self.discount_amount_applied
-		if doc.apply_discount_on == "Grand Total" and (
-			discount_amount_applied or doc.discount_amount or doc.additional_discount_percentage
-		):
-			tax_amount_precision = doc.taxes[0].precision("tax_amount")
+	def calculate_item_taxes_column_wise(self, actual_tax_dict):
+		"""Same as `calculate_item_taxes`, with the taxes of all the items computed one tax row at a time.
 
-			for i, tax in enumerate(doc.taxes):
-				if discount_amount_applied:
-					tax.tax_amount_after_discount_amount = flt(
-						tax.tax_amount_after_discount_amount, tax_amount_precision
-					)
+		The tax of an item on a row only depends on its taxes on the previous rows, and the amounts of a row
+		are added up in the order of the items, so the amounts and their rounding are the same."""
+		doc = self.doc
+		items = self._items
+		if not items:
+			return
 
-				self.set_cumulative_total(i, tax)
+		item_tax_maps = [self._load_item_tax_rate(item.item_tax_rate) for item in items]
+		net_amounts = [item.net_amount for item in items]
+		apply_discount_on_grand_total = (
+			self.discount_amount_applied and doc.apply_discount_on == "Grand Total"
+		)
 
-			if not discount_amount_applied:
-				self.grand_total_for_distributing_discount = doc.taxes[-1].total
-			else:
-				self.grand_total_diff = flt(
-					self.grand_total_for_distributing_discount - doc.discount_amount - doc.taxes[-1].total,
-					doc.precision("grand_total"),
-				)
+		# tax_amount_for_current_item and grand_total_for_current_item of each row, by item
+		tax_amounts = []
+		grand_totals = []
 
 		for i, tax in enumerate(doc.taxes):
-			self.round_off_totals(tax)
-			self._set_in_company_currency(tax, ["tax_amount", "tax_amount_after_discount_amount"])
+			rate_precision = doc.precision("rate", tax)
+			tax_rates = [
+				flt(item_tax_map.get(tax.account_head), rate_precision)
+				if tax.account_head in item_tax_map
+				else tax.rate
+				for item_tax_map in item_tax_maps
+			]
 
-			self.round_off_base_values(tax)
-			self.set_cumulative_total(i, tax)
+			current_tax_amounts = self.get_current_tax_amounts(tax, tax_rates, tax_amounts, grand_totals)
+			if not (doc.get("is_consolidated") or tax.get("dont_recompute_tax")):
+				self.set_item_wise_taxes(tax, tax_rates, current_tax_amounts)
 
-			self._set_in_company_currency(tax, ["total"])
+			if frappe.flags.round_row_wise_tax:
+				tax_amount_precision = tax.precision("tax_amount")
+				current_tax_amounts = [flt(amount, tax_amount_precision) for amount in current_tax_amounts]
+
+			# Adjust divisional loss to the last item
+			if tax.charge_type == "Actual":
+				for current_tax_amount in current_tax_amounts:
+					actual_tax_dict[tax.idx] -= current_tax_amount
+				current_tax_amounts[-1] += actual_tax_dict[tax.idx]
+
+			# added up one by one, as sum() compensates the rounding errors of floats since python 3.12
+			tax_amount = tax.tax_amount
+			tax_amount_after_discount_amount = tax.tax_amount_after_discount_amount
+			for current_tax_amount in current_tax_amounts:
+				tax_amount += current_tax_amount
+				tax_amount_after_discount_amount += current_tax_amount
+
+			if tax.charge_type != "Actual" and not apply_discount_on_grand_total:
+				tax.tax_amount = tax_amount
+			tax.tax_amount_after_discount_amount = tax_amount_after_discount_amount
+
+			previous_grand_totals = grand_totals[i - 1] if i else net_amounts
+			tax_amounts.append(current_tax_amounts)
+			grand_totals.append(
+				[
+					flt(
+						grand_total
+						+ self.get_tax_amount_if_for_valuation_or_deduction(current_tax_amount, tax)
+					)
+					for grand_total, current_tax_amount in zip(
+						previous_grand_totals, current_tax_amounts, strict=True
+					)
+				]
+			)
+
+			tax.tax_amount_for_current_item = tax_amounts[i][-1]
+			tax.grand_total_for_current_item = grand_totals[i][-1]
+
+	def get_current_tax_amounts(self, tax, tax_rates, tax_amounts, grand_totals):
+		"""Returns the tax of each item on the row, like `get_current_tax_amount`, given the taxes of the
+		items on the previous rows."""
+		items = self._items
+
+		if tax.charge_type == "Actual":
+			# distribute the tax amount proportionally to each item row
+			actual = flt(tax.tax_amount, tax.precision("tax_amount"))
+
+			current_tax_amounts = []
+			for item in items:
+				if tax.get("is_tax_withholding_account") and item.meta.get_field("apply_tds"):
+					if not item.get("apply_tds") or not self.doc.tax_withholding_net_total:
+						current_tax_amount = 0.0
+					else:
+						current_tax_amount = item.net_amount * actual / self.doc.tax_withholding_net_total
+				else:
+					current_tax_amount = (
+						item.net_amount * actual / self.doc.net_total if self.doc.net_total else 0.0
+					)
+
+				current_tax_amounts.append(current_tax_amount)
+
+			return current_tax_amounts
+
+		elif tax.charge_type == "On Net Total":
+			amounts = [item.net_amount for item in items]
+		elif tax.charge_type == "On Previous Row Amount":
+			amounts = tax_amounts[cint(tax.row_id) - 1]
+		elif tax.charge_type == "On Previous Row Total":
+			amounts = grand_totals[cint(tax.row_id) - 1]
+		elif tax.charge_type == "On Item Quantity":
+			return [tax_rate * item.qty for tax_rate, item in zip(tax_rates, items, strict=True)]
+		else:
+			return [0.0] * len(items)
+
+		return [(tax_rate / 100.0) * amount for tax_rate, amount in zip(tax_rates, amounts, strict=True)]
+
+	def set_item_wise_taxes(self, tax, tax_rates, current_tax_amounts):
+		"""Store the tax breakup of the items on the row, like `set_item_wise_tax` does for each item."""
+		item_wise_tax_detail = tax.item_wise_tax_detail
+		conversion_rate = self.doc.conversion_rate
+		tax_amount_precision = tax.precision("tax_amount")
+
+		for item, tax_rate, current_tax_amount in zip(
+			self._items, tax_rates, current_tax_amounts, strict=True
+		):
+			key = item.item_code or item.item_name
+			item_wise_tax_amount = current_tax_amount * conversion_rate
+			if frappe.flags.round_row_wise_tax:
+				item_wise_tax_amount = flt(item_wise_tax_amount, tax_amount_precision)
+				if item_wise_tax_detail.get(key):
+					item_wise_tax_amount += flt(item_wise_tax_detail[key][1], tax_amount_precision)
+				item_wise_tax_detail[key] = [tax_rate, flt(item_wise_tax_amount, tax_amount_precision)]
+			else:
+				if item_wise_tax_detail.get(key):
+					item_wise_tax_amount += item_wise_tax_detail[key][1]
+
+				item_wise_tax_detail[key] = [tax_rate, flt(item_wise_tax_amount)]
 
 	def get_tax_amount_if_for_valuation_or_deduction(self, tax_amount, tax):
 		# if just for valuation, do not add the tax amount in total
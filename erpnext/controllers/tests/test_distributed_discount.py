@@ -59,3 +59,72 @@ class TestTaxesAndTotals(AccountsTestMixin, FrappeTestCase):
 		self.assertEqual(so.total, 1500)
 		self.assertAlmostEqual(so.net_total, 1272.73, places=2)
 		self.assertEqual(so.grand_total, 1400)
+
+	def test_column_wise_item_taxes(self):
+		class ItemWiseTaxes(calculate_taxes_and_totals):
+			def get_current_tax_amount(self, item, tax, item_tax_map):
+				return super().get_current_tax_amount(item, tax, item_tax_map)
+
+		so = make_sales_order(do_not_save=1)
+		so.apply_discount_on = "Grand Total"
+		so.discount_amount = 33.33
+		so.items[0].qty = 3
+		so.items[0].rate = 99.99
+		so.append("items", so.items[0].as_dict())
+		so.items[1].qty = 7
+		so.items[1].rate = 123.45
+		so.items[1].item_tax_template = "_Test Account Excise Duty @ 10 - _TC"
+		so.append("items", so.items[0].as_dict())
+		so.items[2].qty = 1
+		so.items[2].rate = 0.33
+
+		for tax in (
+			{"charge_type": "On Net Total", "account_head": "_Test Account VAT - _TC", "rate": 12.5},
+			{"charge_type": "On Net Total", "account_head": "_Test Account Excise Duty - _TC", "rate": 5},
+			{
+				"charge_type": "On Previous Row Amount",
+				"account_head": "_Test Account Service Tax - _TC",
+				"rate": 3.3,
+				"row_id": 2,
+			},
+			{
+				"charge_type": "On Previous Row Total",
+				"account_head": "_Test Account Customs Duty - _TC",
+				"rate": 1.7,
+				"row_id": 3,
+			},
+			{
+				"charge_type": "Actual",
+				"account_head": "_Test Account Shipping Charges - _TC",
+				"tax_amount": 10,
+			},
+		):
+			so.append("taxes", {"cost_center": "_Test Cost Center - _TC", "description": "Tax", **tax})
+		so.taxes[0].included_in_print_rate = 1
+		so.save()
+
+		def get_taxes():
+			return (
+				so.grand_total,
+				so.rounding_adjustment,
+				[(item.net_rate, item.net_amount) for item in so.items],
+				[
+					(
+						tax.tax_amount,
+						tax.tax_amount_after_discount_amount,
+						tax.base_tax_amount,
+						tax.total,
+						tax.tax_amount_for_current_item,
+						tax.grand_total_for_current_item,
+						tax.item_wise_tax_detail,
+					)
+					for tax in so.taxes
+				],
+			)
+
+		calculate_taxes_and_totals(so)
+		taxes = get_taxes()
+
+		# computed item by item when the tax of an item is overridden
+		ItemWiseTaxes(so)
+		self.assertEqual(get_taxes(), taxes)
@@ -1,6 +1,11 @@
 import frappe
 from frappe import _
 
+from erpnext.accounts.doctype.daily_account_balance.daily_account_balance import (
+    get_voucher_balances,
+    update_daily_account_balances,
+)
+
 def validate_multiple_payment_modes(doc, method):
     """validate multiple payment modes before submission"""
     
@@ -27,6 +32,9 @@ def create_additional_gl_entries(doc, method):
     
     if not (doc.custom_mode_of_payment_1 and doc.custom_account_paid_to_1 and doc.custom_paid_amount_1):
         return
+
+    # GL Entries are changed directly, so the daily account balances are updated for the voucher
+    previous_balances = get_voucher_balances(doc.doctype, doc.name)
     
     # calculate total amount
     total_amount = doc.paid_amount + doc.custom_paid_amount_1
@@ -92,6 +100,7 @@ def create_additional_gl_entries(doc, method):
     
     # update the existing Debtors/Creditors GL entry to reflect total amount
     update_main_account_gl_entry(doc, total_amount)
+    update_daily_account_balances(doc.doctype, doc.name, previous_balances)
 
 def update_main_account_gl_entry(doc, total_amount):
     """update the main account (Debtors/Creditors) GL entry with total amount"""
@@ -140,6 +149,9 @@ def cancel_additional_gl_entries(doc, method):
     
     if not (doc.custom_mode_of_payment_1 and doc.custom_account_paid_to_1 and doc.custom_paid_amount_1):
         return
+
+    # GL Entries are changed directly, so the daily account balances are updated for the voucher
+    previous_balances = get_voucher_balances(doc.doctype, doc.name)
     
     # calculate total amount
     total_amount = doc.paid_amount + doc.custom_paid_amount_1
@@ -221,6 +233,7 @@ def cancel_additional_gl_entries(doc, method):
     
     # revert the main account GL entry to original amount
     revert_main_account_gl_entry(doc, total_amount)
+    update_daily_account_balances(doc.doctype, doc.name, previous_balances)
 
 def revert_main_account_gl_entry(doc, total_amount):
     """revert the main account (Debtors/Creditors) GL entry to original amount"""
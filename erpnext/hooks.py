@@ -323,6 +323,10 @@ period_closing_doctypes = [
 	"Subcontracting Receipt",
 ]
 
+# documents whose names are stored in the Daily Account Balances and Voucher Outstandings, and which
+# can be merged into another one
+ledger_merge_doctypes = ["Account", "Cost Center", "Customer", "Supplier", "Employee", "Shareholder"]
+
 doc_events = {
 	"*": {
 		"validate": [
@@ -333,6 +337,16 @@ doc_events = {
 	tuple(period_closing_doctypes): {
 		"validate": "erpnext.accounts.doctype.accounting_period.accounting_period.validate_accounting_period_on_doc_save",
 	},
+	tuple(ledger_merge_doctypes): {
+		"before_rename": [
+			"erpnext.accounts.doctype.daily_account_balance.daily_account_balance.before_rename",
+			"erpnext.accounts.doctype.voucher_outstanding.voucher_outstanding.before_rename",
+		],
+		"after_rename": [
+			"erpnext.accounts.doctype.daily_account_balance.daily_account_balance.after_rename",
+			"erpnext.accounts.doctype.voucher_outstanding.voucher_outstanding.after_rename",
+		],
+	},
 	"Stock Entry": {
 		"on_submit": "erpnext.stock.doctype.material_request.material_request.update_completed_and_requested_qty",
 		"on_cancel": "erpnext.stock.doctype.material_request.material_request.update_completed_and_requested_qty",
@@ -358,6 +372,9 @@ doc_events = {
 	"Event": {
 		"after_insert": "erpnext.crm.utils.link_events_with_prospect",
 	},
+	"System Settings": {
+		"on_update": "erpnext.accounts.doctype.daily_account_balance.daily_account_balance.rebuild_on_precision_change",
+	},
 	"Sales Invoice": {
 		"on_submit": [
 			"erpnext.regional.create_transaction_log",
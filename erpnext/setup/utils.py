@@ -8,6 +8,7 @@ from frappe.utils.data import getdate, now_datetime
 from frappe.utils.nestedset import get_root_of
 
 from erpnext import get_default_company
+from erpnext.stock.doctype.item_price.item_price_cache import clear_item_price_cache
 
 
 def before_tests():
@@ -37,6 +38,7 @@ def before_tests():
 		)
 
 	frappe.db.sql("delete from `tabItem Price`")
+	clear_item_price_cache()
 
 	_enable_all_roles_for_admin()
 
@@ -0,0 +1,412 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+"""Performance benchmarks for the stock ledger.
+
+Generates a synthetic ledger on the site and times submission, cancellation and
+reposting of stock transactions along with the FIFO, LIFO and Moving Average
+valuation paths. For each step the wall time, number of SQL queries and peak
+Python memory are recorded, results are written as JSON so that they can be
+compared between releases. The peak memory is traced in a separate run of the
+same ledger, which is rolled back, as tracing slows down the timed run.
+
+	bench --site {site} run-stock-ledger-benchmark --items 20 --entries-per-item 50 --output results.json
+
+The generated data is rolled back after the run unless `keep_data` is set. The Repost Item Valuations
+queued by the backdated and cancelled entries are deleted once done, as the benchmark reposts the
+backdated entries itself and cancels the latest entries only.
+"""
+
+import json
+import random
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import frappe
+from frappe.query_builder import Criterion
+from frappe.utils import add_days, cint, flt, now, nowdate
+from frappe.utils.nestedset import get_root_of
+
+import erpnext
+from erpnext.stock.valuation import FIFOValuation, LIFOValuation
+
+MEMORY_RUN_SAVEPOINT = "stock_ledger_benchmark_memory_run"
+
+DEFAULT_CONFIG = {
+	"company": None,
+	"items": 10,
+	"warehouses": 3,
+	"entries_per_item": 20,
+	# share of items maintained with serial nos / batches
+	"serial_item_ratio": 0.0,
+	"batch_item_ratio": 0.0,
+	# share of the entries which are material transfers / issues, the rest are receipts
+	"transfer_ratio": 0.3,
+	"issue_ratio": 0.3,
+	"backdated_entries": 5,
+	"cancellations": 5,
+	"valuation_methods": ["FIFO", "Moving Average", "LIFO"],
+	"valuation_operations": 10000,
+	"days": 60,
+	"seed": 0,
+}
+
+
+class StockLedgerBenchmark:
+	def __init__(self, config=None, trace_memory=False):
+		self.config = frappe._dict(DEFAULT_CONFIG)
+		self.config.update(config or {})
+
+		self.company = self.config.company or erpnext.get_default_company()
+		self.random = random.Random(self.config.seed)
+		self.tag = frappe.generate_hash(length=5).upper()
+		self.trace_memory = trace_memory
+
+		self.items = []
+		self.warehouses = []
+		self.vouchers = []
+		self.voucher_nos = []
+		self.stock = {}
+		self.results = {}
+
+	def run(self):
+		# the outward bundles of the serial and batch items are picked from the available stock, the setting
+		# is restored once done as the data may be kept
+		setting = "auto_create_serial_and_batch_bundle_for_outward"
+		previous_value = frappe.db.get_single_value("Stock Settings", setting)
+		frappe.db.set_single_value("Stock Settings", setting, 1)
+
+		try:
+			self.setup_masters()
+			self.make_ledger()
+			self.make_backdated_entries()
+			self.cancel_entries()
+			self.benchmark_valuation()
+		finally:
+			frappe.db.set_single_value("Stock Settings", setting, previous_value)
+			self.delete_repost_entries()
+
+		return self.get_results()
+
+	def setup_masters(self):
+		item_group = frappe.db.get_single_value("Stock Settings", "item_group") or get_root_of("Item Group")
+
+		for idx in range(cint(self.config.warehouses)):
+			warehouse = frappe.get_doc(
+				{
+					"doctype": "Warehouse",
+					"warehouse_name": f"_Bench Warehouse {self.tag} {idx}",
+					"company": self.company,
+				}
+			).insert(ignore_permissions=True)
+			self.warehouses.append(warehouse.name)
+
+		serial_items = round(cint(self.config.items) * flt(self.config.serial_item_ratio))
+		batch_items = round(cint(self.config.items) * flt(self.config.batch_item_ratio))
+		valuation_methods = self.config.valuation_methods
+
+		for idx in range(cint(self.config.items)):
+			item_code = f"_Bench Item {self.tag} {idx}"
+			has_serial_no = idx < serial_items
+			has_batch_no = not has_serial_no and idx < serial_items + batch_items
+
+			frappe.get_doc(
+				{
+					"doctype": "Item",
+					"item_code": item_code,
+					"item_group": item_group,
+					"stock_uom": "Nos",
+					"is_stock_item": 1,
+					"valuation_method": valuation_methods[idx % len(valuation_methods)],
+					"has_serial_no": cint(has_serial_no),
+					"serial_no_series": f"BSN-{self.tag}-{idx}-.#####" if has_serial_no else None,
+					"has_batch_no": cint(has_batch_no),
+					"create_new_batch": cint(has_batch_no),
+					"batch_number_series": f"BBT-{self.tag}-{idx}-.#####" if has_batch_no else None,
+				}
+			).insert(ignore_permissions=True)
+			self.items.append(item_code)
+
+	def make_ledger(self):
+		"""Submit the stock entries of all the items in posting order."""
+		entries = cint(self.config.entries_per_item) * len(self.items)
+		start_date = add_days(nowdate(), -cint(self.config.days))
+
+		for idx in range(entries):
+			posting_date = add_days(start_date, idx * cint(self.config.days) // max(entries, 1))
+			posting_time = get_posting_time(idx)
+			item_code = self.items[idx % len(self.items)]
+
+			args = self.get_entry_args(item_code)
+			label = "submit_" + frappe.scrub(args.purpose)
+
+			with self.measure(label):
+				stock_entry = self.make_stock_entry(args, posting_date, posting_time)
+
+			self.vouchers.append(stock_entry)
+
+	def get_entry_args(self, item_code):
+		qty = self.random.randint(1, 10)
+		warehouse = self.random.choice(self.warehouses)
+		available_qty = self.stock.get((item_code, warehouse), 0)
+
+		choice = self.random.random()
+		if available_qty >= qty and choice < flt(self.config.transfer_ratio) and len(self.warehouses) > 1:
+			target_warehouse = self.random.choice([d for d in self.warehouses if d != warehouse])
+			return frappe._dict(
+				purpose="Material Transfer",
+				item_code=item_code,
+				qty=qty,
+				from_warehouse=warehouse,
+				to_warehouse=target_warehouse,
+			)
+
+		if available_qty >= qty and choice < flt(self.config.transfer_ratio) + flt(self.config.issue_ratio):
+			return frappe._dict(
+				purpose="Material Issue", item_code=item_code, qty=qty, from_warehouse=warehouse
+			)
+
+		return frappe._dict(
+			purpose="Material Receipt",
+			item_code=item_code,
+			qty=qty,
+			to_warehouse=warehouse,
+			rate=self.random.randint(50, 150),
+		)
+
+	def make_stock_entry(self, args, posting_date, posting_time):
+		from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
+
+		stock_entry = make_stock_entry(
+			company=self.company, posting_date=posting_date, posting_time=posting_time, **args
+		)
+		self.voucher_nos.append(stock_entry.name)
+
+		if args.from_warehouse:
+			self.stock[(args.item_code, args.from_warehouse)] -= args.qty
+		if args.to_warehouse:
+			key = (args.item_code, args.to_warehouse)
+			self.stock[key] = self.stock.get(key, 0) + args.qty
+
+		return stock_entry
+
+	def make_backdated_entries(self):
+		"""Receipts posted before the existing entries of the item, which have to repost the future entries."""
+		from erpnext.stock.stock_ledger import repost_future_sle
+
+		start_date = add_days(nowdate(), -cint(self.config.days))
+
+		for idx in range(cint(self.config.backdated_entries)):
+			args = frappe._dict(
+				purpose="Material Receipt",
+				item_code=self.random.choice(self.items),
+				qty=self.random.randint(1, 10),
+				to_warehouse=self.random.choice(self.warehouses),
+				rate=self.random.randint(50, 150),
+			)
+
+			with self.measure("submit_backdated_entry"):
+				stock_entry = self.make_stock_entry(args, add_days(start_date, -1 - idx), "00:00:00")
+
+			with self.measure("repost_future_sle"):
+				repost_future_sle(
+					voucher_type=stock_entry.doctype,
+					voucher_no=stock_entry.name,
+					allow_negative_stock=True,
+				)
+
+	def cancel_entries(self):
+		"""Cancel the latest entries, the stock of the item-warehouses is kept positive."""
+		cancellations = min(cint(self.config.cancellations), len(self.vouchers))
+		for stock_entry in reversed(self.vouchers[len(self.vouchers) - cancellations :]):
+			stock_entry.reload()
+
+			with self.measure("cancel_" + frappe.scrub(stock_entry.purpose)):
+				stock_entry.cancel()
+
+	def delete_repost_entries(self):
+		"""Delete the Repost Item Valuations queued for the generated stock entries and items, so that they
+		are not processed once the data is kept."""
+		riv = frappe.qb.DocType("Repost Item Valuation")
+
+		conditions = []
+		if self.voucher_nos:
+			conditions.append((riv.voucher_type == "Stock Entry") & riv.voucher_no.isin(self.voucher_nos))
+		if self.items:
+			conditions.append(riv.item_code.isin(self.items))
+
+		if conditions:
+			frappe.qb.from_(riv).delete().where(Criterion.any(conditions)).run()
+
+	def benchmark_valuation(self):
+		"""In-memory FIFO, LIFO and Moving Average valuation without the database."""
+		operations = [
+			(self.random.randint(1, 10), self.random.randint(50, 150))
+			for _i in range(cint(self.config.valuation_operations))
+		]
+
+		for label, valuation_class in (("valuation_fifo", FIFOValuation), ("valuation_lifo", LIFOValuation)):
+			with self.measure(label, count=len(operations)):
+				valuation = valuation_class([])
+				for idx, (qty, rate) in enumerate(operations):
+					if idx % 3 == 2:
+						valuation.remove_stock(qty)
+					else:
+						valuation.add_stock(qty, rate)
+
+					valuation.get_total_stock_and_value()
+
+		with self.measure("valuation_moving_average", count=len(operations)):
+			stock_qty = stock_value = valuation_rate = 0.0
+			for idx, (qty, rate) in enumerate(operations):
+				if idx % 3 == 2:
+					stock_qty -= qty
+					stock_value -= qty * valuation_rate
+				else:
+					stock_qty += qty
+					stock_value += qty * rate
+
+				if stock_qty > 0:
+					valuation_rate = stock_value / stock_qty
+
+	@contextmanager
+	def measure(self, label, count=1):
+		result = self.results.setdefault(
+			label, frappe._dict(count=0, time=0.0, queries=0, max_time=0.0, peak_memory=0)
+		)
+
+		if self.trace_memory:
+			tracemalloc.start()
+			try:
+				yield
+			finally:
+				peak_memory = tracemalloc.get_traced_memory()[1]
+				tracemalloc.stop()
+
+			result.count += count
+			result.peak_memory = max(result.peak_memory, peak_memory)
+			return
+
+		with count_queries() as queries:
+			start = time.perf_counter()
+			try:
+				yield
+			finally:
+				elapsed = time.perf_counter() - start
+
+		result.count += count
+		result.time += elapsed
+		result.max_time = max(result.max_time, elapsed)
+		result.queries += queries.count
+
+	def get_results(self):
+		results = []
+		for label, result in self.results.items():
+			results.append(
+				{
+					"name": label,
+					"count": result.count,
+					"time": flt(result.time, 6),
+					"time_per_operation": flt(result.time / result.count, 6) if result.count else 0.0,
+					"max_time": flt(result.max_time, 6),
+					"queries": result.queries,
+					"queries_per_operation": flt(result.queries / result.count, 2) if result.count else 0.0,
+					"peak_memory": result.peak_memory,
+				}
+			)
+
+		return {
+			"erpnext_version": erpnext.__version__,
+			"frappe_version": frappe.__version__,
+			"site": frappe.local.site,
+			"created": now(),
+			"config": self.config,
+			"results": results,
+		}
+
+
+class QueryCount:
+	count = 0
+
+
+@contextmanager
+def count_queries():
+	"""Count the queries executed through `frappe.db.sql`, including the query builder."""
+	queries = QueryCount()
+	sql = frappe.db.sql
+
+	def counted_sql(*args, **kwargs):
+		queries.count += 1
+		return sql(*args, **kwargs)
+
+	frappe.db.sql = counted_sql
+	try:
+		yield queries
+	finally:
+		del frappe.db.sql
+
+
+def get_posting_time(idx):
+	seconds = idx % 86400
+	return f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+def run_benchmark(config=None, output=None, keep_data=False):
+	"""Run the stock ledger benchmark on the current site and optionally write the results to `output`."""
+
+	# This is to avoid TooManyWritesError for large ledgers
+	frappe.db.MAX_WRITES_PER_TRANSACTION *= 4
+
+	# the same ledger is generated again for the timed run
+	frappe.db.savepoint(MEMORY_RUN_SAVEPOINT)
+	try:
+		memory_results = StockLedgerBenchmark(config, trace_memory=True).run()
+	finally:
+		frappe.db.rollback(save_point=MEMORY_RUN_SAVEPOINT)
+
+	benchmark = StockLedgerBenchmark(config)
+	try:
+		results = benchmark.run()
+	finally:
+		if not keep_data:
+			frappe.db.rollback()
+		elif not frappe.flags.in_test:
+			frappe.db.commit()
+
+	peak_memory = {result["name"]: result["peak_memory"] for result in memory_results["results"]}
+	for result in results["results"]:
+		result["peak_memory"] = peak_memory.get(result["name"], 0)
+
+	if output:
+		with open(output, "w") as f:
+			json.dump(results, f, indent=1, default=str)
+
+	return results
+
+
+def compare_results(baseline, current, threshold=0.1):
+	"""Returns the benchmarks of `current` which are slower or run more queries than `baseline`.
+
+	Both the arguments are the results of `run_benchmark`, `threshold` is the allowed relative increase.
+	"""
+	baseline_results = {d["name"]: d for d in baseline["results"]}
+
+	regressions = []
+	for result in current["results"]:
+		previous = baseline_results.get(result["name"])
+		if not previous:
+			continue
+
+		for key in ("time_per_operation", "queries_per_operation"):
+			if flt(result[key]) > flt(previous[key]) * (1 + threshold):
+				regressions.append(
+					{
+						"name": result["name"],
+						"metric": key,
+						"baseline": previous[key],
+						"current": result[key],
+					}
+				)
+
+	return regressions
@@ -0,0 +1,305 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+"""Current qty and stock value of each batch in each warehouse.
+
+Used by the batch-wise valuation of outward entries, the batch picker and the
+Available Batch Report instead of aggregating all the Serial and Batch Entries
+of the batches.
+
+Each balance also keeps the posting datetime and creation of the latest bundle
+included in it. The balance of a batch is only used for an entry posted after
+that bundle, otherwise the entries are aggregated as before.
+
+The balances of all the items are built in the background once enabled in
+Stock Settings, see `erpnext.utilities.summary_table`, and are kept up to date:
+
+- on submit and cancel of a Serial and Batch Bundle
+- when the stock ledger recalculates the rates of a submitted bundle
+"""
+
+import frappe
+from frappe.model.document import Document
+from frappe.query_builder.functions import CombineDatetime, Max, Sum
+from frappe.utils import create_batch, flt, get_combine_datetime, get_datetime
+
+from erpnext.utilities.summary_table import build_in_batches, is_summary_table_built
+
+ITEM_BATCH_SIZE = 100
+
+
+class BatchWarehouseBalance(Document):
+	# begin: auto-generated types
+	# This code is auto-generated. Do not modify anything in this block.
+
+	from typing import TYPE_CHECKING
+
+	if TYPE_CHECKING:
+		from frappe.types import DF
+
+		batch_no: DF.Link
+		item_code: DF.Link
+		last_creation: DF.Datetime | None
+		last_posting_datetime: DF.Datetime | None
+		last_voucher_detail_no: DF.Data | None
+		qty: DF.Float
+		stock_value: DF.Float
+		warehouse: DF.Link
+	# end: auto-generated types
+
+	pass
+
+
+def on_doctype_update():
+	frappe.db.add_unique(
+		"Batch Warehouse Balance", ["batch_no", "warehouse"], constraint_name="unique_batch_warehouse"
+	)
+
+
+def is_batch_balance_enabled():
+	return frappe.db.get_single_value("Stock Settings", "use_batch_balances")
+
+
+def is_included(bundle):
+	"""Only the bundles considered by the batch-wise valuation are included in the balances."""
+	return bundle.type_of_transaction in ("Inward", "Outward") and bundle.voucher_type != "Pick List"
+
+
+def is_batch_balance_built():
+	return is_batch_balance_enabled() and is_summary_table_built("Batch Warehouse Balance")
+
+
+def get_bundle_batch_values_query():
+	"""Qty and stock value of the submitted bundles grouped by batch and warehouse."""
+	parent = frappe.qb.DocType("Serial and Batch Bundle")
+	child = frappe.qb.DocType("Serial and Batch Entry")
+
+	return (
+		frappe.qb.from_(parent)
+		.inner_join(child)
+		.on(parent.name == child.parent)
+		.select(
+			parent.item_code,
+			child.batch_no,
+			parent.warehouse,
+			Sum(child.qty).as_("qty"),
+			Sum(child.stock_value_difference).as_("stock_value"),
+		)
+		.where(
+			(parent.docstatus == 1)
+			& (parent.is_cancelled == 0)
+			& (parent.type_of_transaction.isin(["Inward", "Outward"]))
+			& (parent.voucher_type != "Pick List")
+			& (child.batch_no.isnotnull())
+		)
+		.groupby(child.batch_no, parent.warehouse)
+	)
+
+
+def build_batch_warehouse_balances():
+	"""Build the balances of all the items, run by `build_summary_table`."""
+	parent = frappe.qb.DocType("Serial and Batch Bundle")
+
+	item_codes = frappe.qb.from_(parent).select(parent.item_code).distinct().where(parent.has_batch_no == 1)
+	build_in_batches(create_batch(sorted(item_codes.run(pluck=True)), ITEM_BATCH_SIZE), insert_batch_balances)
+
+
+def insert_batch_balances(item_codes):
+	"""Rebuild the balances of the items from their Serial and Batch Bundles."""
+	parent = frappe.qb.DocType("Serial and Batch Bundle")
+
+	frappe.db.delete("Batch Warehouse Balance", {"item_code": ("in", item_codes)})
+
+	query = (
+		get_bundle_batch_values_query()
+		.select(
+			Max(CombineDatetime(parent.posting_date, parent.posting_time)).as_("last_posting_datetime"),
+			Max(parent.creation).as_("last_creation"),
+		)
+		.where(parent.item_code.isin(item_codes))
+	)
+
+	balances = [
+		(
+			frappe.generate_hash(length=10),
+			row.item_code,
+			row.batch_no,
+			row.warehouse,
+			flt(row.qty),
+			flt(row.stock_value),
+			row.last_posting_datetime,
+			row.last_creation,
+		)
+		for row in query.run(as_dict=True)
+	]
+
+	if balances:
+		frappe.db.bulk_insert(
+			"Batch Warehouse Balance",
+			fields=[
+				"name",
+				"item_code",
+				"batch_no",
+				"warehouse",
+				"qty",
+				"stock_value",
+				"last_posting_datetime",
+				"last_creation",
+			],
+			values=balances,
+		)
+
+
+def get_bundle_batch_values(bundle) -> dict:
+	"""Returns the qty and stock value of each batch of the bundle."""
+	batch_values = {}
+	for row in bundle.entries:
+		if not row.batch_no:
+			continue
+
+		values = batch_values.setdefault(row.batch_no, frappe._dict(qty=0.0, stock_value=0.0))
+		values.qty += flt(row.qty)
+		values.stock_value += flt(row.stock_value_difference)
+
+	return batch_values
+
+
+def update_batch_balances(bundle, cancel=False):
+	"""Add the batches of a submitted bundle to the balances, or remove them once it is cancelled."""
+	if not is_batch_balance_enabled() or not is_included(bundle):
+		return
+
+	sign = -1 if cancel else 1
+	for batch_no, values in get_bundle_batch_values(bundle).items():
+		add_to_batch_balance(
+			bundle, batch_no, sign * values.qty, sign * values.stock_value, update_last_entry=not cancel
+		)
+
+
+def update_batch_balance_values(bundle, previous_values):
+	"""Apply the change in qty and stock value of a submitted bundle after its rates are recalculated,
+	`previous_values` are the values of the bundle before the change."""
+	if previous_values is None or bundle.docstatus != 1 or not is_included(bundle):
+		return
+
+	for batch_no, values in get_bundle_batch_values(bundle).items():
+		previous = previous_values.get(batch_no) or frappe._dict(qty=0.0, stock_value=0.0)
+
+		qty = values.qty - previous.qty
+		stock_value = values.stock_value - previous.stock_value
+		if qty or stock_value:
+			add_to_batch_balance(bundle, batch_no, qty, stock_value)
+
+
+def add_to_batch_balance(bundle, batch_no, qty, stock_value, update_last_entry=False):
+	balance = frappe.db.get_value(
+		"Batch Warehouse Balance",
+		{"batch_no": batch_no, "warehouse": bundle.warehouse},
+		["name", "qty", "stock_value", "last_posting_datetime", "last_creation"],
+		as_dict=True,
+		for_update=True,
+	)
+
+	values = {"qty": qty, "stock_value": stock_value}
+	if update_last_entry and bundle.posting_date:
+		last_entry = (
+			get_combine_datetime(bundle.posting_date, bundle.posting_time),
+			get_datetime(bundle.creation),
+		)
+
+		if not balance or not balance.last_posting_datetime or last_entry >= get_last_entry(balance):
+			values.update(
+				{
+					"last_posting_datetime": last_entry[0],
+					"last_creation": last_entry[1],
+					"last_voucher_detail_no": bundle.voucher_detail_no,
+				}
+			)
+
+	if not balance:
+		frappe.get_doc(
+			{
+				"doctype": "Batch Warehouse Balance",
+				"item_code": bundle.item_code,
+				"batch_no": batch_no,
+				"warehouse": bundle.warehouse,
+				**values,
+			}
+		).db_insert()
+		return
+
+	values["qty"] = flt(balance.qty) + qty
+	values["stock_value"] = flt(balance.stock_value) + stock_value
+	frappe.db.set_value("Batch Warehouse Balance", balance.name, values, update_modified=False)
+
+
+def get_last_entry(balance):
+	return get_datetime(balance.last_posting_datetime), get_datetime(balance.last_creation)
+
+
+def get_batch_balances(warehouse, batch_nos) -> dict:
+	"""Returns the balances of the batches in the warehouse, the rows are locked till the end of the
+	transaction like the bundles in the batch-wise valuation."""
+	table = frappe.qb.DocType("Batch Warehouse Balance")
+
+	query = (
+		frappe.qb.from_(table)
+		.select(
+			table.batch_no,
+			table.qty,
+			table.stock_value,
+			table.last_posting_datetime,
+			table.last_creation,
+			table.last_voucher_detail_no,
+		)
+		.where((table.warehouse == warehouse) & (table.batch_no.isin(batch_nos)))
+		.for_update()
+	)
+
+	return {row.batch_no: row for row in query.run(as_dict=True)}
+
+
+def is_balance_before_entry(balance, posting_datetime=None, creation=None, voucher_detail_no=None):
+	"""Returns True if all the bundles included in the balance are posted before the entry.
+
+	A bundle of the same posting datetime is before the entry if it was created earlier. The
+	latest bundle can also be of the entry itself, which is excluded by the caller."""
+	if not posting_datetime:
+		return True
+
+	if not balance.last_posting_datetime:
+		return False
+
+	posting_datetime = get_datetime(posting_datetime)
+	last_posting_datetime, last_creation = get_last_entry(balance)
+	if last_posting_datetime != posting_datetime:
+		return last_posting_datetime < posting_datetime
+
+	if not creation:
+		return False
+
+	creation = get_datetime(creation)
+	if last_creation == creation:
+		return bool(voucher_detail_no and balance.last_voucher_detail_no == voucher_detail_no)
+
+	return last_creation < creation
+
+
+def get_voucher_batch_values(item_code, warehouse, batch_nos, voucher_detail_no=None, voucher_no=None):
+	"""Returns the qty and stock value of the batches included in the balances by the voucher."""
+	if not (voucher_detail_no or voucher_no):
+		return {}
+
+	parent = frappe.qb.DocType("Serial and Batch Bundle")
+	child = frappe.qb.DocType("Serial and Batch Entry")
+
+	query = get_bundle_batch_values_query().where(
+		(parent.item_code == item_code) & (parent.warehouse == warehouse) & (child.batch_no.isin(batch_nos))
+	)
+
+	if voucher_detail_no:
+		query = query.where(parent.voucher_detail_no == voucher_detail_no)
+	else:
+		query = query.where(parent.voucher_no == voucher_no)
+
+	return {row.batch_no: row for row in query.run(as_dict=True)}
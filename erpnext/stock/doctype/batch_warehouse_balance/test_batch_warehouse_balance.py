@@ -0,0 +1,64 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase, change_settings
+from frappe.utils import flt
+
+from erpnext.controllers.queries import get_batch_no
+from erpnext.stock.doctype.batch_warehouse_balance.batch_warehouse_balance import (
+	build_batch_warehouse_balances,
+)
+from erpnext.stock.doctype.item.test_item import make_item
+from erpnext.stock.doctype.serial_and_batch_bundle.test_serial_and_batch_bundle import (
+	get_batch_from_bundle,
+)
+from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
+
+
+class TestBatchWarehouseBalance(FrappeTestCase):
+	def get_balance(self, batch_no, warehouse):
+		balance = frappe.db.get_value(
+			"Batch Warehouse Balance",
+			{"batch_no": batch_no, "warehouse": warehouse},
+			["qty", "stock_value"],
+			as_dict=True,
+		)
+
+		return flt(balance.qty), flt(balance.stock_value, 2)
+
+	@change_settings("Stock Settings", {"use_batch_balances": 1})
+	def test_batch_balance(self):
+		item_code = make_item(
+			"_Test Batch Warehouse Balance Item",
+			{
+				"is_stock_item": 1,
+				"has_batch_no": 1,
+				"create_new_batch": 1,
+				"batch_number_series": "TBWB-.#####",
+			},
+		).name
+		warehouse = "_Test Warehouse - _TC"
+
+		se = make_stock_entry(item_code=item_code, to_warehouse=warehouse, qty=10, rate=100)
+		batch_no = get_batch_from_bundle(se.items[0].serial_and_batch_bundle)
+		make_stock_entry(item_code=item_code, to_warehouse=warehouse, qty=10, rate=200, batch_no=batch_no)
+		self.assertEqual(self.get_balance(batch_no, warehouse), (20, 3000))
+
+		# outward entry is valued from the balance, excluding the entry itself
+		se = make_stock_entry(item_code=item_code, from_warehouse=warehouse, qty=5, batch_no=batch_no)
+		stock_value_difference = frappe.db.get_value(
+			"Stock Ledger Entry", {"voucher_no": se.name, "is_cancelled": 0}, "stock_value_difference"
+		)
+		self.assertEqual(flt(stock_value_difference, 2), -750)
+		self.assertEqual(self.get_balance(batch_no, warehouse), (15, 2250))
+
+		batches = get_batch_no("Batch", "", "name", 0, 10, {"item_code": item_code, "warehouse": warehouse})
+		self.assertEqual([(d[0], d[1]) for d in batches], [(batch_no, 15)])
+
+		se.cancel()
+		self.assertEqual(self.get_balance(batch_no, warehouse), (20, 3000))
+
+		# built again from the bundles
+		build_batch_warehouse_balances()
+		self.assertEqual(self.get_balance(batch_no, warehouse), (20, 3000))
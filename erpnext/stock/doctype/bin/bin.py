@@ -256,12 +256,16 @@ def get_bin_details(bin_name):
 	)
 
 
-def update_qty(bin_name, args):
+def update_qty(bin_name, args, values=None):
+	"""Update the qty of the bin, `values` are the actual qty, stock value and valuation rate
+	computed by the stock ledger which are written along with the qty."""
 	from erpnext.controllers.stock_controller import future_sle_exists
 
+	values = values or {}
+
 	bin_details = get_bin_details(bin_name)
 	# actual qty is already updated by processing current voucher
-	actual_qty = bin_details.actual_qty or 0.0
+	actual_qty = values.get("actual_qty", bin_details.actual_qty) or 0.0
 
 	# actual qty is not up to date in case of backdated transaction
 	if future_sle_exists(args):
@@ -288,6 +292,7 @@ def update_qty(bin_name, args):
 		"Bin",
 		bin_name,
 		{
+			**values,
 			"actual_qty": actual_qty,
 			"ordered_qty": ordered_qty,
 			"reserved_qty": reserved_qty,
@@ -5,6 +5,7 @@ import frappe
 from frappe.tests.utils import FrappeTestCase
 
 from erpnext.stock.doctype.item.test_item import make_item
+from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
 from erpnext.stock.utils import _create_bin
 
 
@@ -32,3 +33,33 @@ class TestBin(FrappeTestCase):
 		indexes = frappe.db.sql("show index from tabBin where Non_unique = 0", as_dict=1)
 		if not any(index.get("Key_name") == "unique_item_warehouse" for index in indexes):
 			self.fail("Expected unique index on item-warehouse")
+
+	def test_bin_updated_once_for_multiple_rows(self):
+		item_code = make_item("_Test Bin Multiple Rows Item", {"is_stock_item": 1}).name
+		warehouse = "_Test Warehouse - _TC"
+
+		se = make_stock_entry(item_code=item_code, to_warehouse=warehouse, qty=5, rate=100, do_not_save=True)
+		se.append("items", {**se.items[0].as_dict(), "name": None, "idx": None, "qty": 3, "basic_rate": 200})
+		se.insert()
+		se.submit()
+
+		bin = frappe.db.get_value(
+			"Bin",
+			{"item_code": item_code, "warehouse": warehouse},
+			["actual_qty", "stock_value", "valuation_rate", "projected_qty"],
+			as_dict=True,
+		)
+		self.assertEqual(bin.actual_qty, 8)
+		self.assertEqual(bin.projected_qty, 8)
+		self.assertEqual(bin.stock_value, 1100)
+		self.assertEqual(bin.valuation_rate, 137.5)
+
+		se.cancel()
+		bin = frappe.db.get_value(
+			"Bin",
+			{"item_code": item_code, "warehouse": warehouse},
+			["actual_qty", "stock_value"],
+			as_dict=True,
+		)
+		self.assertEqual(bin.actual_qty, 0)
+		self.assertEqual(bin.stock_value, 0)
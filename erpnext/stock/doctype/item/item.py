@@ -33,6 +33,7 @@ from erpnext.controllers.item_variant import (
 	validate_item_variant_attributes,
 )
 from erpnext.stock.doctype.item_default.item_default import ItemDefault
+from erpnext.stock.doctype.item_price.item_price_cache import clear_item_price_cache
 from erpnext.stock.utils import get_valuation_method
 
 
@@ -546,6 +547,7 @@ class Item(Document):
 	def on_trash(self):
 		frappe.db.sql("""delete from tabBin where item_code=%s""", self.name)
 		frappe.db.sql("delete from `tabItem Price` where item_code=%s", self.name)
+		clear_item_price_cache(item_codes=[self.name])
 		for variant_of in frappe.get_all("Item", filters={"variant_of": self.name}):
 			frappe.delete_doc("Item", variant_of.name)
 
@@ -568,6 +570,7 @@ class Item(Document):
 			)
 
 		frappe.db.set_value("Item", new_name, "item_code", new_name)
+		clear_item_price_cache(item_codes=[old_name, new_name])
 
 		if merge:
 			self.set_last_purchase_rate(new_name)
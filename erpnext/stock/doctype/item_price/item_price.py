@@ -8,6 +8,8 @@ from frappe.model.document import Document
 from frappe.query_builder import Criterion
 from frappe.query_builder.functions import Cast_
 
+from erpnext.stock.doctype.item_price.item_price_cache import clear_item_price_cache
+
 
 class ItemPriceDuplicateItem(frappe.ValidationError):
 	pass
@@ -138,6 +140,18 @@ class ItemPrice(Document):
 				ItemPriceDuplicateItem,
 			)
 
+	def clear_cache(self):
+		clear_item_price_cache(self.price_list, [self.item_code])
+
+		doc_before_save = self.get_doc_before_save()
+		if doc_before_save and (doc_before_save.price_list, doc_before_save.item_code) != (
+			self.price_list,
+			self.item_code,
+		):
+			clear_item_price_cache(doc_before_save.price_list, [doc_before_save.item_code])
+
+		return super().clear_cache()
+
 	def before_save(self):
 		if self.selling:
 			self.reference = self.customer
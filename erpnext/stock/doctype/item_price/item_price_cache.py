@@ -0,0 +1,168 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# License: GNU General Public License v3. See license.txt
+
+"""Cache of the Item Prices of each item and price list.
+
+Used by `get_item_price` to resolve the price of an item without querying the Item Prices on each line.
+All the Item Prices of an item in a price list are cached together, and the ones matching the UOM,
+party, batch and transaction date of the line are picked from them, so the validity of the prices is
+checked on each lookup.
+
+The Item Prices of an item are removed from the cache once one of them is changed, and all the Item
+Prices of a price list once the Price List is changed. They are removed again once the transaction is
+committed or rolled back, as another process may have cached them in the meantime. A process reading
+the old prices before the commit may still cache them after it, so the cached prices also expire after
+an hour.
+
+The hits and misses of the cache are counted by each process and added to the metrics in redis every
+`METRICS_FLUSH_SIZE` lookups, so that a lookup does not write to redis.
+"""
+
+from collections import Counter, defaultdict
+
+import frappe
+
+from erpnext.accounts.doctype.pricing_rule.pricing_rule_index import casefold
+
+CACHE_KEY = "item_price_cache"
+CACHE_TTL = 60 * 60  # seconds
+
+METRICS_KEY = "item_price_cache_metrics"
+METRICS_FLUSH_SIZE = 100  # lookups
+
+# hits and misses of each site not yet added to the metrics in redis
+_metrics = defaultdict(Counter)
+
+ITEM_PRICE_FIELDS = [
+	"name",
+	"price_list_rate",
+	"uom",
+	"item_code",
+	"batch_no",
+	"customer",
+	"supplier",
+	"valid_from",
+	"valid_upto",
+	"packing_unit",
+]
+
+
+def is_item_price_cache_enabled():
+	return frappe.db.get_single_value("Stock Settings", "use_item_price_cache")
+
+
+def get_item_prices(item_codes, price_list) -> dict:
+	"""Returns the Item Prices of the items in the price list, by casefolded item code."""
+	ip = frappe.qb.DocType("Item Price")
+	item_prices = (
+		frappe.qb.from_(ip)
+		.select(*(ip[fieldname] for fieldname in ITEM_PRICE_FIELDS))
+		.where(ip.item_code.isin(item_codes) & (ip.price_list == price_list))
+	).run(as_dict=True)
+
+	out = defaultdict(list)
+	for item_price in item_prices:
+		out[casefold(item_price.item_code)].append(item_price)
+
+	return out
+
+
+def get_cache_key(price_list, item_code=""):
+	# case-insensitive like the names in the database, so that the prices are cleared whatever the case
+	return f"{CACHE_KEY}:{casefold(price_list)}:{casefold(item_code)}"
+
+
+def get_cached_item_prices(item_code, price_list) -> list:
+	"""Returns the Item Prices of the item in the price list, cached until one of them is changed."""
+	key = get_cache_key(price_list, item_code)
+
+	item_prices = frappe.cache.get_value(key)
+	update_metrics("hits" if item_prices is not None else "misses")
+
+	if item_prices is None:
+		item_prices = get_item_prices([item_code], price_list).get(casefold(item_code), [])
+		frappe.cache.set_value(key, item_prices, expires_in_sec=CACHE_TTL)
+
+	return item_prices
+
+
+def update_metrics(metric):
+	metrics = _metrics[frappe.local.site]
+	metrics[metric] += 1
+
+	if metrics.total() >= METRICS_FLUSH_SIZE:
+		flush_metrics()
+
+
+def flush_metrics():
+	"""Add the hits and misses counted by this process to the metrics in redis."""
+	if metrics := _metrics.pop(frappe.local.site, None):
+		key = frappe.cache.make_key(METRICS_KEY)
+		for metric, count in metrics.items():
+			frappe.cache.hincrby(key, metric, count)
+
+
+@frappe.whitelist()
+def get_item_price_cache_metrics() -> dict:
+	"""Returns the hits and misses of the cache since it was last reset. The lookups of the other
+	processes since their last `METRICS_FLUSH_SIZE` lookups are not included yet."""
+	frappe.only_for("System Manager")
+	flush_metrics()
+
+	hits, misses = (
+		int(value or 0)
+		for value in frappe.cache.hmget(frappe.cache.make_key(METRICS_KEY), ["hits", "misses"])
+	)
+
+	return {
+		"hits": hits,
+		"misses": misses,
+		"hit_ratio": hits / (hits + misses) if hits + misses else 0.0,
+	}
+
+
+@frappe.whitelist()
+def reset_item_price_cache_metrics():
+	frappe.only_for("System Manager")
+	_metrics.pop(frappe.local.site, None)
+	frappe.cache.delete_value(METRICS_KEY)
+
+
+def clear_item_price_cache(price_list=None, item_codes=None):
+	"""Remove the Item Prices of the items, or all the items, in the price list, or all the price lists.
+
+	Cleared while the cache is disabled too, so that it is up to date once enabled again."""
+	_clear_item_price_cache(price_list, item_codes)
+
+	# cleared again once per transaction, however many prices are changed in it
+	if frappe.flags.item_price_cache_to_clear is None:
+		frappe.flags.item_price_cache_to_clear = []
+		frappe.db.after_commit.add(clear_item_price_cache_after_transaction)
+		frappe.db.after_rollback.add(clear_item_price_cache_after_transaction)
+
+	frappe.flags.item_price_cache_to_clear.append((price_list, item_codes))
+
+
+def clear_item_price_cache_after_transaction():
+	to_clear = frappe.flags.item_price_cache_to_clear or []
+	frappe.flags.item_price_cache_to_clear = None
+
+	for price_list, item_codes in to_clear:
+		_clear_item_price_cache(price_list, item_codes)
+
+
+def _clear_item_price_cache(price_list=None, item_codes=None):
+	if not price_list:
+		price_lists = frappe.get_all("Price List", pluck="name") if item_codes else None
+	else:
+		price_lists = [price_list]
+
+	if price_lists is None:
+		frappe.cache.delete_keys(f"{CACHE_KEY}:")
+		return
+
+	for price_list in price_lists:
+		if item_codes:
+			frappe.cache.delete_value([get_cache_key(price_list, item_code) for item_code in item_codes])
+		else:
+			frappe.cache.delete_keys(get_cache_key(price_list))
@@ -4,9 +4,15 @@
 
 import frappe
 from frappe.test_runner import make_test_records_for_doctype
-from frappe.tests.utils import FrappeTestCase
+from frappe.tests.utils import FrappeTestCase, change_settings
 
 from erpnext.stock.doctype.item_price.item_price import ItemPriceDuplicateItem
+from erpnext.stock.doctype.item_price.item_price_cache import (
+	clear_item_price_cache,
+	get_cache_key,
+	get_item_price_cache_metrics,
+	reset_item_price_cache_metrics,
+)
 from erpnext.stock.get_item_details import get_price_list_rate_for, process_args
 
 
@@ -152,6 +158,44 @@ class TestItemPrice(FrappeTestCase):
 		price = get_price_list_rate_for(args, doc.item_code)
 		self.assertEqual(price, 10)
 
+	@change_settings("Stock Settings", {"use_item_price_cache": 1})
+	def test_item_price_cache(self):
+		doc = frappe.copy_doc(test_records[2])
+
+		args = {
+			"price_list": doc.price_list,
+			"customer": "_Test Customer",
+			"uom": "_Test UOM",
+			"transaction_date": "2017-04-18",
+			"qty": 7,
+		}
+
+		# the Item Prices were deleted without clearing the cache in setUp
+		clear_item_price_cache()
+		reset_item_price_cache_metrics()
+
+		self.assertEqual(get_price_list_rate_for(args, doc.item_code), 20)
+		self.assertIsNotNone(frappe.cache.get_value(get_cache_key(doc.price_list, doc.item_code)))
+		self.assertEqual(get_price_list_rate_for(args, doc.item_code), 20)
+
+		metrics = get_item_price_cache_metrics()
+		self.assertEqual(metrics["misses"], 1)
+		self.assertGreaterEqual(metrics["hits"], 1)
+
+		# validity of the cached prices is checked on each lookup
+		self.assertEqual(
+			get_price_list_rate_for({**args, "transaction_date": "2017-04-27"}, doc.item_code), None
+		)
+
+		item_price = frappe.get_doc(
+			"Item Price",
+			{"item_code": doc.item_code, "price_list": doc.price_list, "customer": "_Test Customer"},
+		)
+		item_price.price_list_rate = 25
+		item_price.save()
+
+		self.assertEqual(get_price_list_rate_for(args, doc.item_code), 25)
+
 	def test_invalid_item(self):
 		doc = frappe.copy_doc(test_records[1])
 		# Enter invalid item code
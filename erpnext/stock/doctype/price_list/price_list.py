@@ -7,6 +7,8 @@ from frappe import _, throw
 from frappe.model.document import Document
 from frappe.utils import cint
 
+from erpnext.stock.doctype.item_price.item_price_cache import clear_item_price_cache
+
 
 class PriceList(Document):
 	# begin: auto-generated types
@@ -70,6 +72,7 @@ class PriceList(Document):
 
 	def delete_price_list_details_key(self):
 		frappe.cache().hdel("price_list_details", self.name)
+		clear_item_price_cache(self.name)
 
 
 def get_price_list_details(price_list):
@@ -9,6 +9,7 @@ from frappe.model.document import Document
 from frappe.query_builder import DocType, Interval
 from frappe.query_builder.functions import Max, Now
 from frappe.utils import cint, get_link_to_form, get_weekday, getdate, now, nowtime
+from frappe.utils.background_jobs import is_job_enqueued
 from frappe.utils.user import get_users_with_role
 from rq.timeouts import JobTimeoutException
 
@@ -16,8 +17,12 @@ import erpnext
 from erpnext.accounts.general_ledger import validate_accounting_period
 from erpnext.accounts.utils import get_future_stock_vouchers, repost_gle_for_stock_vouchers
 from erpnext.stock.stock_ledger import (
+	create_json_gz_file,
 	get_affected_transactions,
 	get_items_to_be_repost,
+	get_reposting_data,
+	get_reposting_file_name,
+	get_reposting_partitions,
 	repost_future_sle,
 )
 
@@ -280,14 +285,22 @@ def repost(doc):
 		# This is to avoid TooManyWritesError in case of large reposts
 		frappe.db.MAX_WRITES_PER_TRANSACTION *= 4
 
+		# the last partition of a parallel repost may have completed it since the document was loaded
+		status = frappe.db.get_value(doc.doctype, doc.name, "status", for_update=True)
+		if status not in ("Queued", "In Progress"):
+			return
+
 		doc.set_status("In Progress")
 		if not frappe.flags.in_test:
 			frappe.db.commit()
 
-		if doc.recreate_stock_ledgers:
+		if doc.recreate_stock_ledgers and not doc.reposting_data_file:
 			doc.recreate_stock_ledger_entries()
 
-		repost_sl_entries(doc)
+		if not repost_sl_entries(doc):
+			# partitions are still being reposted by background jobs, or another job completed the repost
+			return
+
 		repost_gl_entries(doc)
 
 		doc.set_status("Completed")
@@ -295,47 +308,51 @@ def repost(doc):
 		remove_attached_file(doc.name)
 
 	except Exception as e:
-		if frappe.flags.in_test:
-			# Don't silently fail in tests,
-			# there is no reason for reposts to fail in CI
-			raise
+		handle_repost_error(doc, e)
+	finally:
+		if not frappe.flags.in_test:
+			frappe.db.commit()
 
-		frappe.db.rollback()
-		traceback = frappe.get_traceback(with_context=True)
-		doc.log_error("Unable to repost item valuation")
 
-		message = frappe.message_log.pop() if frappe.message_log else ""
-		if isinstance(message, dict):
-			message = message.get("message")
+def handle_repost_error(doc, e):
+	if frappe.flags.in_test:
+		# Don't silently fail in tests,
+		# there is no reason for reposts to fail in CI
+		raise
 
-		status = "Failed"
-		# If failed because of timeout, set status to In Progress
-		if traceback and ("timeout" in traceback.lower() or "Deadlock found" in traceback):
-			status = "In Progress"
+	frappe.db.rollback()
+	traceback = frappe.get_traceback(with_context=True)
+	doc.log_error("Unable to repost item valuation")
 
-		if traceback:
-			message += "<br><br>" + "<b>Traceback:</b> <br>" + traceback
+	message = frappe.message_log.pop() if frappe.message_log else ""
+	if isinstance(message, dict):
+		message = message.get("message")
 
-		frappe.db.set_value(
-			doc.doctype,
-			doc.name,
-			{
-				"error_log": message,
-				"status": status,
-			},
-		)
+	status = "Failed"
+	# If failed because of timeout, set status to In Progress
+	if traceback and ("timeout" in traceback.lower() or "Deadlock found" in traceback):
+		status = "In Progress"
 
-		if status == "Failed":
-			outgoing_email_account = frappe.get_cached_value(
-				"Email Account", {"default_outgoing": 1, "enable_outgoing": 1}, "name"
-			)
+	if traceback:
+		message += "<br><br>" + "<b>Traceback:</b> <br>" + traceback
 
-			if outgoing_email_account and not isinstance(e, RecoverableErrors):
-				notify_error_to_stock_managers(doc, message)
-				doc.set_status("Failed")
-	finally:
-		if not frappe.flags.in_test:
-			frappe.db.commit()
+	frappe.db.set_value(
+		doc.doctype,
+		doc.name,
+		{
+			"error_log": message,
+			"status": status,
+		},
+	)
+
+	if status == "Failed":
+		outgoing_email_account = frappe.get_cached_value(
+			"Email Account", {"default_outgoing": 1, "enable_outgoing": 1}, "name"
+		)
+
+		if outgoing_email_account and not isinstance(e, RecoverableErrors):
+			notify_error_to_stock_managers(doc, message)
+			doc.set_status("Failed")
 
 
 def remove_attached_file(docname):
@@ -345,8 +362,13 @@ def remove_attached_file(docname):
 		frappe.delete_doc("File", file_name, ignore_permissions=True, delete_permanently=True, force=True)
 
 
-def repost_sl_entries(doc):
+def repost_sl_entries(doc) -> bool:
+	"""Returns False if the partitions of the repost are still being processed by background jobs, or if
+	the repost was completed by another job."""
 	if doc.based_on == "Transaction":
+		if reposting_data := get_parallel_reposting_data(doc):
+			return repost_partitions(doc, reposting_data)
+
 		repost_future_sle(
 			voucher_type=doc.voucher_type,
 			voucher_no=doc.voucher_no,
@@ -371,6 +393,166 @@ def repost_sl_entries(doc):
 			doc=doc,
 		)
 
+	return True
+
+
+def get_parallel_reposting_data(doc):
+	"""Split the repost into partitions of independent item-warehouses if parallel reposting is enabled."""
+	reposting_data = get_reposting_data(doc.reposting_data_file) if doc.reposting_data_file else {}
+	if reposting_data and reposting_data.partitions:
+		return reposting_data
+
+	# serial reposting has already started
+	if doc.current_index or reposting_data or doc.items_to_be_repost:
+		return
+
+	settings = frappe.get_cached_doc("Stock Reposting Settings")
+	if not settings.parallel_reposting:
+		return
+
+	items_to_be_repost = get_items_to_be_repost(voucher_type=doc.voucher_type, voucher_no=doc.voucher_no)
+	partitions = get_reposting_partitions(items_to_be_repost, cint(settings.max_parallel_repost_jobs) or 4)
+	if len(partitions) < 2:
+		return
+
+	reposting_data = frappe._dict({"partitions": []})
+	for items in partitions:
+		distinct_item_and_warehouse = {}
+		for i, d in enumerate(items):
+			distinct_item_and_warehouse.setdefault(
+				str((d.item_code, d.warehouse)), {"reposting_status": False, "sle": d, "args_idx": i}
+			)
+
+		reposting_data.partitions.append(
+			{
+				"items_to_be_repost": items,
+				"distinct_item_and_warehouse": distinct_item_and_warehouse,
+				"affected_transactions": [],
+				"current_index": 0,
+				"status": "Queued",
+			}
+		)
+
+	doc.reposting_data_file = create_json_gz_file(reposting_data, doc)
+	doc.db_set(
+		{
+			"reposting_data_file": doc.reposting_data_file,
+			"total_reposting_count": len(items_to_be_repost),
+		}
+	)
+
+	if not frappe.flags.in_test:
+		frappe.db.commit()
+
+	return get_reposting_data(doc.reposting_data_file)
+
+
+def repost_partitions(doc, reposting_data) -> bool:
+	pending_partitions = [
+		idx
+		for idx, partition in enumerate(reposting_data.partitions)
+		if partition.get("status") != "Completed"
+	]
+
+	if not pending_partitions:
+		# both the last partition and the scheduler may complete the repost, only one of them reposts the
+		# GL entries
+		if not claim_repost_completion(doc):
+			return False
+
+		# all partitions are reposted, collect the affected transactions for reposting GL entries
+		reposting_data.affected_transactions = list(get_affected_transactions(doc, reposting_data))
+		doc.reposting_data_file = create_json_gz_file(
+			reposting_data, doc, get_reposting_file_name(doc.doctype, doc.name)
+		)
+		doc.db_set("reposting_data_file", doc.reposting_data_file)
+		return True
+
+	for partition_idx in pending_partitions:
+		job_id = f"repost_item_valuation::{doc.name}::{partition_idx}"
+		if frappe.flags.in_test:
+			repost_partition(doc.name, partition_idx, finalize=False)
+		elif not is_job_enqueued(job_id):
+			frappe.enqueue(
+				repost_partition,
+				queue="long",
+				timeout=7200,
+				job_id=job_id,
+				docname=doc.name,
+				partition_idx=partition_idx,
+			)
+
+	if frappe.flags.in_test:
+		return repost_partitions(doc, get_reposting_data(doc.reposting_data_file))
+
+	return False
+
+
+def claim_repost_completion(doc) -> bool:
+	"""Mark the repost as Completed, returns False if it was not In Progress anymore.
+
+	The row lock is held until the claim is committed, so a concurrent claim waits for it and then finds
+	the repost Completed. If reposting the GL entries fails, `handle_repost_error` sets the status again."""
+	if frappe.db.get_value(doc.doctype, doc.name, "status", for_update=True) != "In Progress":
+		return False
+
+	doc.set_status("Completed")
+	return True
+
+
+def has_pending_partitions(doc) -> bool:
+	"""Returns True if the repost has partitions being reposted by background jobs, or is yet to be
+	completed once they are."""
+	status, reposting_data_file = frappe.db.get_value(
+		doc.doctype, doc.name, ["status", "reposting_data_file"]
+	)
+	if status != "In Progress" or not reposting_data_file:
+		return False
+
+	return bool(get_reposting_data(reposting_data_file).get("partitions"))
+
+
+def repost_partition(docname, partition_idx, finalize=True):
+	"""Repost one partition of a parallel repost, the last partition to finish completes the repost."""
+	doc = frappe.get_doc("Repost Item Valuation", docname)
+	try:
+		frappe.flags.through_repost_item_valuation = True
+
+		# This is to avoid TooManyWritesError in case of large reposts
+		frappe.db.MAX_WRITES_PER_TRANSACTION *= 4
+
+		repost_future_sle(
+			voucher_type=doc.voucher_type,
+			voucher_no=doc.voucher_no,
+			allow_negative_stock=doc.allow_negative_stock,
+			via_landed_cost_voucher=doc.via_landed_cost_voucher,
+			doc=doc,
+			partition_idx=partition_idx,
+		)
+
+		# lock the entry, partitions of the same repost share the reposting file
+		frappe.db.get_value(doc.doctype, doc.name, "name", for_update=True)
+		doc.reposting_data_file = frappe.db.get_value(doc.doctype, doc.name, "reposting_data_file")
+
+		reposting_data = get_reposting_data(doc.reposting_data_file)
+		reposting_data.partitions[partition_idx]["status"] = "Completed"
+		doc.reposting_data_file = create_json_gz_file(
+			reposting_data, doc, get_reposting_file_name(doc.doctype, doc.name)
+		)
+		doc.db_set("reposting_data_file", doc.reposting_data_file)
+
+		if not frappe.flags.in_test:
+			frappe.db.commit()
+
+		if finalize and all(d.get("status") == "Completed" for d in reposting_data.partitions):
+			repost(doc)
+
+	except Exception as e:
+		handle_repost_error(doc, e)
+	finally:
+		if not frappe.flags.in_test:
+			frappe.db.commit()
+
 
 def repost_gl_entries(doc):
 	if not cint(erpnext.is_perpetual_inventory_enabled(doc.company)):
@@ -464,6 +646,11 @@ def repost_entries():
 			repost(doc)
 			doc.deduplicate_similar_repost()
 
+			if has_pending_partitions(doc):
+				# the next reposts may include the item-warehouses of the partitions, they are reposted
+				# on a later run once this one is completed, in the order of posting
+				break
+
 	riv_entries = get_repost_item_valuation_entries()
 	if riv_entries:
 		return
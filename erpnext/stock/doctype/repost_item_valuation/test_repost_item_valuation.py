@@ -14,6 +14,8 @@ from erpnext.controllers.stock_controller import create_item_wise_repost_entries
 from erpnext.stock.doctype.item.test_item import make_item
 from erpnext.stock.doctype.purchase_receipt.test_purchase_receipt import make_purchase_receipt
 from erpnext.stock.doctype.repost_item_valuation.repost_item_valuation import (
+	claim_repost_completion,
+	has_pending_partitions,
 	in_configured_timeslot,
 )
 from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
@@ -458,3 +460,201 @@ class TestRepostItemValuation(FrappeTestCase, StockTestMixin):
 						"name",
 					)
 				)
+
+	@change_settings("Stock Reposting Settings", {"bulk_sle_write_back": 1, "sle_write_back_batch_size": 2})
+	def test_bulk_sle_write_back(self):
+		item_code = make_item(
+			"_Test Bulk SLE Write Back Item", properties={"is_stock_item": 1, "valuation_method": "FIFO"}
+		).name
+		warehouse = "_Test Warehouse - _TC"
+
+		for rate in (100, 200, 300):
+			make_purchase_receipt(item_code=item_code, warehouse=warehouse, qty=5, rate=rate)
+
+		# backdated entry, reposts the future entries in batches of 2
+		make_purchase_receipt(
+			item_code=item_code,
+			warehouse=warehouse,
+			qty=5,
+			rate=50,
+			posting_date=add_days(today(), days=-1),
+		)
+
+		sles = frappe.get_all(
+			"Stock Ledger Entry",
+			filters={"item_code": item_code, "warehouse": warehouse, "is_cancelled": 0},
+			fields=["qty_after_transaction", "stock_value", "stock_queue"],
+			order_by="posting_datetime, creation",
+		)
+
+		self.assertEqual([sle.qty_after_transaction for sle in sles], [5, 10, 15, 20])
+		self.assertEqual([sle.stock_value for sle in sles], [250, 750, 1750, 3250])
+		self.assertEqual(frappe.parse_json(sles[-1].stock_queue), [[5, 50], [5, 100], [5, 200], [5, 300]])
+
+	def test_reposting_partitions(self):
+		from erpnext.stock.stock_ledger import get_reposting_partitions
+
+		item_a = make_item("_Test Repost Partition Item A", properties={"is_stock_item": 1}).name
+		item_b = make_item("_Test Repost Partition Item B", properties={"is_stock_item": 1}).name
+		warehouse = "_Test Warehouse - _TC"
+		target_warehouse = "_Test Warehouse 1 - _TC"
+
+		for item_code in (item_a, item_b):
+			make_stock_entry(item_code=item_code, to_warehouse=warehouse, qty=10, rate=100)
+
+		# transfer links both the warehouses of item A
+		make_stock_entry(item_code=item_a, from_warehouse=warehouse, to_warehouse=target_warehouse, qty=5)
+
+		posting_date = add_days(today(), days=-1)
+		items_to_be_repost = [
+			frappe._dict(
+				item_code=item_code, warehouse=wh, posting_date=posting_date, posting_time="00:00:00"
+			)
+			for item_code, wh in ((item_a, warehouse), (item_b, warehouse), (item_a, target_warehouse))
+		]
+
+		partitions = get_reposting_partitions(items_to_be_repost)
+		self.assertEqual(len(partitions), 2)
+		self.assertIn([items_to_be_repost[0], items_to_be_repost[2]], partitions)
+		self.assertIn([items_to_be_repost[1]], partitions)
+
+		self.assertEqual(len(get_reposting_partitions(items_to_be_repost, max_partitions=1)), 1)
+
+	@change_settings("Stock Reposting Settings", {"item_based_reposting": 0, "parallel_reposting": 1})
+	def test_parallel_reposting(self):
+		item_a = make_item("_Test Parallel Repost Item A", properties={"is_stock_item": 1}).name
+		item_b = make_item("_Test Parallel Repost Item B", properties={"is_stock_item": 1}).name
+		warehouse = "_Test Warehouse - _TC"
+
+		for item_code in (item_a, item_b):
+			make_purchase_receipt(item_code=item_code, warehouse=warehouse, qty=5, rate=100)
+
+		# backdated receipt of both the items, reposted as two partitions
+		pr = make_purchase_receipt(
+			item_code=item_a,
+			warehouse=warehouse,
+			qty=5,
+			rate=50,
+			posting_date=add_days(today(), days=-1),
+			do_not_submit=True,
+		)
+		pr.append(
+			"items",
+			{**pr.items[0].as_dict(), "name": None, "idx": None, "item_code": item_b, "item_name": item_b},
+		)
+		pr.submit()
+
+		riv = frappe.get_doc("Repost Item Valuation", {"voucher_no": pr.name})
+		self.assertEqual(riv.status, "Completed")
+
+		for item_code in (item_a, item_b):
+			sles = frappe.get_all(
+				"Stock Ledger Entry",
+				filters={"item_code": item_code, "warehouse": warehouse, "is_cancelled": 0},
+				fields=["qty_after_transaction", "stock_value"],
+				order_by="posting_datetime, creation",
+			)
+			self.assertEqual([sle.qty_after_transaction for sle in sles], [5, 10])
+			self.assertEqual([sle.stock_value for sle in sles], [250, 750])
+
+		# completed once, by the last partition
+		self.assertFalse(claim_repost_completion(riv))
+		self.assertFalse(has_pending_partitions(riv))
+
+	def test_repost_entries_wait_for_partitions(self):
+		from unittest.mock import patch
+
+		from erpnext.stock.doctype.repost_item_valuation import repost_item_valuation
+
+		for posting_date in ("2021-01-01", "2021-01-02"):
+			riv = frappe.get_doc(
+				doctype="Repost Item Valuation",
+				item_code="_Test Item",
+				warehouse="_Test Warehouse - _TC",
+				based_on="Item and Warehouse",
+				posting_date=posting_date,
+				posting_time="00:01:00",
+			)
+			riv.flags.dont_run_in_test = True
+			riv.submit()
+
+		# later reposts are not started while the partitions of the first one are being reposted
+		with (
+			patch.object(repost_item_valuation, "repost") as repost,
+			patch.object(repost_item_valuation, "has_pending_partitions", return_value=True),
+		):
+			repost_item_valuation.repost_entries()
+
+		self.assertEqual(repost.call_count, 1)
+
+	@change_settings("Stock Reposting Settings", {"item_based_reposting": 0, "repost_checkpoint_interval": 1})
+	def test_repost_checkpoints(self):
+		from unittest.mock import patch
+
+		from erpnext.stock import stock_ledger
+		from erpnext.stock.doctype.repost_item_valuation.repost_item_valuation import repost
+
+		item_code = make_item(
+			"_Test Repost Checkpoint Item", properties={"is_stock_item": 1, "valuation_method": "FIFO"}
+		).name
+		warehouse = "_Test Warehouse - _TC"
+		target_warehouse = "_Test Warehouse 1 - _TC"
+
+		make_stock_entry(
+			item_code=item_code, to_warehouse=warehouse, qty=10, rate=100, posting_date=add_days(today(), -4)
+		)
+		transfer = make_stock_entry(
+			item_code=item_code,
+			from_warehouse=warehouse,
+			to_warehouse=target_warehouse,
+			qty=5,
+			posting_date=add_days(today(), -2),
+		)
+		last_receipt = make_stock_entry(
+			item_code=item_code, to_warehouse=warehouse, qty=5, rate=300, posting_date=add_days(today(), -1)
+		)
+
+		# backdated receipt, the transfer now takes the stock at its rate
+		frappe.flags.dont_execute_stock_reposts = True
+		backdated_receipt = make_stock_entry(
+			item_code=item_code, to_warehouse=warehouse, qty=10, rate=200, posting_date=add_days(today(), -5)
+		)
+		riv = frappe.get_doc("Repost Item Valuation", {"voucher_no": backdated_receipt.name})
+
+		process_sle = stock_ledger.update_entries_after.process_sle
+
+		def interrupt_at_last_receipt(self, sle):
+			if sle.voucher_no == last_receipt.name:
+				raise frappe.ValidationError("Interrupted")
+
+			return process_sle(self, sle)
+
+		# interrupted after the checkpoint saved once the transfer is reposted
+		with patch.object(stock_ledger.update_entries_after, "process_sle", interrupt_at_last_receipt):
+			self.assertRaises(frappe.ValidationError, repost, riv)
+
+		riv.reload()
+		self.assertTrue(riv.current_index or riv.reposting_data_file)
+
+		# resumed from the checkpoint, the target warehouse depends on the reposted transfer
+		repost(riv)
+		riv.reload()
+		self.assertEqual(riv.status, "Completed")
+
+		target_sle = frappe.db.get_value(
+			"Stock Ledger Entry",
+			{"voucher_no": transfer.name, "warehouse": target_warehouse, "is_cancelled": 0},
+			["qty_after_transaction", "stock_value"],
+			as_dict=True,
+		)
+		self.assertEqual(target_sle.qty_after_transaction, 5)
+		self.assertEqual(target_sle.stock_value, 1000)
+
+		sles = frappe.get_all(
+			"Stock Ledger Entry",
+			filters={"item_code": item_code, "warehouse": warehouse, "is_cancelled": 0},
+			fields=["qty_after_transaction", "stock_value"],
+			order_by="posting_datetime, creation",
+		)
+		self.assertEqual([sle.qty_after_transaction for sle in sles], [10, 20, 15, 20])
+		self.assertEqual([sle.stock_value for sle in sles], [2000, 3000, 2000, 3500])
@@ -8,7 +8,7 @@ from collections import Counter, defaultdict
 import frappe
 from frappe import _, _dict, bold
 from frappe.model.document import Document
-from frappe.model.naming import make_autoname
+from frappe.model.naming import make_autoname, set_new_name
 from frappe.query_builder.functions import CombineDatetime, Sum
 from frappe.utils import (
 	cint,
@@ -23,6 +23,10 @@ from frappe.utils import (
 )
 from frappe.utils.csvutils import build_csv_response
 
+from erpnext.stock.doctype.batch_warehouse_balance.batch_warehouse_balance import update_batch_balances
+from erpnext.stock.doctype.serial_no_incoming_rate.serial_no_incoming_rate import (
+	update_serial_no_incoming_rates,
+)
 from erpnext.stock.serial_batch_bundle import (
 	BatchNoValuation,
 	SerialNoValuation,
@@ -47,6 +51,11 @@ class SerialNoWarehouseError(frappe.ValidationError):
 	pass
 
 
+# entries of the bundles larger than this are written with multi-row statements
+BULK_ENTRIES_THRESHOLD = 100
+ENTRIES_WRITE_BATCH_SIZE = 1000
+
+
 class SerialandBatchBundle(Document):
 	# begin: auto-generated types
 	# This code is auto-generated. Do not modify anything in this block.
@@ -100,6 +109,46 @@ class SerialandBatchBundle(Document):
 			except frappe.DuplicateEntryError:
 				self.autoname()
 
+	def db_insert(self, *args, **kwargs):
+		super().db_insert(*args, **kwargs)
+
+		if self.has_bulk_entries():
+			self.insert_entries_in_bulk()
+
+	def update_child_table(self, fieldname, df=None):
+		if fieldname == "entries" and self.has_bulk_entries():
+			frappe.db.delete("Serial and Batch Entry", {"parent": self.name, "parenttype": self.doctype})
+			self.insert_entries_in_bulk()
+			return
+
+		super().update_child_table(fieldname, df)
+
+	def has_bulk_entries(self):
+		return len(self.entries) > BULK_ENTRIES_THRESHOLD
+
+	def insert_entries_in_bulk(self):
+		"""Insert all the entries with multi-row inserts instead of one insert per entry"""
+		fields, values = None, []
+		for row in self.entries:
+			if not row.name:
+				set_new_name(row)
+
+			if not row.creation:
+				row.creation = row.modified = now()
+				row.owner = row.modified_by = frappe.session.user
+
+			row_values = row.get_valid_dict(convert_dates_to_str=True, ignore_virtual=True)
+			fields = fields or list(row_values)
+			values.append([row_values.get(field) for field in fields])
+
+			# skip the insert of the row by the document
+			row.flags.inserted_with_bundle = True
+			row.set("__islocal", False)
+
+		frappe.db.bulk_insert(
+			"Serial and Batch Entry", fields=fields, values=values, chunk_size=ENTRIES_WRITE_BATCH_SIZE
+		)
+
 	def validate(self):
 		if self.docstatus == 1 and self.voucher_detail_no:
 			self.validate_voucher_detail_no()
@@ -253,9 +302,10 @@ class SerialandBatchBundle(Document):
 
 		available_serial_nos = get_available_serial_nos(frappe._dict(kwargs))
 
+		serial_no_set = set(serial_nos)
 		serial_no_warehouse = {}
 		for data in available_serial_nos:
-			if data.serial_no not in serial_nos:
+			if data.serial_no not in serial_no_set:
 				continue
 
 			serial_no_warehouse[data.serial_no] = data.warehouse
@@ -298,9 +348,10 @@ class SerialandBatchBundle(Document):
 		if self.docstatus == 1:
 			kwargs["voucher_no"] = self.voucher_no
 
+		serial_no_set = set(serial_nos)
 		available_serial_nos = get_available_serial_nos(kwargs)
 		for data in available_serial_nos:
-			if data.serial_no in serial_nos:
+			if data.serial_no in serial_no_set:
 				self.throw_error_message(
 					f"Serial No {bold(data.serial_no)} is already present in the warehouse {bold(data.warehouse)}.",
 					SerialNoDuplicateError,
@@ -350,13 +401,8 @@ class SerialandBatchBundle(Document):
 				row.incoming_rate = flt(valuation_rate)
 				row.stock_value_difference = flt(row.qty) * flt(row.incoming_rate)
 
-				if save:
-					row.db_set(
-						{
-							"incoming_rate": row.incoming_rate,
-							"stock_value_difference": row.stock_value_difference,
-						}
-					)
+			if save:
+				self.save_entry_rates(self.entries)
 
 		elif self.type_of_transaction == "Inward":
 			self.set_incoming_rate_for_inward_transaction(row, save)
@@ -457,10 +503,25 @@ class SerialandBatchBundle(Document):
 			row.incoming_rate = valuation_rate
 			row.stock_value_difference = flt(row.qty) * flt(valuation_rate)
 
-			if save:
-				row.db_set(
-					{"incoming_rate": row.incoming_rate, "stock_value_difference": row.stock_value_difference}
-				)
+		if save:
+			self.save_entry_rates(self.entries)
+
+	def save_entry_rates(self, rows):
+		"""Write the incoming rate and stock value difference of the entries with multi-row updates"""
+		if not rows:
+			return
+
+		frappe.db.bulk_update(
+			"Serial and Batch Entry",
+			{
+				row.name: {
+					"incoming_rate": row.incoming_rate,
+					"stock_value_difference": row.stock_value_difference,
+				}
+				for row in rows
+			},
+			chunk_size=ENTRIES_WRITE_BATCH_SIZE,
+		)
 
 	def set_incoming_rate_for_outward_transaction(self, row=None, save=False, allow_negative_stock=False):
 		sle = self.get_sle_for_outward_transaction()
@@ -496,10 +557,8 @@ class SerialandBatchBundle(Document):
 
 			d.stock_value_difference = flt(d.qty) * flt(d.incoming_rate)
 
-			if save:
-				d.db_set(
-					{"incoming_rate": d.incoming_rate, "stock_value_difference": d.stock_value_difference}
-				)
+		if save:
+			self.save_entry_rates(self.entries)
 
 	def validate_negative_batch(self, batch_no, available_qty):
 		if available_qty < 0 and not self.is_stock_reco_for_valuation_adjustment(available_qty):
@@ -599,6 +658,7 @@ class SerialandBatchBundle(Document):
 		if not rate and self.voucher_detail_no and self.voucher_no:
 			rate = frappe.db.get_value(child_table, self.voucher_detail_no, valuation_field)
 
+		changed_rows = []
 		for d in self.entries:
 			if self.is_rejected:
 				rate = 0.0
@@ -609,10 +669,10 @@ class SerialandBatchBundle(Document):
 			if d.qty:
 				d.stock_value_difference = flt(d.qty) * d.incoming_rate
 
-			if save:
-				d.db_set(
-					{"incoming_rate": d.incoming_rate, "stock_value_difference": d.stock_value_difference}
-				)
+			changed_rows.append(d)
+
+		if save:
+			self.save_entry_rates(changed_rows)
 
 	def set_serial_and_batch_values(self, parent, row, qty_field=None):
 		values_to_set = {}
@@ -1137,6 +1197,8 @@ class SerialandBatchBundle(Document):
 
 	def on_submit(self):
 		self.validate_serial_nos_inventory()
+		update_batch_balances(self)
+		update_serial_no_incoming_rates(self)
 
 	def set_purchase_document_no(self):
 		if self.flags.ignore_validate_serial_batch:
@@ -1195,6 +1257,8 @@ class SerialandBatchBundle(Document):
 
 	def on_cancel(self):
 		self.validate_voucher_no_docstatus()
+		update_batch_balances(self, cancel=True)
+		update_serial_no_incoming_rates(self, cancel=True)
 
 	def validate_voucher_no_docstatus(self):
 		if self.voucher_type == "POS Invoice":
@@ -890,6 +890,54 @@ class TestSerialandBatchBundle(FrappeTestCase):
 		self.assertTrue(bundle_doc.docstatus == 0)
 		self.assertRaises(frappe.ValidationError, bundle_doc.submit)
 
+	def test_bundle_with_bulk_entries(self):
+		from erpnext.stock.doctype.serial_and_batch_bundle.serial_and_batch_bundle import (
+			BULK_ENTRIES_THRESHOLD,
+		)
+
+		item_code = make_item(
+			"_Test Bulk Serial No Item",
+			{"is_stock_item": 1, "has_serial_no": 1, "serial_no_series": "TBSNI-.#####"},
+		).name
+		warehouse = "_Test Warehouse - _TC"
+		qty = BULK_ENTRIES_THRESHOLD + 50
+
+		se = make_stock_entry(item_code=item_code, target=warehouse, qty=qty, basic_rate=100)
+		bundle = se.items[0].serial_and_batch_bundle
+		serial_nos = get_serial_nos_from_bundle(bundle)
+
+		# names of the series are reserved at once and are consecutive
+		self.assertEqual(len(set(serial_nos)), qty)
+		numbers = [int(serial_no.split("-")[-1]) for serial_no in serial_nos]
+		self.assertEqual(numbers, list(range(numbers[0], numbers[0] + qty)))
+
+		self.assertEqual(frappe.db.count("Serial and Batch Entry", {"parent": bundle, "docstatus": 1}), qty)
+		self.assertEqual(
+			flt(frappe.db.get_value("Serial and Batch Bundle", bundle, "total_amount")), qty * 100
+		)
+		self.assertEqual(
+			frappe.db.count("Serial No", {"name": ("in", serial_nos), "warehouse": warehouse}), qty
+		)
+
+		issue = make_stock_entry(
+			item_code=item_code,
+			source=warehouse,
+			qty=qty,
+			serial_no="\n".join(serial_nos),
+			use_serial_batch_fields=True,
+		)
+
+		stock_value_difference = frappe.db.get_value(
+			"Stock Ledger Entry", {"voucher_no": issue.name, "is_cancelled": 0}, "stock_value_difference"
+		)
+		self.assertEqual(flt(stock_value_difference, 2), qty * -100)
+		self.assertFalse(frappe.db.count("Serial No", {"name": ("in", serial_nos), "warehouse": warehouse}))
+
+		issue.cancel()
+		self.assertEqual(
+			frappe.db.count("Serial No", {"name": ("in", serial_nos), "warehouse": warehouse}), qty
+		)
+
 
 def get_batch_from_bundle(bundle):
 	from erpnext.stock.serial_batch_bundle import get_batch_nos
@@ -29,4 +29,9 @@ class SerialandBatchEntry(Document):
 		warehouse: DF.Link | None
 	# end: auto-generated types
 
-	pass
+	def db_insert(self, *args, **kwargs):
+		# entries of large bundles are inserted in bulk along with the bundle
+		if self.flags.inserted_with_bundle:
+			return
+
+		super().db_insert(*args, **kwargs)
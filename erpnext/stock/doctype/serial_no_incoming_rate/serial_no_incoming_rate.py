@@ -0,0 +1,277 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+"""Latest inward entry of each serial no.
+
+Used by the serial no valuation of outward entries to find the incoming rate of
+all the serial nos of a bundle in a few queries, instead of looking up the
+latest inward Serial and Batch Entry of each serial no.
+
+The entry of a serial no is only used when it is in the warehouse of the
+outward entry, is posted before it and belongs to another voucher, otherwise
+the inward entries of the serial no are looked up as before.
+
+The entries of all the items are built in the background once enabled in
+Stock Settings, see `erpnext.utilities.summary_table`, and are kept up to date:
+
+- on submit and cancel of an inward Serial and Batch Bundle
+- when the stock ledger recalculates the rates of a submitted bundle
+"""
+
+import frappe
+from frappe.model.document import Document
+from frappe.query_builder.functions import CombineDatetime
+from frappe.utils import create_batch, flt, get_combine_datetime, get_datetime
+from pypika import Order
+
+from erpnext.utilities.summary_table import build_in_batches, is_summary_table_built
+
+SERIAL_NO_BATCH_SIZE = 1000
+
+INWARD_ENTRY_FIELDS = [
+	"serial_no",
+	"item_code",
+	"warehouse",
+	"incoming_rate",
+	"serial_and_batch_bundle",
+	"voucher_no",
+	"posting_datetime",
+	"bundle_creation",
+]
+
+
+class SerialNoIncomingRate(Document):
+	# begin: auto-generated types
+	# This code is auto-generated. Do not modify anything in this block.
+
+	from typing import TYPE_CHECKING
+
+	if TYPE_CHECKING:
+		from frappe.types import DF
+
+		bundle_creation: DF.Datetime | None
+		incoming_rate: DF.Float
+		item_code: DF.Link
+		posting_datetime: DF.Datetime | None
+		serial_and_batch_bundle: DF.Link | None
+		serial_no: DF.Link
+		voucher_no: DF.Data | None
+		warehouse: DF.Link | None
+	# end: auto-generated types
+
+	pass
+
+
+def is_serial_no_incoming_rate_enabled():
+	return frappe.db.get_single_value("Stock Settings", "use_serial_no_incoming_rates")
+
+
+def is_included(bundle):
+	return bundle.has_serial_no and bundle.type_of_transaction == "Inward"
+
+
+def is_serial_no_incoming_rate_built():
+	return is_serial_no_incoming_rate_enabled() and is_summary_table_built("Serial No Incoming Rate")
+
+
+def get_inward_entries_query():
+	"""Inward entries of the serial nos in the submitted bundles, the latest first."""
+	parent = frappe.qb.DocType("Serial and Batch Bundle")
+	child = frappe.qb.DocType("Serial and Batch Entry")
+
+	return (
+		frappe.qb.from_(parent)
+		.inner_join(child)
+		.on(parent.name == child.parent)
+		.select(
+			child.serial_no,
+			parent.item_code,
+			child.warehouse,
+			(child.incoming_rate * child.qty).as_("incoming_rate"),
+			parent.name.as_("serial_and_batch_bundle"),
+			parent.voucher_no,
+			CombineDatetime(parent.posting_date, parent.posting_time).as_("posting_datetime"),
+			parent.creation.as_("bundle_creation"),
+		)
+		.where(
+			(parent.is_cancelled == 0)
+			& (parent.docstatus == 1)
+			& (parent.type_of_transaction == "Inward")
+			& (child.qty > 0)
+			& (child.serial_no.isnotnull())
+		)
+		.orderby(CombineDatetime(parent.posting_date, parent.posting_time), order=Order.desc)
+		.orderby(parent.creation, order=Order.desc)
+	)
+
+
+def get_latest_inward_entries(query) -> dict:
+	"""Returns the first entry of each serial no from a query of `get_inward_entries_query`."""
+	entries = {}
+	for row in query.run(as_dict=True):
+		entries.setdefault(row.serial_no, row)
+
+	return entries
+
+
+def insert_latest_inward_entries(query):
+	entries = [
+		(row.serial_no, *(row.get(fieldname) for fieldname in INWARD_ENTRY_FIELDS))
+		for row in get_latest_inward_entries(query).values()
+	]
+
+	if entries:
+		frappe.db.bulk_insert(
+			"Serial No Incoming Rate",
+			fields=["name", *INWARD_ENTRY_FIELDS],
+			values=entries,
+		)
+
+
+def build_serial_no_incoming_rates():
+	"""Build the entries of all the items, run by `build_summary_table`."""
+	parent = frappe.qb.DocType("Serial and Batch Bundle")
+
+	item_codes = (
+		frappe.qb.from_(parent)
+		.select(parent.item_code)
+		.distinct()
+		.where((parent.has_serial_no == 1) & (parent.type_of_transaction == "Inward"))
+	).run(pluck=True)
+
+	build_in_batches(sorted(item_codes), build_item_incoming_rates)
+
+
+def build_item_incoming_rates(item_code):
+	"""Rebuild the entries of all the serial nos of the item from the Serial and Batch Bundles."""
+	parent = frappe.qb.DocType("Serial and Batch Bundle")
+
+	frappe.db.delete("Serial No Incoming Rate", {"item_code": item_code})
+	insert_latest_inward_entries(get_inward_entries_query().where(parent.item_code == item_code))
+
+
+def rebuild_serial_no_incoming_rates(item_code, serial_nos):
+	"""Rebuild the entries of the serial nos of the item from the Serial and Batch Bundles."""
+	parent = frappe.qb.DocType("Serial and Batch Bundle")
+	child = frappe.qb.DocType("Serial and Batch Entry")
+
+	frappe.db.delete("Serial No Incoming Rate", {"item_code": item_code, "name": ("in", serial_nos)})
+
+	insert_latest_inward_entries(
+		get_inward_entries_query().where((parent.item_code == item_code) & child.serial_no.isin(serial_nos))
+	)
+
+
+def update_serial_no_incoming_rates(bundle, cancel=False):
+	"""Set the entries of the serial nos of a submitted inward bundle, or restore the previous
+	entries once it is cancelled."""
+	if not is_serial_no_incoming_rate_enabled() or not is_included(bundle):
+		return
+
+	if cancel:
+		serial_nos = frappe.get_all(
+			"Serial No Incoming Rate", filters={"serial_and_batch_bundle": bundle.name}, pluck="name"
+		)
+
+		for batch in create_batch(serial_nos, SERIAL_NO_BATCH_SIZE):
+			rebuild_serial_no_incoming_rates(bundle.item_code, batch)
+
+		return
+
+	posting_datetime = get_combine_datetime(bundle.posting_date, bundle.posting_time)
+	creation = get_datetime(bundle.creation)
+
+	rows = {row.serial_no: row for row in bundle.entries if row.serial_no and flt(row.qty) > 0}
+	# locking read, to see the entries inserted by a concurrent build
+	existing_entries = get_serial_no_incoming_rates(list(rows), for_update=True)
+
+	entries, updated_entries = [], {}
+	for serial_no, row in rows.items():
+		entry = {
+			"serial_no": serial_no,
+			"item_code": bundle.item_code,
+			"warehouse": row.warehouse,
+			"incoming_rate": flt(row.incoming_rate) * flt(row.qty),
+			"serial_and_batch_bundle": bundle.name,
+			"voucher_no": bundle.voucher_no,
+			"posting_datetime": posting_datetime,
+			"bundle_creation": creation,
+		}
+
+		existing_entry = existing_entries.get(serial_no)
+		if not existing_entry:
+			entries.append((serial_no, *(entry[fieldname] for fieldname in INWARD_ENTRY_FIELDS)))
+		elif (posting_datetime, creation) >= (
+			get_datetime(existing_entry.posting_datetime),
+			get_datetime(existing_entry.bundle_creation),
+		):
+			updated_entries[serial_no] = entry
+
+	if entries:
+		frappe.db.bulk_insert(
+			"Serial No Incoming Rate",
+			fields=["name", *INWARD_ENTRY_FIELDS],
+			values=entries,
+		)
+
+	if updated_entries:
+		frappe.db.bulk_update(
+			"Serial No Incoming Rate", updated_entries, chunk_size=SERIAL_NO_BATCH_SIZE, update_modified=False
+		)
+
+
+def update_serial_no_incoming_rate_values(bundle):
+	"""Apply the incoming rates of a submitted bundle after they are recalculated."""
+	if bundle.docstatus != 1 or not is_serial_no_incoming_rate_enabled() or not is_included(bundle):
+		return
+
+	entries = frappe.get_all(
+		"Serial No Incoming Rate",
+		filters={"serial_and_batch_bundle": bundle.name},
+		fields=["name", "incoming_rate"],
+	)
+	incoming_rates = {entry.name: flt(entry.incoming_rate) for entry in entries}
+
+	updated_entries = {}
+	for row in bundle.entries:
+		if row.serial_no not in incoming_rates:
+			continue
+
+		incoming_rate = flt(row.incoming_rate) * flt(row.qty)
+		if incoming_rate != incoming_rates[row.serial_no]:
+			updated_entries[row.serial_no] = {"incoming_rate": incoming_rate}
+
+	if updated_entries:
+		frappe.db.bulk_update(
+			"Serial No Incoming Rate", updated_entries, chunk_size=SERIAL_NO_BATCH_SIZE, update_modified=False
+		)
+
+
+def get_serial_no_incoming_rates(serial_nos, for_update=False) -> dict:
+	"""Returns the latest inward entry of each of the serial nos."""
+	entries = {}
+	for batch in create_batch(serial_nos, SERIAL_NO_BATCH_SIZE):
+		for entry in frappe.get_all(
+			"Serial No Incoming Rate",
+			filters={"name": ("in", batch)},
+			fields=["name", *INWARD_ENTRY_FIELDS],
+			for_update=for_update,
+		):
+			entries[entry.name] = entry
+
+	return entries
+
+
+def is_entry_applicable(entry, item_code, warehouse, voucher_no=None, posting_datetime=None) -> bool:
+	"""Returns True if the latest inward entry of the serial no is also its latest inward entry in the
+	warehouse up to the posting datetime, excluding the entries of the voucher."""
+	if entry.item_code != item_code or entry.warehouse != warehouse:
+		return False
+
+	if voucher_no and entry.voucher_no == voucher_no:
+		return False
+
+	if posting_datetime and get_datetime(entry.posting_datetime) > get_datetime(posting_datetime):
+		return False
+
+	return True
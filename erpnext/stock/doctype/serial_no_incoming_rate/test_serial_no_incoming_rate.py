@@ -0,0 +1,92 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase, change_settings
+from frappe.utils import flt
+
+from erpnext.stock.doctype.item.test_item import make_item
+from erpnext.stock.doctype.serial_and_batch_bundle.test_serial_and_batch_bundle import (
+	get_serial_nos_from_bundle,
+)
+from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
+
+
+class TestSerialNoIncomingRate(FrappeTestCase):
+	def get_stock_value_difference(self, stock_entry, warehouse):
+		return flt(
+			frappe.db.get_value(
+				"Stock Ledger Entry",
+				{"voucher_no": stock_entry.name, "warehouse": warehouse, "is_cancelled": 0},
+				"stock_value_difference",
+			),
+			2,
+		)
+
+	@change_settings("Stock Settings", {"use_serial_no_incoming_rates": 1})
+	def test_serial_no_incoming_rate(self):
+		item_code = make_item(
+			"_Test Serial No Incoming Rate Item",
+			{"is_stock_item": 1, "has_serial_no": 1, "serial_no_series": "TSNIR-.#####"},
+		).name
+		warehouse = "_Test Warehouse - _TC"
+		target_warehouse = "_Test Warehouse 1 - _TC"
+
+		se = make_stock_entry(item_code=item_code, target=warehouse, qty=3, basic_rate=100)
+		serial_nos1 = get_serial_nos_from_bundle(se.items[0].serial_and_batch_bundle)
+		se = make_stock_entry(item_code=item_code, target=warehouse, qty=2, basic_rate=200)
+		serial_nos2 = get_serial_nos_from_bundle(se.items[0].serial_and_batch_bundle)
+
+		entries = frappe.get_all(
+			"Serial No Incoming Rate",
+			filters={"item_code": item_code},
+			fields=["name", "warehouse", "incoming_rate"],
+		)
+		self.assertEqual(len(entries), 5)
+		for entry in entries:
+			self.assertEqual(entry.warehouse, warehouse)
+			self.assertEqual(entry.incoming_rate, 100 if entry.name in serial_nos1 else 200)
+
+		# latest inward entry of the transferred serial nos is in the target warehouse
+		transfer = make_stock_entry(
+			item_code=item_code,
+			source=warehouse,
+			target=target_warehouse,
+			qty=3,
+			serial_no="\n".join(serial_nos1),
+			use_serial_batch_fields=True,
+		)
+		self.assertEqual(self.get_stock_value_difference(transfer, warehouse), -300)
+		self.assertEqual(
+			frappe.db.count(
+				"Serial No Incoming Rate", {"name": ("in", serial_nos1), "warehouse": target_warehouse}
+			),
+			3,
+		)
+
+		target_issue = make_stock_entry(
+			item_code=item_code,
+			source=target_warehouse,
+			qty=3,
+			serial_no="\n".join(serial_nos1),
+			use_serial_batch_fields=True,
+		)
+		self.assertEqual(self.get_stock_value_difference(target_issue, target_warehouse), -300)
+
+		issue = make_stock_entry(
+			item_code=item_code,
+			source=warehouse,
+			qty=2,
+			serial_no="\n".join(serial_nos2),
+			use_serial_batch_fields=True,
+		)
+		self.assertEqual(self.get_stock_value_difference(issue, warehouse), -400)
+
+		# previous inward entries are restored on cancel
+		issue.cancel()
+		target_issue.cancel()
+		frappe.get_doc("Stock Entry", transfer.name).cancel()
+		self.assertEqual(
+			frappe.db.count("Serial No Incoming Rate", {"name": ("in", serial_nos1), "warehouse": warehouse}),
+			3,
+		)
@@ -0,0 +1,215 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+"""Monthly minimum of Qty After Transaction for each item-warehouse.
+
+Used to find future stock ledger entries with negative qty without scanning
+all the future entries: only the month of the posting and the months whose
+minimum is negative are scanned.
+
+The buckets of all the item-warehouses are built in the background once
+enabled in Stock Settings, see `erpnext.utilities.summary_table`, and are kept
+up to date by the stock ledger whenever the qty after transaction changes:
+
+- the month of a new or cancelled entry is recalculated
+- the qty of the following months is shifted along with the future entries
+- all the months from the start of a repost are rebuilt
+"""
+
+import frappe
+from frappe.model.document import Document
+from frappe.query_builder import DatePart
+from frappe.query_builder.functions import Extract, Min
+from frappe.utils import add_months, create_batch, get_datetime, get_first_day, getdate
+
+from erpnext.utilities.summary_table import build_in_batches, is_summary_table_built
+
+ITEM_BATCH_SIZE = 100
+
+
+class StockQtyBucket(Document):
+	# begin: auto-generated types
+	# This code is auto-generated. Do not modify anything in this block.
+
+	from typing import TYPE_CHECKING
+
+	if TYPE_CHECKING:
+		from frappe.types import DF
+
+		bucket_start: DF.Date
+		item_code: DF.Link
+		min_qty: DF.Float
+		warehouse: DF.Link
+	# end: auto-generated types
+
+	pass
+
+
+def on_doctype_update():
+	frappe.db.add_unique(
+		"Stock Qty Bucket",
+		["item_code", "warehouse", "bucket_start"],
+		constraint_name="unique_item_warehouse_bucket",
+	)
+
+
+def is_stock_qty_bucket_enabled():
+	return frappe.db.get_single_value("Stock Settings", "use_stock_qty_buckets")
+
+
+def get_bucket_start(posting_datetime):
+	return get_first_day(getdate(posting_datetime))
+
+
+def get_bucket_end(bucket_start):
+	return get_datetime(add_months(bucket_start, 1))
+
+
+def is_stock_qty_bucket_built():
+	return is_stock_qty_bucket_enabled() and is_summary_table_built("Stock Qty Bucket")
+
+
+def get_buckets_query():
+	"""Minimum qty after transaction of each item-warehouse and month."""
+	sle = frappe.qb.DocType("Stock Ledger Entry")
+
+	return (
+		frappe.qb.from_(sle)
+		.select(
+			sle.item_code,
+			sle.warehouse,
+			Extract(DatePart.year, sle.posting_date).as_("year"),
+			Extract(DatePart.month, sle.posting_date).as_("month"),
+			Min(sle.qty_after_transaction).as_("min_qty"),
+		)
+		.where(sle.is_cancelled == 0)
+		.groupby(
+			sle.item_code,
+			sle.warehouse,
+			Extract(DatePart.year, sle.posting_date),
+			Extract(DatePart.month, sle.posting_date),
+		)
+	)
+
+
+def insert_buckets(query):
+	buckets = [
+		(
+			frappe.generate_hash(length=10),
+			row.item_code,
+			row.warehouse,
+			getdate(f"{int(row.year)}-{int(row.month):02d}-01"),
+			row.min_qty,
+		)
+		for row in query.run(as_dict=True)
+	]
+
+	if buckets:
+		frappe.db.bulk_insert(
+			"Stock Qty Bucket",
+			fields=["name", "item_code", "warehouse", "bucket_start", "min_qty"],
+			values=buckets,
+		)
+
+
+def build_stock_qty_buckets():
+	"""Build the buckets of all the item-warehouses, run by `build_summary_table`."""
+	sle = frappe.qb.DocType("Stock Ledger Entry")
+
+	item_codes = frappe.qb.from_(sle).select(sle.item_code).distinct().run(pluck=True)
+	build_in_batches(create_batch(sorted(item_codes), ITEM_BATCH_SIZE), build_item_buckets)
+
+
+def build_item_buckets(item_codes):
+	"""Rebuild the buckets of the items from their stock ledger entries."""
+	sle = frappe.qb.DocType("Stock Ledger Entry")
+
+	frappe.db.delete("Stock Qty Bucket", {"item_code": ("in", item_codes)})
+	insert_buckets(get_buckets_query().where(sle.item_code.isin(item_codes)))
+
+
+def build_buckets(item_code, warehouse, from_date=None):
+	"""Rebuild the buckets of the item-warehouse from the month of `from_date`, once its entries are
+	reposted."""
+	sle = frappe.qb.DocType("Stock Ledger Entry")
+
+	bucket_filters = {"item_code": item_code, "warehouse": warehouse}
+	query = get_buckets_query().where((sle.item_code == item_code) & (sle.warehouse == warehouse))
+
+	if from_date:
+		from_date = get_bucket_start(from_date)
+		bucket_filters["bucket_start"] = (">=", from_date)
+		query = query.where(sle.posting_date >= from_date)
+
+	frappe.db.delete("Stock Qty Bucket", bucket_filters)
+	insert_buckets(query)
+
+
+def refresh_bucket(item_code, warehouse, bucket_start):
+	"""Recalculate the minimum qty of a month from its stock ledger entries."""
+	sle = frappe.qb.DocType("Stock Ledger Entry")
+
+	min_qty = (
+		frappe.qb.from_(sle)
+		.select(Min(sle.qty_after_transaction))
+		.where(
+			(sle.item_code == item_code)
+			& (sle.warehouse == warehouse)
+			& (sle.is_cancelled == 0)
+			& (sle.posting_date >= bucket_start)
+			& (sle.posting_date < add_months(bucket_start, 1))
+		)
+	).run()[0][0]
+
+	filters = {"item_code": item_code, "warehouse": warehouse, "bucket_start": bucket_start}
+	if min_qty is None:
+		frappe.db.delete("Stock Qty Bucket", filters)
+	# locking read, to see the bucket inserted by a concurrent build
+	elif name := frappe.db.get_value("Stock Qty Bucket", filters, for_update=True):
+		frappe.db.set_value("Stock Qty Bucket", name, "min_qty", min_qty, update_modified=False)
+	else:
+		frappe.get_doc({"doctype": "Stock Qty Bucket", **filters, "min_qty": min_qty}).db_insert()
+
+
+def update_buckets_for_qty_shift(args, qty_shift, next_stock_reco=None):
+	"""Update the buckets after the qty of the future entries of `args` is shifted by `qty_shift`,
+	till the next stock reconciliation if any."""
+	first_bucket = get_bucket_start(args.posting_datetime)
+	last_bucket = get_bucket_start(next_stock_reco.posting_date) if next_stock_reco else None
+
+	# months which are entirely after the entry and before the stock reconciliation
+	if qty_shift and last_bucket != first_bucket:
+		bucket = frappe.qb.DocType("Stock Qty Bucket")
+		query = (
+			frappe.qb.update(bucket)
+			.set(bucket.min_qty, bucket.min_qty + qty_shift)
+			.where(
+				(bucket.item_code == args.item_code)
+				& (bucket.warehouse == args.warehouse)
+				& (bucket.bucket_start > first_bucket)
+			)
+		)
+
+		if last_bucket:
+			query = query.where(bucket.bucket_start < last_bucket)
+
+		query.run()
+
+	# months of the entry and the stock reconciliation are only partially shifted
+	refresh_bucket(args.item_code, args.warehouse, first_bucket)
+	if last_bucket and last_bucket != first_bucket:
+		refresh_bucket(args.item_code, args.warehouse, last_bucket)
+
+
+def get_negative_buckets(item_code, warehouse, after_bucket):
+	return frappe.get_all(
+		"Stock Qty Bucket",
+		filters={
+			"item_code": item_code,
+			"warehouse": warehouse,
+			"bucket_start": (">", after_bucket),
+			"min_qty": ("<", 0),
+		},
+		pluck="bucket_start",
+		order_by="bucket_start asc",
+	)
@@ -0,0 +1,75 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase, change_settings
+from frappe.utils import add_days, add_months, get_first_day, today
+
+from erpnext.stock.doctype.item.test_item import make_item
+from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
+from erpnext.stock.doctype.stock_qty_bucket.stock_qty_bucket import is_stock_qty_bucket_built
+from erpnext.stock.stock_ledger import NegativeStockError
+
+
+class TestStockQtyBucket(FrappeTestCase):
+	def get_buckets(self, item_code, warehouse):
+		return {
+			str(d.bucket_start): d.min_qty
+			for d in frappe.get_all(
+				"Stock Qty Bucket",
+				filters={"item_code": item_code, "warehouse": warehouse},
+				fields=["bucket_start", "min_qty"],
+			)
+		}
+
+	@change_settings("Stock Settings", {"use_stock_qty_buckets": 1, "allow_negative_stock": 0})
+	def test_future_negative_stock_validation(self):
+		item_code = make_item("_Test Stock Qty Bucket Item", {"is_stock_item": 1}).name
+		warehouse = "_Test Warehouse - _TC"
+
+		first_month = get_first_day(add_months(today(), -2))
+		second_month = get_first_day(add_months(today(), -1))
+
+		make_stock_entry(
+			item_code=item_code, to_warehouse=warehouse, qty=10, rate=100, posting_date=first_month
+		)
+		make_stock_entry(item_code=item_code, from_warehouse=warehouse, qty=8, posting_date=second_month)
+
+		self.assertEqual(self.get_buckets(item_code, warehouse), {str(first_month): 10, str(second_month): 2})
+
+		# backdated receipt shifts the balance of the following months
+		make_stock_entry(
+			item_code=item_code,
+			to_warehouse=warehouse,
+			qty=5,
+			rate=100,
+			posting_date=add_days(first_month, 1),
+		)
+		self.assertEqual(self.get_buckets(item_code, warehouse), {str(first_month): 10, str(second_month): 7})
+
+		# issue of 10 makes the balance of the next month negative
+		se = make_stock_entry(
+			item_code=item_code,
+			from_warehouse=warehouse,
+			qty=10,
+			posting_date=add_days(first_month, 2),
+			do_not_submit=True,
+		)
+		self.assertRaises(NegativeStockError, se.submit)
+
+	def test_build_stock_qty_buckets(self):
+		item_code = make_item("_Test Stock Qty Bucket Build Item", {"is_stock_item": 1}).name
+		warehouse = "_Test Warehouse - _TC"
+		posting_date = get_first_day(add_months(today(), -1))
+
+		make_stock_entry(
+			item_code=item_code, to_warehouse=warehouse, qty=10, rate=100, posting_date=posting_date
+		)
+		self.assertFalse(self.get_buckets(item_code, warehouse))
+
+		# entries posted while disabled are included once built
+		with change_settings("Stock Settings", {"use_stock_qty_buckets": 1}):
+			self.assertTrue(is_stock_qty_bucket_built())
+			self.assertEqual(self.get_buckets(item_code, warehouse), {str(posting_date): 10})
+
+		self.assertFalse(self.get_buckets(item_code, warehouse))
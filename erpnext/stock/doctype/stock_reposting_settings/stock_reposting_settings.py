@@ -16,13 +16,18 @@ class StockRepostingSettings(Document):
 	if TYPE_CHECKING:
 		from frappe.types import DF
 
+		bulk_sle_write_back: DF.Check
 		end_time: DF.Time | None
 		item_based_reposting: DF.Check
 		limit_reposting_timeslot: DF.Check
 		limits_dont_apply_on: DF.Literal[
 			"", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"
 		]
+		max_parallel_repost_jobs: DF.Int
 		notify_reposting_error_to_role: DF.Link | None
+		parallel_reposting: DF.Check
+		repost_checkpoint_interval: DF.Int
+		sle_write_back_batch_size: DF.Int
 		start_time: DF.Time | None
 	# end: auto-generated types
 
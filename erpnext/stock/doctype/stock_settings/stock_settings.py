@@ -12,6 +12,7 @@ from frappe.utils import cint
 from frappe.utils.html_utils import clean_html
 
 from erpnext.stock.utils import check_pending_reposting
+from erpnext.utilities.summary_table import reset_summary_table
 
 
 class StockSettings(Document):
@@ -41,6 +42,7 @@ class StockSettings(Document):
 		auto_reserve_serial_and_batch: DF.Check
 		auto_reserve_stock_for_sales_order_on_purchase: DF.Check
 		clean_description_html: DF.Check
+		compact_stock_queue: DF.Check
 		default_warehouse: DF.Link | None
 		disable_serial_no_and_batch_selector: DF.Check
 		do_not_update_serial_batch_on_creation_of_auto_bundle: DF.Check
@@ -65,8 +67,12 @@ class StockSettings(Document):
 		stock_uom: DF.Link | None
 		update_existing_price_list_rate: DF.Check
 		update_price_list_based_on: DF.Literal["Rate", "Price List Rate"]
+		use_batch_balances: DF.Check
+		use_item_price_cache: DF.Check
 		use_naming_series: DF.Check
 		use_serial_batch_fields: DF.Check
+		use_serial_no_incoming_rates: DF.Check
+		use_stock_qty_buckets: DF.Check
 		valuation_method: DF.Literal["FIFO", "Moving Average", "LIFO"]
 	# end: auto-generated types
 
@@ -221,6 +227,39 @@ class StockSettings(Document):
 
 	def on_update(self):
 		self.toggle_warehouse_field_for_inter_warehouse_transfer()
+		self.reset_stock_qty_buckets()
+		self.reset_batch_balances()
+		self.reset_serial_no_incoming_rates()
+
+	def reset_stock_qty_buckets(self):
+		"""Stock ledger entries posted while disabled are not in the monthly minimums, so all the buckets
+		are built again from the stock ledger once enabled"""
+		reset_summary_table(
+			self,
+			"use_stock_qty_buckets",
+			"Stock Qty Bucket",
+			"erpnext.stock.doctype.stock_qty_bucket.stock_qty_bucket.build_stock_qty_buckets",
+		)
+
+	def reset_batch_balances(self):
+		"""Bundles submitted while disabled are missing from the batch balances, so the balances are built
+		again from all the bundles once enabled"""
+		reset_summary_table(
+			self,
+			"use_batch_balances",
+			"Batch Warehouse Balance",
+			"erpnext.stock.doctype.batch_warehouse_balance.batch_warehouse_balance.build_batch_warehouse_balances",
+		)
+
+	def reset_serial_no_incoming_rates(self):
+		"""Serial nos inwarded while disabled would be valued at an older incoming rate, so the latest inward
+		entries are looked up again from all the bundles once enabled"""
+		reset_summary_table(
+			self,
+			"use_serial_no_incoming_rates",
+			"Serial No Incoming Rate",
+			"erpnext.stock.doctype.serial_no_incoming_rate.serial_no_incoming_rate.build_serial_no_incoming_rates",
+		)
 
 	def change_precision_for_for_sales(self):
 		doc_before_save = self.get_doc_before_save()
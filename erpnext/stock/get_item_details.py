@@ -2,7 +2,11 @@
 # License: GNU General Public License v3. See license.txt
 
 
+import copy
+import datetime
 import json
+from collections import defaultdict
+from contextlib import contextmanager
 
 import frappe
 from frappe import _, throw
@@ -17,11 +21,19 @@ from erpnext.accounts.doctype.pricing_rule.pricing_rule import (
 	get_pricing_rule_for_item,
 	set_transaction_type,
 )
+from erpnext.accounts.doctype.pricing_rule.pricing_rule_index import casefold
+from erpnext.accounts.doctype.pricing_rule.utils import pricing_rule_batch
 from erpnext.setup.doctype.brand.brand import get_brand_defaults
 from erpnext.setup.doctype.item_group.item_group import get_item_group_defaults
 from erpnext.setup.utils import get_exchange_rate
 from erpnext.stock.doctype.item.item import get_item_defaults, get_uom_conv_factor
 from erpnext.stock.doctype.item_manufacturer.item_manufacturer import get_item_manufacturer_part_no
+from erpnext.stock.doctype.item_price.item_price_cache import (
+	clear_item_price_cache,
+	get_cached_item_prices,
+	get_item_prices,
+	is_item_price_cache_enabled,
+)
 from erpnext.stock.doctype.price_list.price_list import get_price_list_details
 
 sales_doctypes = ["Quotation", "Sales Order", "Delivery Note", "Sales Invoice", "POS Invoice"]
@@ -137,6 +149,71 @@ def get_item_details(args, doc=None, for_validate=False, overwrite_warehouse=Tru
 	return out
 
 
+@frappe.whitelist()
+def get_item_details_batch(args, items, doc=None, for_validate=False, overwrite_warehouse=True):
+	"""
+	Returns the `get_item_details` of each row of `items`, updated with the `args` shared by the rows.
+
+	args = {"company": "", "customer": "", "doctype": "", "transaction_date": None, ...}
+	items = [{"item_code": "", "qty": 1.0, "uom": "", "warehouse": None, "name": ""}, ...]
+
+	The Item Prices, Bins, UOM conversion factors and barcodes of the items are fetched for all the rows
+	together, and the Pricing Rules matched by a row are shared with the other rows.
+	"""
+	args = process_string_args(args)
+	items = process_string_args(items)
+
+	if isinstance(doc, str):
+		doc = json.loads(doc)
+
+	rows = []
+	for item in items:
+		row = copy.deepcopy(args)
+		row.update(item)
+		rows.append(process_args(row))
+
+	with item_details_batch([row.item_code for row in rows]), pricing_rule_batch():
+		return [get_item_details(row, doc, for_validate, overwrite_warehouse) for row in rows]
+
+
+@contextmanager
+def item_details_batch(item_codes):
+	"""Fetch the Item Prices, Bins, UOM conversion factors and barcodes of the items and their templates
+	together on first use, while getting the details of the items in the block."""
+	if frappe.flags.item_details_batch is not None:
+		yield
+		return
+
+	items = frappe.get_all(
+		"Item",
+		filters={"name": ("in", list(set(item_codes)))},
+		fields=["name", "variant_of", "default_item_manufacturer", "default_manufacturer_part_no"],
+	)
+
+	frappe.flags.item_details_batch = frappe._dict(
+		items={item.name: item for item in items},
+		item_codes=list({item.variant_of or item.name for item in items} | {item.name for item in items}),
+		values={},
+	)
+
+	try:
+		yield
+	finally:
+		frappe.flags.item_details_batch = None
+
+
+def get_batch_value(item_code, key, generator):
+	"""Returns the value fetched for all the items of the batch, None if the item is not in the batch."""
+	batch = frappe.flags.item_details_batch
+	if not batch or item_code not in batch.item_codes:
+		return None
+
+	if key not in batch.values:
+		batch.values[key] = generator(batch.item_codes)
+
+	return batch.values[key]
+
+
 def remove_standard_fields(details):
 	for key in child_table_fields + default_fields:
 		details.pop(key, None)
@@ -525,9 +602,13 @@ def get_basic_details(args, item, overwrite_warehouse=True):
 			out["manufacturer_part_no"] = None
 			out["manufacturer"] = None
 	else:
-		data = frappe.get_value(
-			"Item", item.name, ["default_item_manufacturer", "default_manufacturer_part_no"], as_dict=1
-		)
+		batch = frappe.flags.item_details_batch
+		if batch and item.name in batch.items:
+			data = batch.items[item.name]
+		else:
+			data = frappe.get_value(
+				"Item", item.name, ["default_item_manufacturer", "default_manufacturer_part_no"], as_dict=1
+			)
 
 		if data:
 			out.update(
@@ -605,7 +686,11 @@ def get_barcode_data(items_list=None, item_code=None):
 		items_list = [frappe._dict(_dict_item_code)]
 
 	for item in items_list:
-		barcodes = frappe.db.get_all("Item Barcode", filters={"parent": item.item_code}, fields="barcode")
+		barcodes = get_batch_value(item.item_code, "Item Barcode", get_barcodes)
+		if barcodes is None:
+			barcodes = frappe.db.get_all("Item Barcode", filters={"parent": item.item_code}, fields="barcode")
+		else:
+			barcodes = barcodes.get(item.item_code, [])
 
 		for barcode in barcodes:
 			if item.item_code not in itemwise_barcode:
@@ -615,6 +700,16 @@ def get_barcode_data(items_list=None, item_code=None):
 	return itemwise_barcode
 
 
+def get_barcodes(item_codes):
+	barcodes = defaultdict(list)
+	for row in frappe.db.get_all(
+		"Item Barcode", filters={"parent": ("in", item_codes)}, fields=["parent", "barcode"]
+	):
+		barcodes[row.pop("parent")].append(row)
+
+	return barcodes
+
+
 @frappe.whitelist()
 def get_item_tax_info(company, tax_category, item_codes, item_rates=None, item_tax_templates=None):
 	out = {}
@@ -956,6 +1051,10 @@ def insert_item_price(args):
 	):
 		return
 
+	if frappe.flags.item_details_batch:
+		# refetched by the next items of the batch
+		frappe.flags.item_details_batch.values.pop(("Item Price", args.price_list), None)
+
 	item_price = frappe.db.get_value(
 		"Item Price",
 		{
@@ -981,6 +1080,7 @@ def insert_item_price(args):
 			return
 
 		frappe.db.set_value("Item Price", item_price.name, "price_list_rate", price_list_rate)
+		clear_item_price_cache(args.price_list, [args.item_code])
 		frappe.msgprint(
 			_("Item Price updated for {0} in Price List {1}").format(args.item_code, args.price_list),
 			alert=True,
@@ -1023,6 +1123,19 @@ def get_item_price(args, item_code, ignore_party=False, force_batch_no=False) ->
 	:param item_code: str, Item Doctype field item_code
 	"""
 
+	item_prices = get_batch_value(
+		item_code,
+		("Item Price", args.get("price_list")),
+		lambda item_codes: get_item_prices(item_codes, args.get("price_list")),
+	)
+	if item_prices is not None:
+		item_prices = item_prices.get(casefold(item_code), [])
+	elif is_item_price_cache_enabled():
+		item_prices = get_cached_item_prices(item_code, args.get("price_list"))
+
+	if item_prices is not None:
+		return filter_item_prices(item_prices, args, ignore_party, force_batch_no)
+
 	ip = frappe.qb.DocType("Item Price")
 	query = (
 		frappe.qb.from_(ip)
@@ -1059,6 +1172,53 @@ def get_item_price(args, item_code, ignore_party=False, force_batch_no=False) ->
 	return query.run()
 
 
+def filter_item_prices(item_prices, args, ignore_party=False, force_batch_no=False) -> list[tuple]:
+	"""Returns the Item Prices of an item which match the conditions of `get_item_price`, in its order.
+
+	The values are compared casefolded, like the case-insensitive collation of the query."""
+	transaction_date = getdate(args["transaction_date"]) if args.get("transaction_date") else None
+	uom, batch_no = casefold(args.get("uom")), casefold(args.get("batch_no"))
+
+	def is_applicable(item_price):
+		if casefold(item_price.uom) not in ("", uom):
+			return False
+
+		if force_batch_no:
+			if args.get("batch_no") is None or casefold(item_price.batch_no) != batch_no:
+				return False
+		elif casefold(item_price.batch_no) not in ("", batch_no):
+			return False
+
+		if not ignore_party:
+			if args.get("customer"):
+				if casefold(item_price.customer) != casefold(args.get("customer")):
+					return False
+			elif args.get("supplier"):
+				if casefold(item_price.supplier) != casefold(args.get("supplier")):
+					return False
+			elif item_price.customer or item_price.supplier:
+				return False
+
+		if transaction_date:
+			valid_from = getdate(item_price.valid_from or "2000-01-01")
+			valid_upto = getdate(item_price.valid_upto or "2500-12-31")
+			return valid_from <= transaction_date <= valid_upto
+
+		return True
+
+	item_prices = sorted(
+		filter(is_applicable, item_prices),
+		key=lambda item_price: (
+			item_price.valid_from or datetime.date.min,
+			item_price.batch_no or "",
+			item_price.uom or "",
+		),
+		reverse=True,
+	)
+
+	return [(item_price.name, item_price.price_list_rate, item_price.uom) for item_price in item_prices]
+
+
 @frappe.whitelist()
 def get_batch_based_item_price(params, item_code) -> float:
 	if isinstance(params, str):
@@ -1140,7 +1300,22 @@ def check_packing_list(price_list_rate_name, desired_qty, item_code):
 	"""
 
 	flag = True
-	item_price = frappe.get_doc("Item Price", price_list_rate_name)
+	item_price = None
+
+	batch = frappe.flags.item_details_batch
+	if batch:
+		for key, item_prices in batch.values.items():
+			if isinstance(key, tuple) and key[0] == "Item Price":
+				item_price = next(
+					(d for d in item_prices.get(casefold(item_code), []) if d.name == price_list_rate_name),
+					None,
+				)
+				if item_price:
+					break
+
+	if not item_price:
+		item_price = frappe.get_doc("Item Price", price_list_rate_name)
+
 	if item_price.packing_unit:
 		packing_increment = desired_qty % item_price.packing_unit
 
@@ -1282,7 +1457,17 @@ def get_conversion_factor(item_code, uom):
 
 	if variant_of:
 		filters["parent"] = ("in", (item_code, variant_of))
-	conversion_factor = frappe.get_all("UOM Conversion Detail", filters, pluck="conversion_factor")
+
+	conversion_factors = get_batch_value(item_code, "UOM Conversion Detail", get_conversion_factors)
+	if conversion_factors is not None:
+		parents = (casefold(item_code), casefold(variant_of))
+		conversion_factor = [
+			row.conversion_factor
+			for row in conversion_factors
+			if casefold(row.parent) in parents and casefold(row.uom) == casefold(uom)
+		]
+	else:
+		conversion_factor = frappe.get_all("UOM Conversion Detail", filters, pluck="conversion_factor")
 	if not conversion_factor:
 		stock_uom = frappe.db.get_value("Item", item_code, "stock_uom")
 		conversion_factor = [get_uom_conv_factor(uom, stock_uom) or 1]
@@ -1290,6 +1475,15 @@ def get_conversion_factor(item_code, uom):
 	return {"conversion_factor": conversion_factor[-1]}
 
 
+def get_conversion_factors(item_codes):
+	# in the order of the query of `get_conversion_factor`
+	return frappe.get_all(
+		"UOM Conversion Detail",
+		filters={"parent": ("in", item_codes)},
+		fields=["parent", "uom", "conversion_factor"],
+	)
+
+
 @frappe.whitelist()
 def get_projected_qty(item_code, warehouse):
 	return {
@@ -1308,18 +1502,36 @@ def get_bin_details(item_code, warehouse, company=None, include_child_warehouses
 
 		from erpnext.stock.doctype.warehouse.warehouse import get_child_warehouses
 
-		warehouses = get_child_warehouses(warehouse) if include_child_warehouses else [warehouse]
+		warehouses = [warehouse]
+		if include_child_warehouses:
+			warehouses = get_batch_value(
+				item_code, ("child warehouses", warehouse), lambda item_codes: get_child_warehouses(warehouse)
+			)
+			if warehouses is None:
+				warehouses = get_child_warehouses(warehouse)
+
+		bins = None
+		if len(warehouses) == 1:
+			# the sums of the child warehouses of a group warehouse are left to the query
+			bins = get_batch_value(
+				item_code, ("Bin", warehouse), lambda item_codes: get_bins(item_codes, warehouse)
+			)
 
-		bin = frappe.qb.DocType("Bin")
-		bin_details = (
-			frappe.qb.from_(bin)
-			.select(
-				Coalesce(Sum(bin.projected_qty), 0).as_("projected_qty"),
-				Coalesce(Sum(bin.actual_qty), 0).as_("actual_qty"),
-				Coalesce(Sum(bin.reserved_qty), 0).as_("reserved_qty"),
+		if bins is not None:
+			bin_details = frappe._dict(
+				bins.get(item_code) or {"projected_qty": 0, "actual_qty": 0, "reserved_qty": 0}
 			)
-			.where((bin.item_code == item_code) & (bin.warehouse.isin(warehouses)))
-		).run(as_dict=True)[0]
+		else:
+			bin = frappe.qb.DocType("Bin")
+			bin_details = (
+				frappe.qb.from_(bin)
+				.select(
+					Coalesce(Sum(bin.projected_qty), 0).as_("projected_qty"),
+					Coalesce(Sum(bin.actual_qty), 0).as_("actual_qty"),
+					Coalesce(Sum(bin.reserved_qty), 0).as_("reserved_qty"),
+				)
+				.where((bin.item_code == item_code) & (bin.warehouse.isin(warehouses)))
+			).run(as_dict=True)[0]
 
 	if company:
 		bin_details["company_total_stock"] = get_company_total_stock(item_code, company)
@@ -1327,6 +1539,17 @@ def get_bin_details(item_code, warehouse, company=None, include_child_warehouses
 	return bin_details
 
 
+def get_bins(item_codes, warehouse):
+	bin = frappe.qb.DocType("Bin")
+	bins = (
+		frappe.qb.from_(bin)
+		.select(bin.item_code, bin.projected_qty, bin.actual_qty, bin.reserved_qty)
+		.where(bin.item_code.isin(item_codes) & (bin.warehouse == warehouse))
+	).run(as_dict=True)
+
+	return {row.pop("item_code"): row for row in bins}
+
+
 def get_company_total_stock(item_code, company):
 	bin = frappe.qb.DocType("Bin")
 	wh = frappe.qb.DocType("Warehouse")
@@ -8,6 +8,10 @@ from frappe import _
 from frappe.query_builder.functions import Sum
 from frappe.utils import flt, get_datetime, today
 
+from erpnext.stock.doctype.batch_warehouse_balance.batch_warehouse_balance import (
+	is_batch_balance_built,
+)
+
 
 def execute(filters=None):
 	columns, data = [], []
@@ -120,6 +124,9 @@ def get_batchwise_data_from_stock_ledger(filters):
 
 
 def get_batchwise_data_from_serial_batch_bundle(batchwise_data, filters):
+	if filters.to_date == today() and is_batch_balance_built():
+		return get_batchwise_data_from_batch_balances(batchwise_data, filters)
+
 	table = frappe.qb.DocType("Stock Ledger Entry")
 	ch_table = frappe.qb.DocType("Serial and Batch Entry")
 	batch = frappe.qb.DocType("Batch")
@@ -153,6 +160,36 @@ def get_batchwise_data_from_serial_batch_bundle(batchwise_data, filters):
 	return batchwise_data
 
 
+def get_batchwise_data_from_batch_balances(batchwise_data, filters):
+	table = frappe.qb.DocType("Batch Warehouse Balance")
+	batch = frappe.qb.DocType("Batch")
+
+	query = (
+		frappe.qb.from_(table)
+		.inner_join(batch)
+		.on(table.batch_no == batch.name)
+		.select(
+			table.item_code,
+			table.batch_no,
+			table.warehouse,
+			batch.expiry_date,
+			table.qty.as_("balance_qty"),
+		)
+		.where(table.qty != 0)
+	)
+
+	query = get_query_based_on_filters(query, batch, table, filters)
+
+	for d in query.run(as_dict=True):
+		key = (d.item_code, d.warehouse, d.batch_no)
+		if key in batchwise_data:
+			batchwise_data[key].balance_qty += flt(d.balance_qty)
+		else:
+			batchwise_data.setdefault(key, d)
+
+	return batchwise_data
+
+
 def get_query_based_on_filters(query, batch, table, filters):
 	if filters.item_code:
 		query = query.where(table.item_code == filters.item_code)
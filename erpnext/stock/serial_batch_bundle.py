@@ -2,9 +2,19 @@ from collections import defaultdict
 
 import frappe
 from frappe import _, bold
-from frappe.model.naming import make_autoname
 from frappe.query_builder.functions import CombineDatetime, Sum, Timestamp
-from frappe.utils import add_days, cint, cstr, flt, get_link_to_form, now, nowtime, today
+from frappe.utils import (
+	add_days,
+	cint,
+	create_batch,
+	cstr,
+	flt,
+	get_combine_datetime,
+	get_link_to_form,
+	now,
+	nowtime,
+	today,
+)
 from pypika import Order
 from pypika.terms import ExistsCriterion
 
@@ -12,7 +22,22 @@ from erpnext.stock.deprecated_serial_batch import (
 	DeprecatedBatchNoValuation,
 	DeprecatedSerialNoValuation,
 )
+from erpnext.stock.doctype.batch_warehouse_balance.batch_warehouse_balance import (
+	get_batch_balances,
+	get_voucher_batch_values,
+	is_balance_before_entry,
+	is_batch_balance_built,
+)
+from erpnext.stock.doctype.serial_no_incoming_rate.serial_no_incoming_rate import (
+	SERIAL_NO_BATCH_SIZE,
+	get_inward_entries_query,
+	get_latest_inward_entries,
+	get_serial_no_incoming_rates,
+	is_entry_applicable,
+	is_serial_no_incoming_rate_built,
+)
 from erpnext.stock.valuation import round_off_if_near_zero
+from erpnext.utilities.naming import make_autonames
 
 
 class SerialBatchBundle:
@@ -413,37 +438,46 @@ class SerialBatchBundle:
 		query.run()
 
 	def update_serial_no_status_for_stock_reco(self, serial_nos):
-		for serial_no in serial_nos:
-			sle_doctype = frappe.qb.DocType("Stock Ledger Entry")
-			sn_table = frappe.qb.DocType("Serial and Batch Entry")
-
-			query = (
-				frappe.qb.from_(sle_doctype)
-				.inner_join(sn_table)
-				.on(sle_doctype.serial_and_batch_bundle == sn_table.parent)
-				.select(
-					sle_doctype.warehouse,
-					sle_doctype.actual_qty,
-					sle_doctype.voucher_type,
-					sle_doctype.voucher_no,
-					sle_doctype.is_cancelled,
-					sle_doctype.item_code,
-					sle_doctype.posting_date,
-					sle_doctype.company,
-				)
-				.where(
-					(sn_table.serial_no == serial_no)
-					& (sle_doctype.is_cancelled == 0)
-					& (sn_table.docstatus == 1)
-				)
-				.orderby(sle_doctype.posting_datetime, order=Order.desc)
-				.orderby(sle_doctype.creation, order=Order.desc)
-				.limit(1)
+		sle_doctype = frappe.qb.DocType("Stock Ledger Entry")
+		sn_table = frappe.qb.DocType("Serial and Batch Entry")
+
+		query = (
+			frappe.qb.from_(sle_doctype)
+			.inner_join(sn_table)
+			.on(sle_doctype.serial_and_batch_bundle == sn_table.parent)
+			.select(
+				sn_table.serial_no,
+				sle_doctype.name,
+				sle_doctype.warehouse,
+				sle_doctype.actual_qty,
+				sle_doctype.voucher_type,
+				sle_doctype.voucher_no,
+				sle_doctype.is_cancelled,
+				sle_doctype.item_code,
+				sle_doctype.posting_date,
+				sle_doctype.company,
+			)
+			.where(
+				(sn_table.serial_no.isin(serial_nos))
+				& (sle_doctype.is_cancelled == 0)
+				& (sn_table.docstatus == 1)
 			)
+			.orderby(sle_doctype.posting_datetime, order=Order.desc)
+			.orderby(sle_doctype.creation, order=Order.desc)
+		)
+
+		# latest entry of each serial no, serial nos of the same entry are updated together
+		latest_sle = {}
+		sle_serial_nos = defaultdict(list)
+		for row in query.run(as_dict=1):
+			if row.serial_no in latest_sle:
+				continue
+
+			latest_sle[row.serial_no] = row
+			sle_serial_nos[row.name].append(row.serial_no)
 
-			sle = query.run(as_dict=1)
-			if sle:
-				self.update_serial_no_status_warehouse(sle[0], serial_no)
+		for serial_nos_of_sle in sle_serial_nos.values():
+			self.update_serial_no_status_warehouse(latest_sle[serial_nos_of_sle[0]], serial_nos_of_sle)
 
 	def set_batch_no_in_serial_nos(self):
 		entries = frappe.get_all(
@@ -556,36 +590,63 @@ class SerialNoValuation(DeprecatedSerialNoValuation):
 			self.stock_value_change = 0.0
 
 			serial_nos = self.get_serial_nos()
-			for serial_no in serial_nos:
-				incoming_rate = self.get_incoming_rate_from_bundle(serial_no)
-				if incoming_rate is None:
-					continue
-
+			for serial_no, incoming_rate in self.get_incoming_rates_from_bundles(serial_nos).items():
 				self.stock_value_change += incoming_rate
 				self.serial_no_incoming_rate[serial_no] += incoming_rate
 
 			self.calculate_stock_value_from_deprecarated_ledgers()
 
 	def get_incoming_rate_from_bundle(self, serial_no) -> float:
+		return self.get_incoming_rates_from_bundles([serial_no]).get(serial_no)
+
+	def get_incoming_rates_from_bundles(self, serial_nos) -> dict:
+		"""Returns the incoming rate of the latest inward entry of each serial no in the warehouse,
+		the serial nos without any inward entry are not included."""
+		if self.sle.posting_date and self.sle.posting_time is None:
+			self.sle.posting_time = nowtime()
+
+		incoming_rates = {}
+		if is_serial_no_incoming_rate_built():
+			incoming_rates, serial_nos = self.get_incoming_rates_from_inward_entries(serial_nos)
+
+		for batch in create_batch(serial_nos, SERIAL_NO_BATCH_SIZE):
+			incoming_rates.update(self.get_incoming_rates_from_bundle_entries(batch))
+
+		return incoming_rates
+
+	def get_incoming_rates_from_inward_entries(self, serial_nos) -> tuple[dict, list]:
+		"""Returns the incoming rates of the serial nos whose latest inward entry can be used for the
+		entry, along with the remaining serial nos which have to be looked up from the bundles."""
+		posting_datetime = None
+		if self.sle.posting_date:
+			posting_datetime = get_combine_datetime(self.sle.posting_date, self.sle.posting_time)
+
+		inward_entries = get_serial_no_incoming_rates(serial_nos)
+
+		incoming_rates, remaining_serial_nos = {}, []
+		for serial_no in serial_nos:
+			entry = inward_entries.get(serial_no)
+			if not entry:
+				# never inwarded with a bundle
+				continue
+
+			if is_entry_applicable(
+				entry, self.sle.item_code, self.sle.warehouse, self.sle.voucher_no, posting_datetime
+			):
+				incoming_rates[serial_no] = flt(entry.incoming_rate)
+			else:
+				remaining_serial_nos.append(serial_no)
+
+		return incoming_rates, remaining_serial_nos
+
+	def get_incoming_rates_from_bundle_entries(self, serial_nos) -> dict:
 		bundle = frappe.qb.DocType("Serial and Batch Bundle")
 		bundle_child = frappe.qb.DocType("Serial and Batch Entry")
 
-		query = (
-			frappe.qb.from_(bundle)
-			.inner_join(bundle_child)
-			.on(bundle.name == bundle_child.parent)
-			.select((bundle_child.incoming_rate * bundle_child.qty).as_("incoming_rate"))
-			.where(
-				(bundle.is_cancelled == 0)
-				& (bundle.docstatus == 1)
-				& (bundle_child.serial_no == serial_no)
-				& (bundle.type_of_transaction == "Inward")
-				& (bundle_child.qty > 0)
-				& (bundle.item_code == self.sle.item_code)
-				& (bundle_child.warehouse == self.sle.warehouse)
-			)
-			.orderby(Timestamp(bundle.posting_date, bundle.posting_time), order=Order.desc)
-			.limit(1)
+		query = get_inward_entries_query().where(
+			(bundle_child.serial_no.isin(serial_nos))
+			& (bundle.item_code == self.sle.item_code)
+			& (bundle_child.warehouse == self.sle.warehouse)
 		)
 
 		# Important to exclude the current voucher to calculate correct the stock value difference
@@ -593,17 +654,16 @@ class SerialNoValuation(DeprecatedSerialNoValuation):
 			query = query.where(bundle.voucher_no != self.sle.voucher_no)
 
 		if self.sle.posting_date:
-			if self.sle.posting_time is None:
-				self.sle.posting_time = nowtime()
-
 			timestamp_condition = CombineDatetime(
 				bundle.posting_date, bundle.posting_time
 			) <= CombineDatetime(self.sle.posting_date, self.sle.posting_time)
 
 			query = query.where(timestamp_condition)
 
-		incoming_rate = query.run()
-		return flt(incoming_rate[0][0]) if incoming_rate else None
+		return {
+			serial_no: flt(entry.incoming_rate)
+			for serial_no, entry in get_latest_inward_entries(query).items()
+		}
 
 	def get_serial_nos(self):
 		if self.sle.get("serial_nos"):
@@ -689,6 +749,61 @@ class BatchNoValuation(DeprecatedBatchNoValuation):
 		if not self.batchwise_valuation_batches:
 			return []
 
+		ledgers, batches = [], self.batchwise_valuation_batches
+		if is_batch_balance_built():
+			ledgers, batches = self.get_batch_no_ledgers_from_balances(batches)
+
+		if batches:
+			ledgers.extend(self.get_batch_no_ledgers_from_bundles(batches))
+
+		return ledgers
+
+	def get_batch_no_ledgers_from_balances(self, batches) -> tuple[list[dict], list]:
+		"""Returns the ledgers of the batches whose balance is posted before the entry, along with the
+		remaining batches which have to be aggregated from the bundles."""
+		posting_datetime = None
+		if self.sle.posting_date:
+			if self.sle.posting_time is None:
+				self.sle.posting_time = nowtime()
+
+			posting_datetime = get_combine_datetime(self.sle.posting_date, self.sle.posting_time)
+
+		balances = get_batch_balances(self.sle.warehouse, batches)
+		balance_batches = [
+			batch_no
+			for batch_no in batches
+			if batch_no not in balances
+			or is_balance_before_entry(
+				balances[batch_no], posting_datetime, self.sle.creation, self.sle.voucher_detail_no
+			)
+		]
+
+		# balances include the bundles of the current voucher, which are excluded from the valuation
+		voucher_values = get_voucher_batch_values(
+			self.sle.item_code,
+			self.sle.warehouse,
+			balance_batches,
+			voucher_detail_no=self.sle.voucher_detail_no,
+			voucher_no=self.sle.voucher_no,
+		)
+
+		ledgers = []
+		for batch_no in balance_batches:
+			if batch_no not in balances:
+				continue
+
+			voucher_value = voucher_values.get(batch_no) or frappe._dict(qty=0.0, stock_value=0.0)
+			ledgers.append(
+				frappe._dict(
+					batch_no=batch_no,
+					incoming_rate=flt(balances[batch_no].stock_value) - flt(voucher_value.stock_value),
+					qty=flt(balances[batch_no].qty) - flt(voucher_value.qty),
+				)
+			)
+
+		return ledgers, [batch_no for batch_no in batches if batch_no not in balance_batches]
+
+	def get_batch_no_ledgers_from_bundles(self, batches) -> list[dict]:
 		parent = frappe.qb.DocType("Serial and Batch Bundle")
 		child = frappe.qb.DocType("Serial and Batch Entry")
 
@@ -717,7 +832,7 @@ class BatchNoValuation(DeprecatedBatchNoValuation):
 				Sum(child.qty).as_("qty"),
 			)
 			.where(
-				(child.batch_no.isin(self.batchwise_valuation_batches))
+				(child.batch_no.isin(batches))
 				& (parent.warehouse == self.sle.warehouse)
 				& (parent.item_code == self.sle.item_code)
 				& (parent.docstatus == 1)
@@ -1106,10 +1221,14 @@ class SerialBatchCreation:
 			self.batches = frappe._dict({self.batch_no: abs(self.actual_qty)})
 
 	def make_serial_no_if_not_exists(self):
-		non_exists_serial_nos = []
-		for row in self.serial_nos:
-			if not frappe.db.exists("Serial No", row):
-				non_exists_serial_nos.append(row)
+		# names are compared case-insensitively like the database does
+		existing_serial_nos = {
+			serial_no.lower()
+			for serial_no in frappe.get_all(
+				"Serial No", filters={"name": ("in", self.serial_nos)}, pluck="name"
+			)
+		}
+		non_exists_serial_nos = [row for row in self.serial_nos if row.lower() not in existing_serial_nos]
 
 		if non_exists_serial_nos:
 			self.make_serial_nos(non_exists_serial_nos)
@@ -1240,8 +1359,7 @@ class SerialBatchCreation:
 		if self.get("voucher_no"):
 			voucher_no = self.get("voucher_no")
 
-		for _i in range(abs(cint(self.actual_qty))):
-			serial_no = make_autoname(self.serial_no_series, "Serial No")
+		for serial_no in make_autonames(self.serial_no_series, abs(cint(self.actual_qty)), "Serial No"):
 			sr_nos.append(serial_no)
 			serial_nos_details.append(
 				(
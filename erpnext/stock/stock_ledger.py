@@ -8,7 +8,7 @@ import json
 import frappe
 from frappe import _, bold, scrub
 from frappe.model.meta import get_field_precision
-from frappe.query_builder.functions import Sum
+from frappe.query_builder.functions import IfNull, Sum
 from frappe.utils import (
 	cint,
 	cstr,
@@ -23,11 +23,28 @@ from frappe.utils import (
 )
 
 import erpnext
+from erpnext.stock.doctype.batch_warehouse_balance.batch_warehouse_balance import (
+	get_bundle_batch_values,
+	is_batch_balance_enabled,
+	update_batch_balance_values,
+)
 from erpnext.stock.doctype.bin.bin import update_qty as update_bin_qty
 from erpnext.stock.doctype.inventory_dimension.inventory_dimension import get_inventory_dimensions
 from erpnext.stock.doctype.serial_and_batch_bundle.serial_and_batch_bundle import (
 	get_available_batches,
 )
+from erpnext.stock.doctype.serial_no_incoming_rate.serial_no_incoming_rate import (
+	update_serial_no_incoming_rate_values,
+)
+from erpnext.stock.doctype.stock_qty_bucket.stock_qty_bucket import (
+	build_buckets,
+	get_bucket_end,
+	get_bucket_start,
+	get_negative_buckets,
+	is_stock_qty_bucket_built,
+	is_stock_qty_bucket_enabled,
+	update_buckets_for_qty_shift,
+)
 from erpnext.stock.doctype.stock_reservation_entry.stock_reservation_entry import (
 	get_sre_reserved_batch_nos_details,
 	get_sre_reserved_serial_nos_details,
@@ -41,7 +58,12 @@ from erpnext.stock.utils import (
 	get_stock_balance,
 	get_valuation_method,
 )
-from erpnext.stock.valuation import FIFOValuation, LIFOValuation, round_off_if_near_zero
+from erpnext.stock.valuation import (
+	FIFOValuation,
+	LIFOValuation,
+	get_stock_queue_bins,
+	round_off_if_near_zero,
+)
 
 
 class NegativeStockError(frappe.ValidationError):
@@ -52,6 +74,22 @@ class SerialNoExistsInFutureTransaction(frappe.ValidationError):
 	pass
 
 
+SLE_WRITE_BACK_BATCH_SIZE = 500
+
+# Fields of Stock Ledger Entry which are recalculated by update_entries_after.process_sle
+SLE_WRITE_BACK_FIELDS = (
+	"actual_qty",
+	"incoming_rate",
+	"outgoing_rate",
+	"qty_after_transaction",
+	"valuation_rate",
+	"stock_value",
+	"stock_value_difference",
+	"stock_queue",
+	"is_cancelled",
+)
+
+
 def make_sl_entries(sl_entries, allow_negative_stock=False, via_landed_cost_voucher=False):
 	"""Create SL entries from SL entry dicts
 
@@ -74,6 +112,9 @@ def make_sl_entries(sl_entries, allow_negative_stock=False, via_landed_cost_vouc
 		args = get_args_for_future_sle(sl_entries[0])
 		future_sle_exists(args, sl_entries)
 
+		# changes to the bins are merged and written once for each bin after all the entries
+		bin_updates = {}
+
 		for sle in sl_entries:
 			if sle.serial_no and not via_landed_cost_voucher:
 				validate_serial_no(sle)
@@ -105,17 +146,42 @@ def make_sl_entries(sl_entries, allow_negative_stock=False, via_landed_cost_vouc
 
 			is_stock_item = frappe.get_cached_value("Item", args.get("item_code"), "is_stock_item")
 			if is_stock_item:
-				bin_name = get_or_make_bin(args.get("item_code"), args.get("warehouse"))
-				args.reserved_stock = flt(frappe.db.get_value("Bin", bin_name, "reserved_stock"))
-				repost_current_voucher(args, allow_negative_stock, via_landed_cost_voucher)
-				update_bin_qty(bin_name, args)
+				bin_update = get_bin_update(bin_updates, args)
+				args.reserved_stock = bin_update.reserved_stock
+				repost_current_voucher(args, allow_negative_stock, via_landed_cost_voucher, bin_updates)
+				bin_update.args = args
 			else:
 				frappe.msgprint(
 					_("Item {0} ignored since it is not a stock item").format(args.get("item_code"))
 				)
 
+		update_bins(bin_updates)
 
-def repost_current_voucher(args, allow_negative_stock=False, via_landed_cost_voucher=False):
+
+def get_bin_update(bin_updates, args):
+	key = (args.get("item_code"), args.get("warehouse"))
+	if key not in bin_updates:
+		bin_name = get_or_make_bin(*key)
+		bin_updates[key] = frappe._dict(
+			{
+				"bin_name": bin_name,
+				"reserved_stock": flt(frappe.db.get_value("Bin", bin_name, "reserved_stock")),
+				"values": {},
+			}
+		)
+
+	return bin_updates[key]
+
+
+def update_bins(bin_updates):
+	"""Write each bin once, in the order of item and warehouse so that concurrent
+	transactions lock the common bins in the same order."""
+	for key in sorted(bin_updates):
+		bin_update = bin_updates[key]
+		update_bin_qty(bin_update.bin_name, bin_update.args, bin_update.values)
+
+
+def repost_current_voucher(args, allow_negative_stock=False, via_landed_cost_voucher=False, bin_updates=None):
 	if args.get("actual_qty") or args.get("voucher_type") == "Stock Reconciliation":
 		if not args.get("posting_date"):
 			args["posting_date"] = nowdate()
@@ -137,6 +203,7 @@ def repost_current_voucher(args, allow_negative_stock=False, via_landed_cost_vou
 				},
 				allow_negative_stock=allow_negative_stock,
 				via_landed_cost_voucher=via_landed_cost_voucher,
+				bin_updates=bin_updates,
 			)
 
 		# update qty in future sle and Validate negative qty
@@ -243,6 +310,7 @@ def repost_future_sle(
 	allow_negative_stock=None,
 	via_landed_cost_voucher=False,
 	doc=None,
+	partition_idx=None,
 ):
 	if not args:
 		args = []  # set args to empty list if None to avoid enumerate error
@@ -251,6 +319,10 @@ def repost_future_sle(
 	if doc and doc.reposting_data_file:
 		reposting_data = get_reposting_data(doc.reposting_data_file)
 
+	if partition_idx is not None:
+		# partition of a parallel repost, progress is tracked separately for each partition
+		reposting_data = frappe._dict(reposting_data.partitions[partition_idx])
+
 	items_to_be_repost = get_items_to_be_repost(
 		voucher_type=voucher_type, voucher_no=voucher_no, doc=doc, reposting_data=reposting_data
 	)
@@ -259,8 +331,34 @@ def repost_future_sle(
 
 	distinct_item_warehouses = get_distinct_item_warehouse(args, doc, reposting_data=reposting_data)
 	affected_transactions = get_affected_transactions(doc, reposting_data=reposting_data)
+	write_back_settings = get_sle_write_back_settings(doc)
+	checkpoint_interval = get_repost_checkpoint_interval(doc)
+
+	def save_progress(index, transactions):
+		if partition_idx is not None:
+			update_partition_in_repost_item_valuation(
+				doc, partition_idx, index, args, distinct_item_warehouses, transactions
+			)
+		else:
+			update_args_in_repost_item_valuation(doc, index, args, distinct_item_warehouses, transactions)
+
+	def save_checkpoint(sle, transactions):
+		# resume the current item-warehouse from this entry, the entries before it are already reposted
+		args[i] = frappe._dict(
+			args[i], posting_date=sle.posting_date, posting_time=sle.posting_time, creation=sle.creation
+		)
+		# the dependent item-warehouses found before the checkpoint are not found again once resumed
+		add_dependent_item_warehouses(args, distinct_item_warehouses)
+		save_progress(i, affected_transactions | transactions)
+
+	if partition_idx is not None:
+		i = cint(reposting_data.current_index)
+	else:
+		i = get_current_index(doc) or 0
+
+	# dependent item-warehouses saved in a checkpoint without their position in args
+	add_dependent_item_warehouses(args, distinct_item_warehouses)
 
-	i = get_current_index(doc) or 0
 	while i < len(args):
 		validate_item_warehouse(args[i])
 
@@ -274,6 +372,9 @@ def repost_future_sle(
 				"distinct_item_warehouses": distinct_item_warehouses,
 				"items_to_be_repost": args,
 				"current_index": i,
+				"checkpoint_interval": checkpoint_interval,
+				"on_checkpoint": save_checkpoint if doc else None,
+				**write_back_settings,
 			},
 			allow_negative_stock=allow_negative_stock,
 			via_landed_cost_voucher=via_landed_cost_voucher,
@@ -285,22 +386,50 @@ def repost_future_sle(
 			distinct_item_warehouses[key].reposting_status = True
 
 		if obj.new_items_found:
-			for _item_wh, data in distinct_item_warehouses.items():
-				if ("args_idx" not in data and not data.reposting_status) or (
-					data.sle_changed and data.reposting_status
-				):
-					data.args_idx = len(args)
-					args.append(data.sle)
-				elif data.sle_changed and not data.reposting_status:
-					args[data.args_idx] = data.sle
-
-				data.sle_changed = False
+			add_dependent_item_warehouses(args, distinct_item_warehouses)
 		i += 1
 
 		if doc:
-			update_args_in_repost_item_valuation(
-				doc, i, args, distinct_item_warehouses, affected_transactions
-			)
+			save_progress(i, affected_transactions)
+
+
+def add_dependent_item_warehouses(args, distinct_item_warehouses):
+	"""Add the item-warehouses found to depend on the reposted entries to args, or move them to the earlier
+	entry found, and keep their position in args."""
+	for _item_wh, data in distinct_item_warehouses.items():
+		if ("args_idx" not in data and not data.reposting_status) or (
+			data.sle_changed and data.reposting_status
+		):
+			data.args_idx = len(args)
+			args.append(data.sle)
+		elif data.sle_changed and not data.reposting_status:
+			args[data.args_idx] = data.sle
+
+		data.sle_changed = False
+
+
+def get_sle_write_back_settings(doc=None) -> dict:
+	"""Bulk write-back is only used while reposting through Repost Item Valuation,
+	where each item-warehouse is committed as a whole."""
+	if not doc:
+		return {}
+
+	settings = frappe.get_cached_doc("Stock Reposting Settings")
+	if not settings.bulk_sle_write_back:
+		return {}
+
+	return {
+		"bulk_write_back": True,
+		"write_back_batch_size": cint(settings.sle_write_back_batch_size) or SLE_WRITE_BACK_BATCH_SIZE,
+	}
+
+
+def get_repost_checkpoint_interval(doc=None) -> int:
+	"""Number of entries of an item-warehouse after which the reposting progress is saved."""
+	if not doc:
+		return 0
+
+	return cint(frappe.get_cached_doc("Stock Reposting Settings").repost_checkpoint_interval)
 
 
 def get_reposting_data(file_path) -> dict:
@@ -393,6 +522,54 @@ def update_args_in_repost_item_valuation(doc, index, args, distinct_item_warehou
 	)
 
 
+def update_partition_in_repost_item_valuation(
+	doc, partition_idx, index, args, distinct_item_warehouses, affected_transactions
+):
+	"""Save the progress of one partition of a parallel repost in the reposting file."""
+
+	# partitions of the same entry share the reposting file, lock the entry before updating it
+	frappe.db.get_value(doc.doctype, doc.name, "name", for_update=True)
+	doc.reposting_data_file = frappe.db.get_value(doc.doctype, doc.name, "reposting_data_file")
+
+	reposting_data = get_reposting_data(doc.reposting_data_file)
+	reposting_data.partitions[partition_idx].update(
+		{
+			"items_to_be_repost": args,
+			"distinct_item_and_warehouse": {str(k): v for k, v in distinct_item_warehouses.items()},
+			"affected_transactions": affected_transactions,
+			"current_index": index,
+		}
+	)
+
+	doc.reposting_data_file = create_json_gz_file(
+		reposting_data, doc, get_reposting_file_name(doc.doctype, doc.name)
+	)
+
+	current_index = sum(cint(d.get("current_index")) for d in reposting_data.partitions)
+	total_reposting_count = sum(len(d.get("items_to_be_repost")) for d in reposting_data.partitions)
+	doc.db_set(
+		{
+			"current_index": current_index,
+			"total_reposting_count": total_reposting_count,
+			"reposting_data_file": doc.reposting_data_file,
+		}
+	)
+
+	if not frappe.flags.in_test:
+		frappe.db.commit()
+
+	frappe.publish_realtime(
+		"item_reposting_progress",
+		{
+			"name": doc.name,
+			"current_index": current_index,
+			"total_reposting_count": total_reposting_count,
+		},
+		doctype=doc.doctype,
+		docname=doc.name,
+	)
+
+
 def get_reposting_file_name(dt, dn):
 	return frappe.db.get_value(
 		"File",
@@ -507,7 +684,14 @@ def get_affected_transactions(doc, reposting_data=None) -> set[tuple[str, str]]:
 	if reposting_data and reposting_data.affected_transactions:
 		return {tuple(transaction) for transaction in reposting_data.affected_transactions}
 
-	if not doc.affected_transactions:
+	if reposting_data and reposting_data.partitions:
+		return {
+			tuple(transaction)
+			for partition in reposting_data.partitions
+			for transaction in partition.get("affected_transactions") or []
+		}
+
+	if not doc or not doc.affected_transactions:
 		return set()
 
 	transactions = frappe.parse_json(doc.affected_transactions)
@@ -519,6 +703,130 @@ def get_current_index(doc=None):
 		return doc.current_index
 
 
+# Vouchers which are recalculated and saved as a whole while reposting any of their rows
+VOUCHERS_RECALCULATED_AS_WHOLE = ("Stock Entry", "Stock Reconciliation", "Subcontracting Receipt")
+
+
+def get_reposting_partitions(items_to_be_repost, max_partitions=None) -> list[list[dict]]:
+	"""Split the item-warehouses to be reposted into partitions which can be reposted in parallel.
+
+	Item-warehouses are linked when a future entry of one of them is the source of an entry
+	of the other (transfers, manufacture, subcontracting) or when both are part of a voucher
+	which is recalculated as a whole. Linked item-warehouses are always kept in the same partition.
+	"""
+	if not items_to_be_repost:
+		return []
+
+	posting_datetime = min(
+		get_combine_datetime(d.get("posting_date"), d.get("posting_time")) for d in items_to_be_repost
+	)
+
+	partition_of = {}
+	frontier = {(d.get("item_code"), d.get("warehouse")) for d in items_to_be_repost}
+	visited = set()
+
+	while frontier:
+		visited.update(frontier)
+		dependent_item_warehouses = set()
+
+		for source, targets, is_dependency in get_linked_item_warehouses(frontier, posting_datetime):
+			for target in targets:
+				merge_partitions(partition_of, source, target)
+				if is_dependency:
+					dependent_item_warehouses.add(target)
+
+		frontier = dependent_item_warehouses - visited
+
+	partitions = {}
+	for idx, row in enumerate(items_to_be_repost):
+		key = find_partition(partition_of, (row.get("item_code"), row.get("warehouse")))
+		partitions.setdefault(key, []).append(idx)
+
+	# merge the smallest partitions to limit the number of jobs
+	buckets = [[] for _i in range(min(len(partitions), max_partitions or len(partitions)))]
+	for indexes in sorted(partitions.values(), key=len, reverse=True):
+		min(buckets, key=len).extend(indexes)
+
+	return [[items_to_be_repost[idx] for idx in sorted(bucket)] for bucket in buckets]
+
+
+def get_linked_item_warehouses(item_warehouses, posting_datetime):
+	"""Returns (source, linked item-warehouses, is_dependency) for the future entries of the item-warehouses"""
+	sle = frappe.qb.DocType("Stock Ledger Entry")
+
+	entries = (
+		frappe.qb.from_(sle)
+		.select(
+			sle.item_code,
+			sle.warehouse,
+			sle.voucher_type,
+			sle.voucher_no,
+			sle.dependant_sle_voucher_detail_no,
+		)
+		.where(
+			(sle.is_cancelled == 0)
+			& (sle.posting_datetime >= posting_datetime)
+			& (sle.item_code.isin(list({d[0] for d in item_warehouses})))
+			& (sle.warehouse.isin(list({d[1] for d in item_warehouses})))
+			& (
+				(IfNull(sle.dependant_sle_voucher_detail_no, "") != "")
+				| (sle.voucher_type.isin(VOUCHERS_RECALCULATED_AS_WHOLE))
+			)
+		)
+	).run(as_dict=True)
+
+	dependencies = {}
+	vouchers = {}
+	for entry in entries:
+		key = (entry.item_code, entry.warehouse)
+		if key not in item_warehouses:
+			continue
+
+		if entry.dependant_sle_voucher_detail_no:
+			dependencies.setdefault(entry.dependant_sle_voucher_detail_no, set()).add(key)
+
+		if entry.voucher_type in VOUCHERS_RECALCULATED_AS_WHOLE:
+			vouchers.setdefault((entry.voucher_type, entry.voucher_no), set()).add(key)
+
+	linked_item_warehouses = []
+	if dependencies:
+		dependent_entries = (
+			frappe.qb.from_(sle)
+			.select(sle.item_code, sle.warehouse, sle.voucher_detail_no)
+			.where((sle.is_cancelled == 0) & (sle.voucher_detail_no.isin(list(dependencies))))
+		).run(as_dict=True)
+
+		for entry in dependent_entries:
+			for source in dependencies[entry.voucher_detail_no]:
+				linked_item_warehouses.append((source, [(entry.item_code, entry.warehouse)], True))
+
+	if vouchers:
+		voucher_entries = (
+			frappe.qb.from_(sle)
+			.select(sle.item_code, sle.warehouse, sle.voucher_type, sle.voucher_no)
+			.where((sle.is_cancelled == 0) & (sle.voucher_no.isin(list({d[1] for d in vouchers}))))
+		).run(as_dict=True)
+
+		for entry in voucher_entries:
+			for source in vouchers.get((entry.voucher_type, entry.voucher_no), []):
+				linked_item_warehouses.append((source, [(entry.item_code, entry.warehouse)], False))
+
+	return linked_item_warehouses
+
+
+def find_partition(partition_of, key):
+	partition_of.setdefault(key, key)
+	while partition_of[key] != key:
+		partition_of[key] = partition_of[partition_of[key]]
+		key = partition_of[key]
+
+	return key
+
+
+def merge_partitions(partition_of, key, other_key):
+	partition_of[find_partition(partition_of, key)] = find_partition(partition_of, other_key)
+
+
 class update_entries_after:
 	"""
 	update valution rate and qty after transaction
@@ -541,6 +849,7 @@ class update_entries_after:
 		allow_negative_stock=None,
 		via_landed_cost_voucher=False,
 		verbose=1,
+		bin_updates=None,
 	):
 		self.exceptions = {}
 		self.verbose = verbose
@@ -559,8 +868,14 @@ class update_entries_after:
 		self.company = frappe.get_cached_value("Warehouse", self.args.warehouse, "company")
 		self.set_precision()
 		self.valuation_method = get_valuation_method(self.item_code)
+		self.compact_stock_queue = frappe.db.get_single_value("Stock Settings", "compact_stock_queue")
 
 		self.new_items_found = False
+		self.bulk_write_back = cint(self.args.bulk_write_back) and not self.args.get("sle_id")
+		self.write_back_batch_size = cint(self.args.write_back_batch_size) or SLE_WRITE_BACK_BATCH_SIZE
+		self.pending_sle_updates = {}
+		self.bin_updates = bin_updates
+		self.checkpoint_interval = cint(self.args.checkpoint_interval)
 		self.distinct_item_warehouses = args.get("distinct_item_warehouses", frappe._dict())
 		self.affected_transactions: set[tuple[str, str]] = set()
 		self.reserved_stock = self.get_reserved_stock()
@@ -622,11 +937,22 @@ class update_entries_after:
 		warehouse_dict.update(
 			{
 				"prev_stock_value": previous_sle.stock_value or 0.0,
-				"stock_queue": json.loads(previous_sle.stock_queue or "[]"),
+				"stock_queue": self.get_stock_queue(previous_sle.stock_queue),
 				"stock_value_difference": 0.0,
 			}
 		)
 
+	def get_stock_queue(self, state=None):
+		"""FIFO / LIFO queue is kept as a valuation object across the entries,
+		which is decoded from the stored queue only once."""
+		if self.valuation_method == "Moving Average":
+			return get_stock_queue_bins(state) if isinstance(state, str) else state or []
+
+		if self.valuation_method == "LIFO":
+			return LIFOValuation(state)
+
+		return FIFOValuation(state)
+
 	def build(self):
 		from erpnext.controllers.stock_controller import future_sle_exists
 
@@ -637,20 +963,49 @@ class update_entries_after:
 		else:
 			entries_to_fix = self.get_future_entries_to_fix()
 
+			# only the last entry of each warehouse decides the bin
+			last_sle_of_warehouse = {}
+
 			i = 0
 			while i < len(entries_to_fix):
 				sle = entries_to_fix[i]
+				if self.is_checkpoint(entries_to_fix, i):
+					self.save_checkpoint(sle)
+
 				i += 1
 
 				self.process_sle(sle)
-				self.update_bin_data(sle)
+				last_sle_of_warehouse[sle.warehouse] = sle
 
 				if sle.dependant_sle_voucher_detail_no:
 					entries_to_fix = self.get_dependent_entries_to_fix(entries_to_fix, sle)
 
+			self.flush_sle_updates()
+
+			for warehouse in sorted(last_sle_of_warehouse):
+				self.update_bin_data(last_sle_of_warehouse[warehouse])
+
+			if entries_to_fix and is_stock_qty_bucket_enabled():
+				build_buckets(self.item_code, self.args.warehouse, entries_to_fix[0].posting_date)
+
 		if self.exceptions:
 			self.raise_exceptions()
 
+	def is_checkpoint(self, entries_to_fix, index):
+		"""Checkpoints are only saved between entries with different posting datetime,
+		so that the reposting can resume from the previous entry of the checkpoint."""
+		if not self.checkpoint_interval or not self.args.on_checkpoint or self.exceptions:
+			return False
+
+		if not index or index % self.checkpoint_interval:
+			return False
+
+		return entries_to_fix[index].posting_datetime > entries_to_fix[index - 1].posting_datetime
+
+	def save_checkpoint(self, sle):
+		self.flush_sle_updates()
+		self.args.on_checkpoint(sle, self.affected_transactions)
+
 	def has_stock_reco_with_serial_batch(self, sle):
 		if (
 			sle.voucher_type == "Stock Reconciliation"
@@ -801,6 +1156,10 @@ class update_entries_after:
 		# previous sle data for this warehouse
 		self.wh_data = self.data[sle.warehouse]
 
+		if not self.can_defer_sle_write(sle):
+			# the valuation of this entry may read the ledger, write back the buffered entries first
+			self.flush_sle_updates()
+
 		self.validate_previous_sle_qty(sle)
 		self.affected_transactions.add((sle.voucher_type, sle.voucher_no))
 
@@ -872,9 +1231,9 @@ class update_entries_after:
 					self.wh_data.valuation_rate
 				)
 				if self.valuation_method != "Moving Average":
-					self.wh_data.stock_queue = [
-						[self.wh_data.qty_after_transaction, self.wh_data.valuation_rate]
-					]
+					self.wh_data.stock_queue = self.get_stock_queue(
+						[[self.wh_data.qty_after_transaction, self.wh_data.valuation_rate]]
+					)
 			else:
 				if self.valuation_method == "Moving Average":
 					self.get_moving_average_values(sle)
@@ -906,7 +1265,7 @@ class update_entries_after:
 		sle.qty_after_transaction = flt(self.wh_data.qty_after_transaction, self.flt_precision)
 		sle.valuation_rate = self.wh_data.valuation_rate
 		sle.stock_value = self.wh_data.stock_value
-		sle.stock_queue = json.dumps(self.wh_data.stock_queue)
+		sle.stock_queue = self.serialize_stock_queue()
 
 		if not sle.is_adjustment_entry:
 			sle.stock_value_difference = stock_value_difference
@@ -920,13 +1279,72 @@ class update_entries_after:
 
 		sle.doctype = "Stock Ledger Entry"
 		sle.modified = now()
-		frappe.get_doc(sle).db_update()
+		self.write_back_sle(sle)
 
 		if not self.args.get("sle_id") or (
 			sle.serial_and_batch_bundle and sle.auto_created_serial_and_batch_bundle
 		):
 			self.update_outgoing_rate_on_transaction(sle)
 
+	def serialize_stock_queue(self) -> str:
+		stock_queue = self.wh_data.stock_queue
+		if isinstance(stock_queue, list):
+			if not (self.compact_stock_queue and stock_queue):
+				return json.dumps(stock_queue)
+
+			stock_queue = FIFOValuation(stock_queue)
+
+		return stock_queue.serialize(packed=self.compact_stock_queue)
+
+	def can_defer_sle_write(self, sle) -> bool:
+		"""Check if the write of the SLE can be buffered.
+
+		Entries whose valuation or transaction update reads back the stock ledger
+		(serial / batch valuation, returns, stock entries recalculating the rates etc.)
+		are always written immediately."""
+		if not self.bulk_write_back:
+			return False
+
+		if (
+			sle.serial_and_batch_bundle
+			or sle.serial_no
+			or sle.batch_no
+			or sle.is_adjustment_entry
+			or sle.recalculate_rate
+			or sle.dependant_sle_voucher_detail_no
+			or sle.voucher_type == "Stock Reconciliation"
+		):
+			return False
+
+		if flt(sle.actual_qty) < 0 and sle.voucher_type in (
+			"Stock Entry",
+			"Purchase Receipt",
+			"Purchase Invoice",
+			"Subcontracting Receipt",
+		):
+			return False
+
+		return True
+
+	def write_back_sle(self, sle):
+		if not self.can_defer_sle_write(sle):
+			frappe.get_doc(sle).db_update()
+			return
+
+		self.pending_sle_updates[sle.name] = {field: sle.get(field) for field in SLE_WRITE_BACK_FIELDS}
+		if len(self.pending_sle_updates) >= self.write_back_batch_size:
+			self.flush_sle_updates()
+
+	def flush_sle_updates(self):
+		"""Write back the buffered SLEs using multi-row updates"""
+		if not self.pending_sle_updates:
+			return
+
+		frappe.db.bulk_update(
+			"Stock Ledger Entry", self.pending_sle_updates, chunk_size=self.write_back_batch_size
+		)
+		self.pending_sle_updates = {}
+
 	def get_serialized_values(self, sle):
 		from erpnext.stock.serial_batch_bundle import SerialNoValuation
 
@@ -1027,8 +1445,12 @@ class update_entries_after:
 			)
 		else:
 			doc = frappe.get_doc("Serial and Batch Bundle", sle.serial_and_batch_bundle)
+			previous_values = get_bundle_batch_values(doc) if is_batch_balance_enabled() else None
+
 			doc.set_incoming_rate(save=True, allow_negative_stock=self.allow_negative_stock)
 			doc.calculate_qty_and_amount(save=True)
+			update_batch_balance_values(doc, previous_values)
+			update_serial_no_incoming_rate_values(doc)
 
 		self.wh_data.stock_value = round_off_if_near_zero(self.wh_data.stock_value + doc.total_amount)
 		self.wh_data.qty_after_transaction += flt(doc.total_qty, self.flt_precision)
@@ -1411,10 +1833,9 @@ class update_entries_after:
 			self.wh_data.qty_after_transaction + actual_qty
 		)
 
-		if self.valuation_method == "LIFO":
-			stock_queue = LIFOValuation(self.wh_data.stock_queue)
-		else:
-			stock_queue = FIFOValuation(self.wh_data.stock_queue)
+		stock_queue = self.wh_data.stock_queue
+		if isinstance(stock_queue, list):
+			stock_queue = self.get_stock_queue(stock_queue)
 
 		_prev_qty, prev_stock_value = stock_queue.get_total_stock_and_value()
 
@@ -1439,13 +1860,11 @@ class update_entries_after:
 
 		stock_value_difference = stock_value - prev_stock_value
 
-		self.wh_data.stock_queue = stock_queue.state
+		self.wh_data.stock_queue = stock_queue
 		self.wh_data.stock_value = round_off_if_near_zero(self.wh_data.stock_value + stock_value_difference)
 
-		if not self.wh_data.stock_queue:
-			self.wh_data.stock_queue.append(
-				[0, sle.incoming_rate or sle.outgoing_rate or self.wh_data.valuation_rate]
-			)
+		if not stock_queue:
+			stock_queue.append_bin(0, sle.incoming_rate or sle.outgoing_rate or self.wh_data.valuation_rate)
 
 		if self.wh_data.qty_after_transaction:
 			self.wh_data.valuation_rate = self.wh_data.stock_value / self.wh_data.qty_after_transaction
@@ -1504,6 +1923,7 @@ class update_entries_after:
 	def get_fallback_rate(self, sle) -> float:
 		"""When exact incoming rate isn't available use any of other "average" rates as fallback.
 		This should only get used for negative stock."""
+		self.flush_sle_updates()
 		return get_valuation_rate(
 			sle.item_code,
 			sle.warehouse,
@@ -1585,11 +2005,16 @@ class update_entries_after:
 	def update_bin(self):
 		# update bin for each warehouse
 		for warehouse, data in self.data.items():
-			bin_name = get_or_make_bin(self.item_code, warehouse)
-
 			updated_values = {"actual_qty": data.qty_after_transaction, "stock_value": data.stock_value}
 			if data.valuation_rate is not None:
 				updated_values["valuation_rate"] = data.valuation_rate
+
+			if self.bin_updates and (self.item_code, warehouse) in self.bin_updates:
+				# written along with the other changes of the bin by make_sl_entries
+				self.bin_updates[(self.item_code, warehouse)]["values"].update(updated_values)
+				continue
+
+			bin_name = get_or_make_bin(self.item_code, warehouse)
 			frappe.db.set_value("Bin", bin_name, updated_values, update_modified=True)
 
 
@@ -1938,6 +2363,11 @@ def update_qty_in_future_sle(args, allow_negative_stock=False):
 		args,
 	)
 
+	if is_stock_qty_bucket_enabled():
+		update_buckets_for_qty_shift(
+			args, qty_shift, next_stock_reco_detail[0] if next_stock_reco_detail else None
+		)
+
 	validate_negative_qty_in_future_sle(args, allow_negative_stock)
 
 
@@ -2090,6 +2520,9 @@ def is_negative_with_precision(neg_sle, is_batch=False):
 
 
 def get_future_sle_with_negative_qty(sle_args):
+	if is_stock_qty_bucket_built():
+		return get_future_sle_with_negative_qty_from_buckets(sle_args)
+
 	return frappe.db.sql(  # nosemgrep
 		"""
 		select
@@ -2111,6 +2544,45 @@ def get_future_sle_with_negative_qty(sle_args):
 	)
 
 
+def get_future_sle_with_negative_qty_from_buckets(sle_args):
+	"""Only scan the month of the entry and the future months with negative minimum qty."""
+	sle = frappe.qb.DocType("Stock Ledger Entry")
+
+	def get_negative_sle(from_datetime, bucket_start):
+		return (
+			frappe.qb.from_(sle)
+			.select(
+				sle.qty_after_transaction,
+				sle.posting_date,
+				sle.posting_time,
+				sle.voucher_type,
+				sle.voucher_no,
+			)
+			.where(
+				(sle.item_code == sle_args.item_code)
+				& (sle.warehouse == sle_args.warehouse)
+				& (sle.voucher_no != sle_args.voucher_no)
+				& (sle.posting_datetime >= from_datetime)
+				& (sle.posting_datetime < get_bucket_end(bucket_start))
+				& (sle.is_cancelled == 0)
+				& (sle.qty_after_transaction < 0)
+			)
+			.orderby(sle.posting_datetime)
+			.orderby(sle.creation)
+			.limit(1)
+		).run(as_dict=True)
+
+	first_bucket = get_bucket_start(sle_args.posting_datetime)
+	if neg_sle := get_negative_sle(sle_args.posting_datetime, first_bucket):
+		return neg_sle
+
+	for bucket_start in get_negative_buckets(sle_args.item_code, sle_args.warehouse, first_bucket):
+		if neg_sle := get_negative_sle(bucket_start, bucket_start):
+			return neg_sle
+
+	return []
+
+
 def get_future_sle_with_negative_batch_qty(sle_args):
 	return frappe.db.sql(  # nosemgrep
 		"""
@@ -0,0 +1,52 @@
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import now
+
+from erpnext.stock.benchmark import compare_results, run_benchmark
+
+
+class TestStockLedgerBenchmark(FrappeTestCase):
+	def test_run_benchmark(self):
+		setting = "auto_create_serial_and_batch_bundle_for_outward"
+		previous_value = frappe.db.get_single_value("Stock Settings", setting)
+		start = now()
+
+		results = run_benchmark(
+			{
+				"company": "_Test Company",
+				"items": 3,
+				"warehouses": 2,
+				"entries_per_item": 4,
+				"issue_ratio": 0.5,
+				"days": 30,
+				"backdated_entries": 1,
+				"cancellations": 1,
+				"valuation_operations": 100,
+			},
+			keep_data=True,
+		)
+
+		benchmarks = {d["name"]: d for d in results["results"]}
+		self.assertEqual(
+			sum(d["count"] for name, d in benchmarks.items() if name.startswith("submit_material")), 12
+		)
+		self.assertEqual(benchmarks["repost_future_sle"]["count"], 1)
+		self.assertEqual(sum(d["count"] for name, d in benchmarks.items() if name.startswith("cancel_")), 1)
+		self.assertEqual(benchmarks["valuation_fifo"]["count"], 100)
+		self.assertGreater(benchmarks["submit_material_receipt"]["queries"], 0)
+
+		# memory is traced in a separate run
+		self.assertGreater(benchmarks["valuation_fifo"]["peak_memory"], 0)
+		self.assertEqual(frappe.db.get_single_value("Stock Settings", setting), previous_value)
+
+		# the reposts queued by the backdated and cancelled entries are not left behind
+		self.assertFalse(frappe.db.exists("Repost Item Valuation", {"creation": (">=", start)}))
+
+	def test_compare_results(self):
+		baseline = {"results": [{"name": "submit", "time_per_operation": 1.0, "queries_per_operation": 10}]}
+		current = {"results": [{"name": "submit", "time_per_operation": 1.05, "queries_per_operation": 20}]}
+
+		regressions = compare_results(baseline, current, threshold=0.1)
+		self.assertEqual(len(regressions), 1)
+		self.assertEqual(regressions[0]["metric"], "queries_per_operation")
+		self.assertFalse(compare_results(baseline, baseline))
@@ -2,7 +2,13 @@ import frappe
 from frappe.test_runner import make_test_records
 from frappe.tests.utils import FrappeTestCase
 
-from erpnext.stock.get_item_details import get_item_details
+from erpnext.stock.get_item_details import (
+	filter_item_prices,
+	get_conversion_factor,
+	get_item_details,
+	get_item_details_batch,
+	item_details_batch,
+)
 
 test_ignore = ["BOM"]
 test_dependencies = ["Customer", "Supplier", "Item", "Price List", "Item Price"]
@@ -35,6 +41,63 @@ class TestGetItemDetail(FrappeTestCase):
 		details = get_item_details(args)
 		self.assertEqual(details.get("price_list_rate"), 100)
 
+	def test_get_item_details_batch(self):
+		args = frappe._dict(
+			{
+				"company": "_Test Company",
+				"conversion_rate": 1.0,
+				"price_list_currency": "USD",
+				"plc_conversion_rate": 1.0,
+				"doctype": "Purchase Order",
+				"name": None,
+				"supplier": "_Test Supplier",
+				"transaction_date": None,
+				"price_list": "_Test Buying Price List",
+				"is_subcontracted": 0,
+			}
+		)
+		items = [
+			{"item_code": "_Test Item", "qty": 1, "warehouse": "_Test Warehouse - _TC"},
+			{"item_code": "_Test Item 2", "qty": 5, "warehouse": "_Test Warehouse - _TC"},
+			{
+				"item_code": "_Test Item",
+				"qty": 10,
+				"uom": "_Test UOM",
+				"warehouse": "_Test Warehouse 1 - _TC",
+			},
+		]
+
+		details = get_item_details_batch(args, items)
+		self.assertEqual(details[0].get("price_list_rate"), 100)
+
+		for item, item_details in zip(items, details, strict=True):
+			self.assertEqual(item_details, get_item_details(frappe._dict(args, **item)))
+
+	def test_batch_values_matched_regardless_of_case(self):
+		item_price = frappe._dict(
+			name="_Test Item Price",
+			price_list_rate=10,
+			uom="_Test UOM",
+			batch_no="_Test Batch",
+			customer="_Test Customer",
+			supplier=None,
+			valid_from=None,
+			valid_upto=None,
+		)
+
+		# like the case-insensitive collation of the queries
+		args = {"uom": "_TEST UOM", "batch_no": "_test batch", "customer": "_test customer"}
+		self.assertEqual(filter_item_prices([item_price], args), [("_Test Item Price", 10, "_Test UOM")])
+		self.assertEqual(
+			filter_item_prices([item_price], args, force_batch_no=True),
+			[("_Test Item Price", 10, "_Test UOM")],
+		)
+		self.assertEqual(filter_item_prices([item_price], {**args, "customer": "_Test Customer 1"}), [])
+
+		with item_details_batch(["_Test Item"]):
+			self.assertEqual(get_conversion_factor("_Test Item", "_test uom 1")["conversion_factor"], 10)
+			self.assertEqual(get_conversion_factor("_test item", "_Test UOM 1")["conversion_factor"], 10)
+
 	# making this test in get_item_details test file as feat/fix is present in that method
 	def test_fetch_price_from_list_rate_on_doc_save(self):
 		# create item
@@ -8,7 +8,13 @@ from hypothesis import strategies as st
 
 from erpnext.stock.doctype.item.test_item import make_item
 from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
-from erpnext.stock.valuation import FIFOValuation, LIFOValuation, round_off_if_near_zero
+from erpnext.stock.valuation import (
+	PACKED_QUEUE_PREFIX,
+	FIFOValuation,
+	LIFOValuation,
+	get_stock_queue_bins,
+	round_off_if_near_zero,
+)
 
 qty_gen = st.floats(min_value=-1e6, max_value=1e6)
 value_gen = st.floats(min_value=1, max_value=1e6)
@@ -317,6 +323,52 @@ class TestLIFOValuation(unittest.TestCase):
 			self.assertTotalValue(total_value)
 
 
+class TestStockQueueSerialization(unittest.TestCase):
+	def test_json_serialization(self):
+		queue = FIFOValuation([[10, 100], [5, 50.5]])
+		self.assertEqual(json.loads(queue.serialize()), [[10, 100], [5, 50.5]])
+		self.assertEqual(FIFOValuation(queue.serialize()), [[10, 100], [5, 50.5]])
+
+	def test_packed_serialization(self):
+		queue = FIFOValuation([[10, 100], [5, 50.5], [-1, 3]])
+		packed = queue.serialize(packed=True)
+
+		self.assertTrue(packed.startswith(PACKED_QUEUE_PREFIX))
+		self.assertEqual(get_stock_queue_bins(packed), [[10, 100], [5, 50.5], [-1, 3]])
+		self.assertEqual(FIFOValuation(packed).get_total_stock_and_value(), queue.get_total_stock_and_value())
+
+	def test_legacy_json_queue(self):
+		self.assertEqual(get_stock_queue_bins(None), [])
+		self.assertEqual(get_stock_queue_bins("[]"), [])
+		self.assertEqual(get_stock_queue_bins("[[1, 2]]"), [[1, 2]])
+
+	@given(stock_queue_generator, st.booleans())
+	def test_totals_after_packing(self, stock_queue, lifo):
+		ValuationKlass = LIFOValuation if lifo else FIFOValuation
+		queue = ValuationKlass([])
+
+		for qty, rate in stock_queue:
+			if round_off_if_near_zero(qty) == 0:
+				continue
+			if qty > 0:
+				queue.add_stock(qty, rate)
+			else:
+				queue.remove_stock(abs(qty))
+
+			unpacked = ValuationKlass(queue.serialize(packed=True))
+			self.assertEqual(unpacked, queue)
+
+			# totals of the stored queue should match exactly with a full recomputation
+			total_qty = total_value = 0.0
+			for bin_qty, bin_rate in queue:
+				total_qty += bin_qty
+				total_value += bin_qty * bin_rate
+
+			expected = (round_off_if_near_zero(total_qty), round_off_if_near_zero(total_value))
+			self.assertEqual(unpacked.get_total_stock_and_value(), expected)
+			self.assertEqual(queue.get_total_stock_and_value(), expected)
+
+
 class TestLIFOValuationSLE(FrappeTestCase):
 	ITEM_CODE = "_Test LIFO item"
 	WAREHOUSE = "_Test Warehouse - _TC"
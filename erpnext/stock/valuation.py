@@ -1,4 +1,9 @@
-from abc import ABC, abstractmethod, abstractproperty
+import base64
+import json
+import struct
+import sys
+from abc import ABC, abstractmethod
+from array import array
 from collections.abc import Callable
 from typing import NewType
 
@@ -10,8 +15,39 @@ StockBin = NewType("StockBin", list[float])  # [[qty, rate], ...]
 QTY = 0
 RATE = 1
 
+# Packed stock queue: prefix + base64(header + qtys + rates), stored as little-endian doubles.
+# Header holds the number of bins and the running totals of the bins before the last bin.
+PACKED_QUEUE_PREFIX = "sq1:"
+PACKED_QUEUE_HEADER = struct.Struct("<Idd")
+
 
 class BinWiseValuation(ABC):
+	"""Base class for valuation methods which maintain "bins" of [qty, rate].
+
+	Quantities and rates are kept in two arrays of doubles. Running totals before each
+	bin are cached, so total stock and value don't require walking all the bins while
+	stock is only added to or taken from the last bin.
+	"""
+
+	__slots__ = ("_cumulative_qtys", "_cumulative_values", "_last_prefix", "_qtys", "_rates")
+
+	def __init__(self, state: list[StockBin] | str | None = None):
+		self._qtys = array("d")
+		self._rates = array("d")
+
+		# totals of the bins before each bin, None if they have to be recomputed
+		self._cumulative_qtys: array | None = array("d")
+		self._cumulative_values: array | None = array("d")
+
+		# totals of the bins before the last bin, read from the header of a packed queue
+		self._last_prefix: tuple[float, float] | None = None
+
+		if isinstance(state, str):
+			self._load(state)
+		elif state:
+			for qty, rate in state:
+				self._append_bin(flt(qty), flt(rate))
+
 	@abstractmethod
 	def add_stock(self, qty: float, rate: float) -> None:
 		pass
@@ -22,19 +58,152 @@ class BinWiseValuation(ABC):
 	) -> list[StockBin]:
 		pass
 
-	@abstractproperty
+	@property
 	def state(self) -> list[StockBin]:
-		pass
+		"""Get current state of bins."""
+		return [[qty, rate] for qty, rate in zip(self._qtys, self._rates, strict=True)]
 
 	def get_total_stock_and_value(self) -> tuple[float, float]:
+		if not self._qtys:
+			return 0.0, 0.0
+
+		prefix_qty, prefix_value = self._get_prefix_of_last_bin()
+		total_qty = prefix_qty + self._qtys[-1]
+		total_value = prefix_value + self._qtys[-1] * self._rates[-1]
+
+		return round_off_if_near_zero(total_qty), round_off_if_near_zero(total_value)
+
+	def append_bin(self, qty: float, rate: float) -> None:
+		"""Add a new bin at the end without merging it with the last bin."""
+		self._append_bin(flt(qty), flt(rate))
+
+	def serialize(self, packed: bool = False) -> str:
+		"""Serialize bins for `Stock Ledger Entry.stock_queue`.
+
+		args:
+		        packed: use the compact binary format instead of JSON"""
+		if not packed or not self._qtys:
+			return json.dumps(self.state)
+
+		prefix_qty, prefix_value = self._get_prefix_of_last_bin()
+		qtys, rates = self._qtys, self._rates
+		if sys.byteorder == "big":
+			qtys, rates = array("d", qtys), array("d", rates)
+			qtys.byteswap()
+			rates.byteswap()
+
+		data = (
+			PACKED_QUEUE_HEADER.pack(len(qtys), prefix_qty, prefix_value) + qtys.tobytes() + rates.tobytes()
+		)
+		return PACKED_QUEUE_PREFIX + base64.b64encode(data).decode()
+
+	def _load(self, value: str) -> None:
+		if not value.startswith(PACKED_QUEUE_PREFIX):
+			for qty, rate in json.loads(value or "[]"):
+				self._append_bin(flt(qty), flt(rate))
+			return
+
+		data = base64.b64decode(value[len(PACKED_QUEUE_PREFIX) :])
+		count, prefix_qty, prefix_value = PACKED_QUEUE_HEADER.unpack_from(data)
+
+		offset = PACKED_QUEUE_HEADER.size
+		self._qtys.frombytes(data[offset : offset + count * 8])
+		self._rates.frombytes(data[offset + count * 8 : offset + count * 16])
+		if sys.byteorder == "big":
+			self._qtys.byteswap()
+			self._rates.byteswap()
+
+		# totals before the other bins are computed only when a removal needs them
+		self._cumulative_qtys = self._cumulative_values = None
+		self._last_prefix = (prefix_qty, prefix_value) if count else None
+
+	def _get_prefix_of_last_bin(self) -> tuple[float, float]:
+		if self._cumulative_qtys is None:
+			if self._last_prefix is not None:
+				return self._last_prefix
+
+			self._compute_cumulative_totals()
+
+		return self._cumulative_qtys[-1], self._cumulative_values[-1]
+
+	def _compute_cumulative_totals(self) -> None:
+		cumulative_qtys = array("d")
+		cumulative_values = array("d")
+
 		total_qty = 0.0
 		total_value = 0.0
+		for qty, rate in zip(self._qtys, self._rates, strict=True):
+			cumulative_qtys.append(total_qty)
+			cumulative_values.append(total_value)
+			total_qty += qty
+			total_value += qty * rate
+
+		self._cumulative_qtys = cumulative_qtys
+		self._cumulative_values = cumulative_values
+		self._last_prefix = None
+
+	def _invalidate_totals(self) -> None:
+		self._cumulative_qtys = self._cumulative_values = None
+		self._last_prefix = None
+
+	def _append_bin(self, qty: float, rate: float) -> None:
+		prefix_qty = prefix_value = 0.0
+		if self._qtys:
+			prefix_qty, prefix_value = self._get_prefix_of_last_bin()
+			prefix_qty += self._qtys[-1]
+			prefix_value += self._qtys[-1] * self._rates[-1]
+
+		self._qtys.append(qty)
+		self._rates.append(rate)
+
+		if self._cumulative_qtys is not None:
+			self._cumulative_qtys.append(prefix_qty)
+			self._cumulative_values.append(prefix_value)
+		else:
+			self._last_prefix = (prefix_qty, prefix_value)
 
-		for qty, rate in self.state:
-			total_qty += flt(qty)
-			total_value += flt(qty) * flt(rate)
+	def _pop_bin(self, index: int) -> StockBin:
+		popped = [self._qtys.pop(index), self._rates.pop(index)]
 
-		return round_off_if_near_zero(total_qty), round_off_if_near_zero(total_value)
+		if index in (-1, len(self._qtys)) and self._cumulative_qtys is not None:
+			# totals before the remaining bins are unchanged
+			self._cumulative_qtys.pop()
+			self._cumulative_values.pop()
+		else:
+			self._invalidate_totals()
+
+		return popped
+
+	def _set_bin(self, index: int, qty: float, rate: float | None = None) -> None:
+		self._qtys[index] = qty
+		if rate is not None:
+			self._rates[index] = rate
+
+		if index not in (-1, len(self._qtys) - 1):
+			self._invalidate_totals()
+
+	def _add_stock_at_end(self, qty: float, rate: float) -> None:
+		if not self._qtys:
+			self._append_bin(0.0, 0.0)
+
+		last_qty = self._qtys[-1]
+
+		# last row has the same rate, merge new bin.
+		if self._rates[-1] == rate:
+			self._set_bin(-1, last_qty + qty)
+		else:
+			# Item has a positive balance qty, add new entry
+			if last_qty > 0:
+				self._append_bin(flt(qty), flt(rate))
+			else:  # negative balance qty
+				qty = last_qty + qty
+				if qty > 0:  # new balance qty is positive
+					self._set_bin(-1, qty, flt(rate))
+				else:  # new balance qty is still negative, maintain same rate
+					self._set_bin(-1, qty)
+
+	def __len__(self):
+		return len(self._qtys)
 
 	def __repr__(self):
 		return str(self.state)
@@ -61,15 +230,12 @@ class FIFOValuation(BinWiseValuation):
 
 	# specifying the attributes to save resources
 	# ref: https://docs.python.org/3/reference/datamodel.html#slots
-	__slots__ = ["queue"]
-
-	def __init__(self, state: list[StockBin] | None):
-		self.queue: list[StockBin] = state if state is not None else []
+	__slots__ = ()
 
 	@property
-	def state(self) -> list[StockBin]:
+	def queue(self) -> list[StockBin]:
 		"""Get current state of queue."""
-		return self.queue
+		return self.state
 
 	def add_stock(self, qty: float, rate: float) -> None:
 		"""Update fifo queue with new stock.
@@ -77,23 +243,7 @@ class FIFOValuation(BinWiseValuation):
 		args:
 		        qty: new quantity to add
 		        rate: incoming rate of new quantity"""
-
-		if not len(self.queue):
-			self.queue.append([0, 0])
-
-		# last row has the same rate, merge new bin.
-		if self.queue[-1][RATE] == rate:
-			self.queue[-1][QTY] += qty
-		else:
-			# Item has a positive balance qty, add new entry
-			if self.queue[-1][QTY] > 0:
-				self.queue.append([qty, rate])
-			else:  # negative balance qty
-				qty = self.queue[-1][QTY] + qty
-				if qty > 0:  # new balance qty is positive
-					self.queue[-1] = [qty, rate]
-				else:  # new balance qty is still negative, maintain same rate
-					self.queue[-1][QTY] = qty
+		self._add_stock_at_end(qty, rate)
 
 	def remove_stock(
 		self, qty: float, outgoing_rate: float = 0.0, rate_generator: Callable[[], float] | None = None
@@ -110,42 +260,33 @@ class FIFOValuation(BinWiseValuation):
 
 		consumed_bins = []
 		while qty:
-			if not len(self.queue):
+			if not self._qtys:
 				# rely on rate generator.
-				self.queue.append([0, rate_generator()])
-
-			index = None
-			if outgoing_rate > 0:
-				# Find the entry where rate matched with outgoing rate
-				for idx, fifo_bin in enumerate(self.queue):
-					if fifo_bin[RATE] == outgoing_rate:
-						index = idx
-						break
-
-				# If no entry found with outgoing rate, consume as per FIFO
-				if index is None:  # nosemgrep
-					index = 0
-			else:
-				index = 0
+				self._append_bin(0.0, flt(rate_generator()))
+
+			index = 0
+			# Find the entry where rate matched with outgoing rate
+			# If no entry found with outgoing rate, consume as per FIFO
+			if outgoing_rate > 0 and outgoing_rate in self._rates:
+				index = self._rates.index(outgoing_rate)
 
 			# select first bin or the bin with same rate
-			fifo_bin = self.queue[index]
-			if qty >= fifo_bin[QTY]:
+			bin_qty, bin_rate = self._qtys[index], self._rates[index]
+			if qty >= bin_qty:
 				# consume current bin
-				qty = round_off_if_near_zero(qty - fifo_bin[QTY])
-				to_consume = self.queue.pop(index)
-				consumed_bins.append(list(to_consume))
+				qty = round_off_if_near_zero(qty - bin_qty)
+				consumed_bins.append(self._pop_bin(index))
 
-				if not self.queue and qty:
+				if not self._qtys and qty:
 					# stock finished, qty still remains to be withdrawn
 					# negative stock, keep in as a negative bin
-					self.queue.append([-qty, outgoing_rate or fifo_bin[RATE]])
-					consumed_bins.append([qty, outgoing_rate or fifo_bin[RATE]])
+					self._append_bin(-qty, flt(outgoing_rate or bin_rate))
+					consumed_bins.append([qty, outgoing_rate or bin_rate])
 					break
 			else:
 				# qty found in current bin consume it and exit
-				fifo_bin[QTY] = round_off_if_near_zero(fifo_bin[QTY] - qty)
-				consumed_bins.append([qty, fifo_bin[RATE]])
+				self._set_bin(index, round_off_if_near_zero(bin_qty - qty))
+				consumed_bins.append([qty, bin_rate])
 				qty = 0
 
 		return consumed_bins
@@ -165,15 +306,12 @@ class LIFOValuation(BinWiseValuation):
 
 	# specifying the attributes to save resources
 	# ref: https://docs.python.org/3/reference/datamodel.html#slots
-	__slots__ = ["stack"]
-
-	def __init__(self, state: list[StockBin] | None):
-		self.stack: list[StockBin] = state if state is not None else []
+	__slots__ = ()
 
 	@property
-	def state(self) -> list[StockBin]:
+	def stack(self) -> list[StockBin]:
 		"""Get current state of stack."""
-		return self.stack
+		return self.state
 
 	def add_stock(self, qty: float, rate: float) -> None:
 		"""Update lifo stack with new stock.
@@ -184,22 +322,7 @@ class LIFOValuation(BinWiseValuation):
 
 		Behaviour of this is same as FIFO valuation.
 		"""
-		if not len(self.stack):
-			self.stack.append([0, 0])
-
-		# last row has the same rate, merge new bin.
-		if self.stack[-1][RATE] == rate:
-			self.stack[-1][QTY] += qty
-		else:
-			# Item has a positive balance qty, add new entry
-			if self.stack[-1][QTY] > 0:
-				self.stack.append([qty, rate])
-			else:  # negative balance qty
-				qty = self.stack[-1][QTY] + qty
-				if qty > 0:  # new balance qty is positive
-					self.stack[-1] = [qty, rate]
-				else:  # new balance qty is still negative, maintain same rate
-					self.stack[-1][QTY] = qty
+		self._add_stock_at_end(qty, rate)
 
 	def remove_stock(
 		self, qty: float, outgoing_rate: float = 0.0, rate_generator: Callable[[], float] | None = None
@@ -216,35 +339,43 @@ class LIFOValuation(BinWiseValuation):
 
 		consumed_bins = []
 		while qty:
-			if not len(self.stack):
+			if not self._qtys:
 				# rely on rate generator.
-				self.stack.append([0, rate_generator()])
+				self._append_bin(0.0, flt(rate_generator()))
 
 			# start at the end.
-			index = -1
-
-			stock_bin = self.stack[index]
-			if qty >= stock_bin[QTY]:
+			bin_qty, bin_rate = self._qtys[-1], self._rates[-1]
+			if qty >= bin_qty:
 				# consume current bin
-				qty = round_off_if_near_zero(qty - stock_bin[QTY])
-				to_consume = self.stack.pop(index)
-				consumed_bins.append(list(to_consume))
+				qty = round_off_if_near_zero(qty - bin_qty)
+				consumed_bins.append(self._pop_bin(-1))
 
-				if not self.stack and qty:
+				if not self._qtys and qty:
 					# stock finished, qty still remains to be withdrawn
 					# negative stock, keep in as a negative bin
-					self.stack.append([-qty, outgoing_rate or stock_bin[RATE]])
-					consumed_bins.append([qty, outgoing_rate or stock_bin[RATE]])
+					self._append_bin(-qty, flt(outgoing_rate or bin_rate))
+					consumed_bins.append([qty, outgoing_rate or bin_rate])
 					break
 			else:
 				# qty found in current bin consume it and exit
-				stock_bin[QTY] = round_off_if_near_zero(stock_bin[QTY] - qty)
-				consumed_bins.append([qty, stock_bin[RATE]])
+				self._set_bin(-1, round_off_if_near_zero(bin_qty - qty))
+				consumed_bins.append([qty, bin_rate])
 				qty = 0
 
 		return consumed_bins
 
 
+def get_stock_queue_bins(stock_queue: str | None) -> list[StockBin]:
+	"""Read `Stock Ledger Entry.stock_queue` stored either as JSON or in the packed format."""
+	if not stock_queue:
+		return []
+
+	if not stock_queue.startswith(PACKED_QUEUE_PREFIX):
+		return json.loads(stock_queue)
+
+	return FIFOValuation(stock_queue).state
+
+
 def round_off_if_near_zero(number: float, precision: int = 7) -> float:
 	"""Rounds off the number to zero only if number is close to zero for decimal
 	specified in precision. Precision defaults to 7.
@@ -1,5 +1,6 @@
 import frappe
-from frappe.model.naming import get_default_naming_series
+from frappe.model.naming import get_default_naming_series, parse_naming_series
+from frappe.utils import cint
 
 
 class NamingSeriesNotSetError(frappe.ValidationError):
@@ -46,3 +47,43 @@ def set_by_naming_series(doctype, fieldname, naming_series, hide_name_field=True
 				f"""update `tab{doctype}` set `{fieldname}`=`name` where
 				ifnull({fieldname}, '')=''"""
 			)
+
+
+def make_autonames(series, count, doctype=None):
+	"""Returns the next `count` names of the naming series.
+
+	The counter of the series is locked and updated once for all the names,
+	unlike `make_autoname` which updates it once per name."""
+	if count <= 0:
+		return []
+
+	if "#" not in series:
+		series += ".#####"
+
+	placeholder = "{#}"
+	counter = frappe._dict()
+
+	def number_generator(key, digits):
+		counter.update(key=key, digits=digits)
+		return placeholder
+
+	template = parse_naming_series(series, doctype=doctype, number_generator=number_generator)
+
+	table = frappe.qb.DocType("Series")
+	current = (
+		frappe.qb.from_(table).select(table.current).where(table.name == counter.key).for_update()
+	).run()
+
+	if current and current[0][0] is not None:
+		start = cint(current[0][0])
+		frappe.qb.update(table).set(table.current, table.current + count).where(
+			table.name == counter.key
+		).run()
+	else:
+		start = 0
+		frappe.qb.into(table).columns(table.name, table.current).insert(counter.key, count).run()
+
+	return [
+		template.replace(placeholder, f"{number:0{counter.digits}d}")
+		for number in range(start + 1, start + count + 1)
+	]
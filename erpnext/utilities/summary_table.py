@@ -0,0 +1,96 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# License: GNU General Public License v3. See license.txt
+
+"""Tables summing up a ledger, like the Stock Qty Buckets or the Daily Account Balances.
+
+Each table is enabled by a setting. While enabled, the postings keep the rows of the table up to date
+and the table is built from the ledger by a background job, enqueued once the setting is enabled. The
+table is only read once built, till then the ledger is read as before.
+
+The job builds the table in batches, of items or accounts for example, each in its own transaction. A
+batch deletes or locks its rows before reading the ledger: the rows written by a concurrent posting wait
+for the batch to be committed and are then applied on top of it, and the postings committed before that
+are included in the ledger read by the batch. The postings only wait for the batch they touch, never for
+the whole build.
+"""
+
+import frappe
+from frappe import _
+
+BUILD_TIMEOUT = 3600  # seconds
+
+
+def get_built_key(doctype):
+	return f"{frappe.scrub(doctype)}_built"
+
+
+def is_summary_table_built(doctype) -> bool:
+	return bool(frappe.db.get_default(get_built_key(doctype)))
+
+
+def reset_summary_table(settings, fieldname, doctype, build_method):
+	"""Clear the table once the setting `fieldname` of the `settings` document is changed, and build it
+	again in the background if enabled."""
+	if not settings.has_value_changed(fieldname):
+		return
+
+	clear_summary_table(doctype)
+	if settings.get(fieldname):
+		enqueue_summary_table_build(settings.doctype, fieldname, doctype, build_method)
+
+
+def clear_summary_table(doctype):
+	frappe.db.delete(doctype)
+	frappe.db.set_default(get_built_key(doctype), None)
+
+
+def enqueue_summary_table_build(settings, fieldname, doctype, build_method):
+	frappe.enqueue(
+		"erpnext.utilities.summary_table.build_summary_table",
+		queue="long",
+		timeout=BUILD_TIMEOUT,
+		enqueue_after_commit=True,
+		now=frappe.flags.in_test,
+		settings=settings,
+		fieldname=fieldname,
+		doctype=doctype,
+		build_method=build_method,
+	)
+
+
+def build_summary_table(settings, fieldname, doctype, build_method):
+	"""Build the table with `build_method` while the setting is enabled, one build of the table at a time.
+
+	A build enqueued while another one is running waits for it, as the table is cleared again before
+	being enqueued."""
+	lock_name = f"{frappe.conf.db_name}:{get_built_key(doctype)}"
+	if not frappe.db.sql("select get_lock(%s, %s)", (lock_name, BUILD_TIMEOUT))[0][0]:
+		frappe.throw(_("Timed out waiting for another build of {0}").format(_(doctype)))
+
+	try:
+		if not frappe.db.get_single_value(settings, fieldname):
+			return
+
+		frappe.db.set_default(get_built_key(doctype), None)
+		commit()
+
+		frappe.get_attr(build_method)()
+		frappe.db.set_default(get_built_key(doctype), 1)
+
+		# the lock is released once the table is committed
+		commit()
+	finally:
+		frappe.db.sql("select release_lock(%s)", lock_name)
+
+
+def build_in_batches(batches, build_batch):
+	"""Build the table with `build_batch`, which rebuilds the rows of a batch from the ledger, committing
+	each batch."""
+	for batch in batches:
+		build_batch(batch)
+		commit()
+
+
+def commit():
+	if not frappe.flags.in_test:
+		frappe.db.commit()